@@ -20,6 +20,9 @@ from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 import os
 
+from orientations_RVE import (lire_orientations, matrices_rotation,
+                              axe_angle_depuis_rotation, lignes_rotation_instance)
+
 # =============================================================================
 # DATA STRUCTURES
 # =============================================================================
@@ -366,7 +369,8 @@ def pair_face_nodes(part: Part, face_n: List[int], face_p: List[int],
 # DFE² MODEL GENERATION
 # =============================================================================
 
-def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str):
+def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str,
+                      orientation_file: Optional[str] = None):
     """
     Generate the combined DFE² input file.
     
@@ -375,6 +379,11 @@ def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str):
     2. RVE instances (Matrice + Fibre) at each integration point
     3. MPC equations linking macro nodes to RVE corner nodes
     4. PBC equations on each RVE
+    
+    If orientation_file is given (.csv or .inp, see orientations_RVE.py),
+    each RVE is rotated about its integration point into the local material
+    frame of its macro element. Otherwise *Orientation definitions found in
+    the macro file are used, if any.
     """
     
     print("=" * 70)
@@ -421,9 +430,25 @@ def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str):
     n_macro_elem = len(macro_elements)
     n_rve_instances = n_macro_elem * n_gauss
     
+    # Integration point positions and RVE rotations for all instances at once
+    # (order: sorted elements, then integration points)
+    elem_ids = sorted(macro_elements.keys())
+    all_node_coords = np.array([[[macro_nodes[nid].x, macro_nodes[nid].y, macro_nodes[nid].z]
+                                 for nid in macro_elements[eid].nodes] for eid in elem_ids])
+    N_gauss = np.array([shape_functions_C3D8(*gp) for gp in gauss['points']])
+    gp_positions = np.einsum('ga,eaj->egj', N_gauss, all_node_coords).reshape(-1, 3)
+    translations = gp_positions - np.array(rve_dims) / 2.0
+    
+    orientations = lire_orientations(orientation_file or macro_file)
+    rotations = matrices_rotation(np.repeat(elem_ids, n_gauss), orientations)
+    axes, angles = axe_angle_depuis_rotation(rotations)
+    rotation_lines = lignes_rotation_instance(gp_positions, axes, angles)
+    n_rotated = sum(line is not None for line in rotation_lines)
+    
     print(f"\n[3] Configuration:")
     print(f"    Integration points per element: {n_gauss}")
     print(f"    Total RVE instances: {n_rve_instances}")
+    print(f"    Rotated RVE instances: {n_rotated}")
     
     # Start writing output file
     print(f"\n[4] Generating output file: {output_file}")
@@ -518,23 +543,19 @@ def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str):
         
         rve_instance_data = []
         
-        for eid in sorted(macro_elements.keys()):
+        for e_idx, eid in enumerate(elem_ids):
             elem = macro_elements[eid]
             
-            # Get element node coordinates
-            node_coords = np.array([[macro_nodes[nid].x, 
-                                     macro_nodes[nid].y, 
-                                     macro_nodes[nid].z] for nid in elem.nodes])
-            
             # For each integration point
-            for gp_idx, (xi, eta, zeta) in enumerate(gauss['points']):
-                # Compute physical position of integration point
-                N = shape_functions_C3D8(xi, eta, zeta)
-                gp_pos = N @ node_coords
+            for gp_idx in range(n_gauss):
+                instance_idx = e_idx * n_gauss + gp_idx
+                N = N_gauss[gp_idx]
                 
                 # RVE is placed with its corner at the integration point position
-                # (actually offset so it's centered at the GP)
-                translation = gp_pos - np.array([rve_dims[0]/2, rve_dims[1]/2, rve_dims[2]/2])
+                # (actually offset so it's centered at the GP), then rotated
+                # about the GP into the local material frame if oriented
+                translation = translations[instance_idx]
+                rotation_line = rotation_lines[instance_idx]
                 
                 # Create instances for each RVE part
                 for part_name in rve_parts.keys():
@@ -542,6 +563,8 @@ def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str):
                     
                     f.write(f"*Instance, name={instance_name}, part={part_name}\n")
                     f.write(f" {translation[0]:.10f}, {translation[1]:.10f}, {translation[2]:.10f}\n")
+                    if rotation_line is not None:
+                        f.write(rotation_line + "\n")
                     f.write("*End Instance\n")
                 
                 # Store data for MPC
@@ -565,6 +588,8 @@ def generate_dfe2_inp(macro_file: str, rve_file: str, output_file: str):
         f.write("** =============================================================\n")
         f.write("**\n")
         
+        # Equations are written on global DOFs with N_i evaluated at the GP,
+        # so they hold unchanged for rotated RVE instances.
         for rve_data in rve_instance_data:
             instance_name = rve_data['matrice_instance']
             macro_node_ids = rve_data['macro_nodes']
@@ -769,6 +794,9 @@ if __name__ == "__main__":
     rve_file = os.path.join(base_dir, "TRC_RVE.inp")
     output_file = os.path.join(base_dir, "TRC_DFE2_Combined.inp")
     
+    # Optional per-element orientation field (.csv or .inp)
+    orientation_file = sys.argv[1] if len(sys.argv) > 1 else None
+    
     if not os.path.exists(macro_file):
         print(f"ERROR: Macro file not found: {macro_file}")
         sys.exit(1)
@@ -777,4 +805,4 @@ if __name__ == "__main__":
         print(f"ERROR: RVE file not found: {rve_file}")
         sys.exit(1)
     
-    generate_dfe2_inp(macro_file, rve_file, output_file)
+    generate_dfe2_inp(macro_file, rve_file, output_file, orientation_file)
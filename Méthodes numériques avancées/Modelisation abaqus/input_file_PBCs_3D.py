@@ -94,6 +94,7 @@ def load_coupling_info(filename):
     info = {
         'rp_nodes_map': {},
         'macro_elements': {},
+        'corner_weights': {},
         'num_elements': 0,
         'num_gauss': 1
     }
@@ -122,6 +123,10 @@ def load_coupling_info(filename):
                 elem_id = int(parts[1])
                 nodes = [int(p) for p in parts[2:]]
                 info['macro_elements'][elem_id] = nodes
+            elif line.startswith('CORNER_W,'):
+                parts = line.split(',')
+                key = (int(parts[1]), int(parts[2]), int(parts[3]))
+                info['corner_weights'][key] = [float(p) for p in parts[4:]]
     
     return info
 
@@ -339,6 +344,11 @@ def generate_coupling_equations(coupling_info, nodes_matrice, output_file):
     
     Equation simple: u_RVE_corner_i = u_macro_i
     En format Abaqus: u_RVE - u_macro = 0
+    
+    Avec un champ d'orientation (poids CORNER_W presents dans coupling_info,
+    pour toutes les instances), le coin est lie a l'interpolation des noeuds
+    macro a sa position eventuellement tournee:
+    u_RVE_corner_k - sum_i(w_ki * u_macro_i) = 0
     """
     equations = []
     
@@ -375,17 +385,20 @@ def generate_coupling_equations(coupling_info, nodes_matrice, output_file):
                     continue
                 
                 rve_corner_node = corners_matrice[corner_name]
-                macro_idx = corner_to_macro_idx[corner_local]
-                macro_node = macro_nodes[macro_idx]
+                weights = coupling_info['corner_weights'].get((elem_id, gp_idx, corner_local))
+                if weights is None:
+                    macro_idx = corner_to_macro_idx[corner_local]
+                    macro_terms = [(macro_nodes[macro_idx], 1.0)]
+                else:
+                    macro_terms = [(n, w) for n, w in zip(macro_nodes, weights)
+                                   if abs(w) > 1e-10]
                 
                 # Pour chaque degre de liberte (1, 2, 3)
                 for dof in [1, 2, 3]:
-                    # Generer l'equation: u_RVE_corner - u_macro = 0
+                    # Generer l'equation: u_RVE_corner - sum(w * u_macro) = 0
                     instance_name = f"Matrice_E{elem_id}_GP{gp_idx+1}"
-                    terms = [
-                        (f"{instance_name}.{rve_corner_node}", dof, 1.0),
-                        (f"MACRO-1.{macro_node}", dof, -1.0),
-                    ]
+                    terms = [(f"{instance_name}.{rve_corner_node}", dof, 1.0)]
+                    terms += [(f"MACRO-1.{n}", dof, -w) for n, w in macro_terms]
                     equations.append(terms)
     
     return equations
@@ -19,6 +19,10 @@ import numpy as np
 import re
 import os
 
+from orientations_RVE import (lire_orientations, matrices_rotation,
+                              axe_angle_depuis_rotation, lignes_rotation_instance,
+                              poids_coins_couplage)
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -30,6 +34,11 @@ RVE_FILE = "TRC_RVE.inp"
 # Fichier de sortie
 OUTPUT_FILE = "DFE2_placed.inp"
 
+# Champ d'orientation par element (repere materiau local des RVE)
+# None: orientations lues dans MACRO_FILE (*Orientation + *Solid Section) si presentes
+# Sinon: chemin vers un fichier .csv (elem_id, a_x, a_y, a_z, b_x, b_y, b_z) ou .inp
+ORIENTATION_FILE = None
+
 # Dimensions du RVE (mm)
 RVE_L = 5.5   # Longueur en X
 RVE_H = 5.5   # Hauteur en Y  
@@ -265,10 +274,15 @@ def parse_rve_inp(filename):
 # =============================================================================
 
 def generate_output_file(macro_nodes, macro_elements, macro_part_name, 
-                         rve_parts, output_filename):
+                         rve_parts, output_filename, orientations=None):
     """
     Genere le fichier .inp avec les RVE places aux points de Gauss.
     
+    orientations: dict {elem_id: (a, b)} optionnel (voir orientations_RVE.py).
+    Les RVE des elements orientes sont tournes autour de leur point de Gauss
+    dans le repere materiau local; des qu'un champ d'orientation est donne,
+    les coins de toutes les instances sont couples par poids_coins_couplage.
+    
     Structure du fichier:
     1. En-tete
     2. Part macro (avec noeuds de reference)
@@ -286,6 +300,26 @@ def generate_output_file(macro_nodes, macro_elements, macro_part_name,
     print(f"  - {num_gauss} point(s) de Gauss par element")
     print(f"  - {total_rve} RVE au total")
     
+    # Positions des points de Gauss et rotations de toutes les instances
+    # (ordre: elements tries, puis points de Gauss)
+    elem_ids = sorted(macro_elements.keys())
+    all_node_coords = np.array([[macro_nodes[n] for n in macro_elements[e]] for e in elem_ids])
+    N_gauss = np.array([shape_functions_C3D8(*gp) for gp in GAUSS_POINTS])
+    gp_coords = np.einsum('ga,eaj->egj', N_gauss, all_node_coords).reshape(-1, 3)
+    
+    orientations = orientations or {}
+    rotations = matrices_rotation(np.repeat(elem_ids, num_gauss), orientations)
+    axes, angles = axe_angle_depuis_rotation(rotations)
+    rotation_lines = lignes_rotation_instance(gp_coords, axes, angles)
+    if orientations:
+        # Meme regle de couplage pour toutes les instances (tournees ou non):
+        # les poids varient continument avec l'angle, sans saut a ANGLE_TOLERANCE
+        corner_weights = poids_coins_couplage(all_node_coords, GAUSS_POINTS,
+                                              rotations, (RVE_L, RVE_H, RVE_T))
+        print(f"  - {sum(l is not None for l in rotation_lines)} RVE tournes")
+    else:
+        corner_weights = None
+    
     with open(output_filename, 'w') as f:
         # =================================================================
         # EN-TETE
@@ -329,12 +363,9 @@ def generate_output_file(macro_nodes, macro_elements, macro_part_name,
         rp_node_id = rp_node_offset
         rp_nodes_map = {}  # {(elem_id, local_node): rp_node_id}
         
-        for elem_id in sorted(macro_elements.keys()):
-            elem_nodes = macro_elements[elem_id]
-            for gp_idx, (xi, eta, zeta) in enumerate(GAUSS_POINTS):
-                # Calculer les coordonnees du point de Gauss
-                node_coords = np.array([macro_nodes[n] for n in elem_nodes])
-                gp_x, gp_y, gp_z = gauss_point_coordinates(node_coords, xi, eta, zeta)
+        for e_idx, elem_id in enumerate(elem_ids):
+            for gp_idx in range(num_gauss):
+                gp_x, gp_y, gp_z = gp_coords[e_idx * num_gauss + gp_idx]
                 
                 # Creer 8 noeuds de reference a la position du point de Gauss
                 # (ils seront deplaces par les equations MPC)
@@ -441,27 +472,29 @@ def generate_output_file(macro_nodes, macro_elements, macro_part_name,
         # Instances RVE aux points de Gauss
         f.write("** RVE instances at Gauss points\n")
         
-        for elem_id in sorted(macro_elements.keys()):
-            elem_nodes = macro_elements[elem_id]
-            node_coords = np.array([macro_nodes[n] for n in elem_nodes])
-            
-            for gp_idx, (xi, eta, zeta) in enumerate(GAUSS_POINTS):
-                # Calculer la position du point de Gauss
-                gp_x, gp_y, gp_z = gauss_point_coordinates(node_coords, xi, eta, zeta)
+        for e_idx, elem_id in enumerate(elem_ids):
+            for gp_idx in range(num_gauss):
+                # Position du point de Gauss (precalculee)
+                instance_idx = e_idx * num_gauss + gp_idx
+                gp_x, gp_y, gp_z = gp_coords[instance_idx]
                 
                 # Translation pour centrer le RVE sur le point de Gauss
                 # Le RVE a son origine en (0,0,0), donc on translate de:
                 # (gp_x - RVE_L/2, gp_y - RVE_H/2, gp_z - RVE_T/2)
                 # Note: le RVE_FILE a deja son origine en (0,0,0)
+                # Rotation eventuelle autour du point de Gauss (apres translation)
                 tx = gp_x - RVE_L / 2.0
                 ty = gp_y - RVE_H / 2.0
                 tz = gp_z - RVE_T / 2.0
+                rotation_line = rotation_lines[instance_idx]
                 
                 # Creer une instance pour chaque part du RVE
                 for part_name in rve_parts.keys():
                     instance_name = f"{part_name}_E{elem_id}_GP{gp_idx+1}"
                     f.write(f"*Instance, name={instance_name}, part={part_name}\n")
                     f.write(f"  {tx:14.10f}, {ty:14.10f}, {tz:14.10f}\n")
+                    if rotation_line is not None:
+                        f.write(rotation_line + "\n")
                     f.write("*End Instance\n")
         
         f.write("**\n")
@@ -524,7 +557,8 @@ def generate_output_file(macro_nodes, macro_elements, macro_part_name,
         'macro_elements': macro_elements,
         'macro_nodes': macro_nodes,
         'num_gauss': num_gauss,
-        'rve_parts': rve_parts
+        'rve_parts': rve_parts,
+        'corner_weights': corner_weights
     }
 
 
@@ -635,6 +669,18 @@ def save_coupling_info(info, filename="coupling_info.txt"):
         f.write("\n# Macro elements: elem_id -> [n1, n2, n3, n4, n5, n6, n7, n8]\n")
         for elem_id, nodes in sorted(info['macro_elements'].items()):
             f.write(f"ELEMENT,{elem_id}," + ",".join(map(str, nodes)) + "\n")
+        
+        # Poids de couplage des coins des RVE (absents sans champ d'orientation)
+        corner_weights = info.get('corner_weights')
+        if corner_weights is not None:
+            f.write("\n# Corner coupling weights: elem_id, gp_idx, corner -> [w1, ..., w8]\n")
+            num_gauss = info['num_gauss']
+            for e_idx, elem_id in enumerate(sorted(info['macro_elements'].keys())):
+                for gp_idx in range(num_gauss):
+                    weights = corner_weights[e_idx * num_gauss + gp_idx]
+                    for corner in range(8):
+                        f.write(f"CORNER_W,{elem_id},{gp_idx},{corner + 1},"
+                                + ",".join(f"{w:.10f}" for w in weights[corner]) + "\n")
 
 
 # =============================================================================
@@ -676,11 +722,18 @@ def main():
               f"{len(part_data['elements'])} elements, type={part_data['elem_type']}")
     print()
     
+    # Lire le champ d'orientation des RVE
+    orientation_source = ORIENTATION_FILE or MACRO_FILE
+    orientations = lire_orientations(orientation_source)
+    if orientations:
+        print(f"Orientations lues dans {orientation_source}: {len(orientations)} elements")
+        print()
+    
     # Generer le fichier de sortie
     print(f"Generation du fichier de sortie: {OUTPUT_FILE}")
     coupling_info = generate_output_file(
         macro_nodes, macro_elements, macro_part_name,
-        rve_parts, OUTPUT_FILE
+        rve_parts, OUTPUT_FILE, orientations
     )
     print()
     
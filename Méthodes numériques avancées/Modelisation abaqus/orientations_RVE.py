@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+orientations_RVE.py
+
+Orientation locale des RVE pour la methode Direct FE² en 3D.
+
+Les renforts textiles des elements macro courbes ou biais imposent de
+tourner chaque RVE dans le repere materiau local de son element. Ce module
+lit un champ d'orientation par element (mot-cle *Orientation du fichier
+macro ou fichier CSV), calcule en une seule passe vectorisee les matrices
+de rotation de toutes les instances, leur ecriture axe/angle pour les
+lignes *Instance d'Abaqus, et les poids de couplage des coins du RVE
+tourne vers les noeuds de l'element macro.
+
+Convention (identique a *Orientation, system=RECTANGULAR):
+    a: point sur l'axe local 1
+    b: point dans le plan local 1-2
+    e1 = a/|a|, e3 = (a x b)/|a x b|, e2 = e3 x e1
+
+Format CSV (une ligne par element, '#' pour les commentaires):
+    elem_id, a_x, a_y, a_z, b_x, b_y, b_z
+
+Utilise par micro_RVE_placement_3D.py, DFE2_TRC.py et input_file_PBCs_3D.py.
+
+Auteur: Projet ENISE - Methodes numeriques avancees
+Date: 2024
+"""
+
+import numpy as np
+import re
+import os
+
+# Tolerance en dessous de laquelle une rotation est consideree comme nulle (degres)
+ANGLE_TOLERANCE = 1e-8
+
+# Coordonnees naturelles des 8 noeuds d'un hexaedre (convention Abaqus C3D8)
+NOEUDS_NATURELS_C3D8 = np.array([
+    (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)
+], dtype=float)
+
+
+# =============================================================================
+# LECTURE DU CHAMP D'ORIENTATION
+# =============================================================================
+
+def lire_orientations_csv(filename):
+    """
+    Lit un champ d'orientation par element depuis un fichier CSV.
+
+    Retourne: dict {elem_id: (a, b)} avec a, b des tuples de 3 flottants
+    """
+    data = np.loadtxt(filename, delimiter=',', comments='#', ndmin=2)
+    if data.shape[1] != 7:
+        raise ValueError(f"{filename}: 7 colonnes attendues "
+                         f"(elem_id, a_x, a_y, a_z, b_x, b_y, b_z), {data.shape[1]} trouvees")
+
+    return {int(row[0]): (tuple(row[1:4]), tuple(row[4:7])) for row in data}
+
+
+def _lire_liste_ids(lines, i, generate):
+    """Lit les identifiants d'un *Nset/*Elset a partir de la ligne i."""
+    ids = []
+    while i < len(lines) and not lines[i].strip().startswith('*'):
+        valeurs = [int(float(v)) for v in lines[i].split(',') if v.strip()]
+        if generate and len(valeurs) >= 2:
+            pas = valeurs[2] if len(valeurs) > 2 else 1
+            ids.extend(range(valeurs[0], valeurs[1] + 1, pas))
+        else:
+            ids.extend(valeurs)
+        i += 1
+    return ids, i
+
+
+def lire_orientations_inp(filename):
+    """
+    Lit les *Orientation (system=RECTANGULAR) d'un fichier .inp et les
+    affecte aux elements via les *Solid Section, elset=..., orientation=...
+
+    Retourne: dict {elem_id: (a, b)} (vide si aucune orientation affectee)
+    """
+    with open(filename, 'r') as f:
+        lines = f.readlines()
+
+    orientations = {}  # {nom: (a, b)}
+    elsets = {}        # {nom: [elem_ids]}
+    sections = []      # [(elset, orientation)]
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        upper = line.upper()
+
+        if upper.startswith('*ORIENTATION'):
+            name = re.search(r'NAME\s*=\s*([^,\s]+)', line, re.IGNORECASE)
+            system = re.search(r'SYSTEM\s*=\s*([^,\s]+)', line, re.IGNORECASE)
+            if system and system.group(1).upper() != 'RECTANGULAR':
+                print(f"  ATTENTION: orientation {name.group(1) if name else '?'} "
+                      f"de type {system.group(1)} ignoree")
+            elif name and i + 1 < len(lines):
+                valeurs = [float(v) for v in lines[i + 1].split(',') if v.strip()]
+                if len(valeurs) >= 6:
+                    orientations[name.group(1).upper()] = (tuple(valeurs[0:3]),
+                                                           tuple(valeurs[3:6]))
+            i += 1
+
+        elif upper.startswith('*ELSET'):
+            name = re.search(r'ELSET\s*=\s*([^,\s]+)', line, re.IGNORECASE)
+            ids, i = _lire_liste_ids(lines, i + 1, 'GENERATE' in upper)
+            if name:
+                elsets.setdefault(name.group(1).upper(), []).extend(ids)
+
+        elif upper.startswith('*SOLID SECTION') and 'ORIENTATION' in upper:
+            elset = re.search(r'ELSET\s*=\s*([^,\s]+)', line, re.IGNORECASE)
+            orient = re.search(r'ORIENTATION\s*=\s*([^,\s]+)', line, re.IGNORECASE)
+            if elset and orient:
+                sections.append((elset.group(1).upper(), orient.group(1).upper()))
+            i += 1
+
+        else:
+            i += 1
+
+    resultat = {}
+    for elset, orient in sections:
+        if orient not in orientations:
+            print(f"  ATTENTION: orientation {orient} non definie")
+            continue
+        for elem_id in elsets.get(elset, []):
+            resultat[elem_id] = orientations[orient]
+
+    return resultat
+
+
+def lire_orientations(filename):
+    """
+    Lit un champ d'orientation (.csv ou .inp, detection par extension).
+    """
+    if not os.path.exists(filename):
+        raise FileNotFoundError(f"Fichier d'orientation non trouve: {filename}")
+
+    if os.path.splitext(filename)[1].lower() == '.inp':
+        return lire_orientations_inp(filename)
+    return lire_orientations_csv(filename)
+
+
+# =============================================================================
+# ROTATIONS VECTORISEES
+# =============================================================================
+
+def matrices_rotation(elem_ids, orientations):
+    """
+    Calcule les matrices de rotation (repere local -> global) de tous les
+    elements en une seule operation vectorisee.
+
+    elem_ids: sequence de n identifiants d'elements
+    orientations: dict {elem_id: (a, b)}; les elements absents ne sont pas tournes
+
+    Retourne: array (n, 3, 3), colonnes = axes locaux e1, e2, e3
+    """
+    elem_ids = np.asarray(elem_ids, dtype=int)
+    n = len(elem_ids)
+    a = np.tile([1.0, 0.0, 0.0], (n, 1))
+    b = np.tile([0.0, 1.0, 0.0], (n, 1))
+
+    if orientations:
+        # Table id -> ligne (a, b) triee, puis indexation de toutes les instances
+        ids = np.fromiter(orientations.keys(), dtype=int, count=len(orientations))
+        ab = np.array(list(orientations.values()), dtype=float).reshape(-1, 6)
+        ordre = np.argsort(ids)
+        ids, ab = ids[ordre], ab[ordre]
+        orientes = np.isin(elem_ids, ids)
+        lignes = np.searchsorted(ids, elem_ids[orientes])
+        a[orientes] = ab[lignes, :3]
+        b[orientes] = ab[lignes, 3:]
+
+    e1 = a / np.linalg.norm(a, axis=1, keepdims=True)
+    e3 = np.cross(a, b)
+    norme_e3 = np.linalg.norm(e3, axis=1, keepdims=True)
+    if np.any(norme_e3 < 1e-12):
+        raise ValueError("Orientation degeneree: les points a et b sont colineaires")
+    e3 = e3 / norme_e3
+    e2 = np.cross(e3, e1)
+
+    return np.stack([e1, e2, e3], axis=2)
+
+
+def axe_angle_depuis_rotation(R):
+    """
+    Convertit des matrices de rotation (n, 3, 3) en axes unitaires (n, 3)
+    et angles en degres (n,), format attendu par la 2e ligne de *Instance.
+    """
+    trace = np.trace(R, axis1=1, axis2=2)
+    angle = np.arccos(np.clip((trace - 1.0) / 2.0, -1.0, 1.0))
+
+    # Cas general: axe tire de la partie antisymetrique
+    axe = np.stack([R[:, 2, 1] - R[:, 1, 2],
+                    R[:, 0, 2] - R[:, 2, 0],
+                    R[:, 1, 0] - R[:, 0, 1]], axis=1)
+    norme = np.linalg.norm(axe, axis=1)
+
+    # Cas angle ~ 180 deg: partie antisymetrique nulle, axe tire de (R + I)/2
+    proche_pi = norme < 1e-8
+    if np.any(proche_pi):
+        B = 0.5 * (R[proche_pi] + np.eye(3))
+        colonne = np.argmax(np.diagonal(B, axis1=1, axis2=2), axis=1)
+        axe[proche_pi] = B[np.arange(len(colonne)), :, colonne]
+        norme[proche_pi] = np.linalg.norm(axe[proche_pi], axis=1)
+
+    # Rotation nulle: axe arbitraire
+    nulle = norme < 1e-12
+    axe[nulle] = (0.0, 0.0, 1.0)
+    norme[nulle] = 1.0
+
+    return axe / norme[:, None], np.degrees(angle)
+
+
+def lignes_rotation_instance(centres, axes, angles):
+    """
+    Construit la ligne de rotation *Instance de chaque instance.
+
+    La rotation s'effectue autour de l'axe passant par le centre du RVE
+    (point de Gauss) apres la translation. Retourne None pour les instances
+    non tournees afin de garder le fichier identique au cas sans orientation.
+    """
+    seconds = centres + axes
+    lignes = []
+    for c, s, theta in zip(centres, seconds, angles):
+        if abs(theta) < ANGLE_TOLERANCE:
+            lignes.append(None)
+        else:
+            lignes.append(f"  {c[0]:14.10f}, {c[1]:14.10f}, {c[2]:14.10f}, "
+                          f"{s[0]:14.10f}, {s[1]:14.10f}, {s[2]:14.10f}, {theta:14.10f}")
+    return lignes
+
+
+# =============================================================================
+# POIDS DE COUPLAGE DES COINS
+# =============================================================================
+
+def fonctions_forme_C3D8(xi):
+    """
+    Fonctions de forme C3D8 evaluees sur un tableau de coordonnees
+    naturelles (..., 3). Retourne un tableau (..., 8).
+    """
+    return 0.125 * np.prod(1.0 + xi[..., None, :] * NOEUDS_NATURELS_C3D8, axis=-1)
+
+
+def derivees_forme_C3D8(xi):
+    """
+    Derivees dN/dxi des fonctions de forme C3D8 en un point (3,).
+    Retourne un tableau (8, 3).
+    """
+    facteurs = 1.0 + xi[None, :] * NOEUDS_NATURELS_C3D8
+    dN = np.empty((8, 3))
+    for d in range(3):
+        autres = np.prod(np.delete(facteurs, d, axis=1), axis=1)
+        dN[:, d] = 0.125 * NOEUDS_NATURELS_C3D8[:, d] * autres
+    return dN
+
+
+def poids_coins_couplage(node_coords, gauss_points, rotations, rve_dims):
+    """
+    Calcule les poids de couplage coins RVE -> noeuds macro pour toutes les
+    instances en une seule passe vectorisee.
+
+    Chaque coin tourne d_k = R (c_k - c_RVE) est ramene en coordonnees
+    naturelles de l'element par le jacobien au point de Gauss, ajoute aux
+    coordonnees naturelles xi_g de ce point de Gauss, puis les fonctions de
+    forme y sont evaluees. Avec un champ d'orientation, ces poids servent a
+    toutes les instances, y compris non tournees, pour que le couplage varie
+    continument avec l'angle.
+
+    node_coords: (n_elem, 8, 3) coordonnees des noeuds macro
+    gauss_points: (n_gauss, 3) coordonnees naturelles des points de Gauss
+    rotations: (n_elem * n_gauss, 3, 3) rotations des instances
+    rve_dims: (L, H, T) dimensions du RVE
+
+    Retourne: array (n_elem * n_gauss, 8 coins, 8 noeuds macro)
+    """
+    gauss_points = np.asarray(gauss_points, dtype=float)
+    dims = np.asarray(rve_dims, dtype=float)
+
+    # Jacobiens J[e, g] = dN^T X (3x3), puis dx = J^T dxi
+    dN = np.array([derivees_forme_C3D8(gp) for gp in gauss_points])  # (g, 8, 3)
+    J = np.einsum('gai,eaj->egij', dN, node_coords).reshape(-1, 3, 3)
+
+    # Coins du RVE centres sur son milieu, dans le repere local
+    coins_locaux = 0.5 * NOEUDS_NATURELS_C3D8 * dims  # (8, 3)
+    coins_tournes = np.einsum('nij,kj->nki', rotations, coins_locaux)  # (n, 8, 3)
+
+    xi = np.linalg.solve(np.swapaxes(J, 1, 2)[:, None, :, :],
+                         coins_tournes[..., None])[..., 0]
+
+    # Coins autour du point de Gauss de chaque instance (ordre e, puis g)
+    n_elem = node_coords.shape[0]
+    xi_gauss = np.tile(gauss_points, (n_elem, 1))  # (n, 3)
+    return fonctions_forme_C3D8(xi_gauss[:, None, :] + xi)
@@ -8,32 +8,124 @@ Hypothèse: Matériau élastique linéaire => E = <σ> / <ε>
 Usage:
     python moyenne_volumique.py <chemin_repertoire> [--plot]
     python moyenne_volumique.py <chemin_fichier.rpt> [--plot]
+    python moyenne_volumique.py <chemin> --convert <repertoire_sortie> [--format npz|h5|parquet]
+    python moyenne_volumique.py <chemin> --phases <RVE.inp>
+
+Formats acceptés (détection par extension): .rpt (texte Abaqus), et en
+colonnes .npz/.npy, .h5/.hdf5 (h5py), .parquet (pandas + pyarrow), .csv.
+Les colonnes portent les noms du rapport (IVOL, S.S11, E.E11, ...) plus
+optionnellement 'element', 'point', 'instance' et 'phase'; 'S11'/'E11'
+sont aussi acceptés.
+
+Statistiques par phase: la phase de chaque point est lue dans la colonne
+'phase' du fichier, ou déduite des *Solid Section du .inp du RVE donné
+par --phases (instance du bloc "for part: ..." + numéro d'élément).
 
 Options:
-    --plot    Affiche les graphiques de répartition
+    --plot    Affiche les graphiques de répartition (rendus en parallèle avec --jobs N)
+    --stream  Lecture en flux par blocs (mémoire constante, sans tracé des points)
+    --jobs N  Analyse les fichiers d'un répertoire avec N processus (0: tous les cœurs)
+    --no-cache  Ignore le cache des résultats (.cache_homogeneisation/ à côté des .rpt)
+    --cache-data  Stocke aussi les données brutes dans le cache (copie .npz de chaque rapport)
+    --watch   Surveille le répertoire et traite les .rpt au fur et à mesure (Ctrl+C pour arrêter)
+    --convert DEST  Convertit les .rpt en fichiers colonnes compressés dans DEST
+    --phases INP    Moyennes, variances et fractions volumiques par phase (matériau)
 
 Exemple:
     python moyenne_volumique.py ./datas
     python moyenne_volumique.py ./datas/S11_E11_sym.rpt --plot
+    python moyenne_volumique.py ./datas --jobs 8
+    python moyenne_volumique.py ./datas --watch --plot
 """
 
+import dataclasses
+import hashlib
+import io
+import json
+import math
 import os
 import re
+import sqlite3
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 
 
+# En-tête d'un bloc de données Abaqus: "Element Label  Int  <colonnes...>"
+ENTETE_BLOC = 'Element Label'
+
+# Fin d'un bloc de données: première ligne vide
+MOTIF_FIN_BLOC = re.compile(r'\n[ \t\r]*\n')
+
+# Valeur numérique d'une ligne de données (123, -1.5, 172.361E-03, ...)
+MOTIF_NOMBRE = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[Ee][-+]?\d+)?'
+
+# Taille des morceaux lus en mode flux (caractères)
+TAILLE_BLOC_FLUX = 16 * 1024 * 1024
+
+# Cache des résultats: sous-répertoire créé à côté des .rpt et version du
+# format (à incrémenter dès que le calcul des résultats change)
+DOSSIER_CACHE = '.cache_homogeneisation'
+VERSION_CACHE = 3
+
+# Période de scrutation du répertoire en mode surveillance (s)
+INTERVALLE_SURVEILLANCE = 2.0
+
+# Formats colonnes acceptés en plus des rapports .rpt (détection par extension)
+EXTENSIONS_COLONNES = ('.npz', '.npy', '.h5', '.hdf5', '.parquet', '.csv')
+EXTENSIONS_ANALYSABLES = ('.rpt',) + EXTENSIONS_COLONNES
+
+# Noms des colonnes Element Label / Int Pt dans les formats colonnes
+COLONNE_ELEMENT = 'element'
+COLONNE_POINT = 'point'
+COLONNE_INSTANCE = 'instance'
+COLONNE_PHASE = 'phase'
+
+# Groupe des points sans phase connue dans les statistiques par phase
+PHASE_NON_AFFECTEE = '(non affecté)'
+
+# Au-delà de ce nombre de points, les répartitions sont tracées en densité (hexbin)
+SEUIL_DENSITE = 200_000
+
+# Nombre maximal de points par fichier dans les nuages de la comparaison
+SEUIL_DECIMATION = 20_000
+
+# Composantes des tenseurs en notation de Voigt (ordre Abaqus, cisaillements
+# en déformation ingénieur γij)
+COMPOSANTES_VOIGT = ('11', '22', '33', '12', '13', '23')
+
+
 @dataclass
-class DonneesElement:
-    """Données extraites pour un élément."""
-    deformation: Optional[float]
-    volume: float
-    contrainte: float
+class DonneesRPT:
+    """Données extraites d'un fichier .rpt, stockées par colonnes (tableaux NumPy)."""
+    element: np.ndarray
+    point: np.ndarray
+    volume: np.ndarray
+    contrainte: np.ndarray
+    deformation: Optional[np.ndarray] = None
+    
+    # Toutes les composantes S.Sij / E.Eij du rapport: tableau (n, nb_composantes)
+    composantes: list[str] = field(default_factory=list)
+    tenseur: Optional[np.ndarray] = None
+    
+    # Instance (part) de chaque point: codes dans la liste des noms
+    instance: Optional[np.ndarray] = None
+    instances: list[str] = field(default_factory=list)
+    
+    # Phase de chaque point si le fichier la fournit: codes dans la liste des noms
+    phase: Optional[np.ndarray] = None
+    phases: list[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.volume)
 
 
 @dataclass
@@ -58,18 +150,23 @@ class ResultatsAnalyse:
     # Module d'élasticité (si déformation disponible)
     module_elasticite: Optional[float]
     
+    # Moyennes volumiques de toutes les composantes S.Sij / E.Eij présentes
+    moyennes_tenseur: dict[str, float] = field(default_factory=dict)
+    
     # Données brutes pour le tracé
-    donnees: list[DonneesElement] = field(default_factory=list)
+    donnees: Optional[DonneesRPT] = None
     
     erreur: Optional[str] = None
 
 
-def detecter_format_fichier(content: str) -> dict:
+def detecter_format_fichier(colonnes: list[str]) -> dict:
     """
-    Détecte le format du fichier et les colonnes présentes.
+    Détecte le format du fichier à partir des noms de colonnes de ses
+    en-têtes de blocs (ou de ses colonnes pour un fichier colonnes).
     
     Returns:
-        dict avec les indices des colonnes et leurs noms
+        dict avec les noms de la contrainte, de la déformation et des
+        composantes des tenseurs présentes
     """
     info = {
         'has_deformation': False,
@@ -77,79 +174,774 @@ def detecter_format_fichier(content: str) -> dict:
         'nom_deformation': None,
         'col_deformation': None,
         'col_volume': None,
-        'col_contrainte': None
+        'col_contrainte': None,
+        'composantes': []
     }
     
     # Détecter si E.Exx est présent (déformation)
-    deform_match = re.search(r'(E\.E\d+)', content)
-    if deform_match:
+    nom_deformation = next((c for c in colonnes if re.fullmatch(r'E\.E\d+', c)), None)
+    if nom_deformation:
         info['has_deformation'] = True
-        info['nom_deformation'] = deform_match.group(1)
+        info['nom_deformation'] = nom_deformation
     
     # Détecter le nom de la contrainte
-    stress_match = re.search(r'(S\.S\d+)', content)
-    if stress_match:
-        info['nom_contrainte'] = stress_match.group(1)
+    nom_contrainte = next((c for c in colonnes if re.fullmatch(r'S\.S\d+', c)), None)
+    if nom_contrainte:
+        info['nom_contrainte'] = nom_contrainte
+    
+    # Toutes les composantes des tenseurs présentes (ordre de Voigt)
+    info['composantes'] = composantes_tenseur(colonnes)
     
     return info
 
 
-def lire_fichier_rpt(filepath: str) -> tuple[list[DonneesElement], dict]:
+def composantes_tenseur(colonnes) -> list[str]:
+    """
+    Liste les composantes S.Sij puis E.Eij présentes dans `colonnes`,
+    dans l'ordre de Voigt (11, 22, 33, 12, 13, 23).
+    """
+    return ([f'S.S{c}' for c in COMPOSANTES_VOIGT if f'S.S{c}' in colonnes] +
+            [f'E.E{c}' for c in COMPOSANTES_VOIGT if f'E.E{c}' in colonnes])
+
+
+def chercher_entete_bloc(content: str, depart: int = 0) -> Optional[tuple[int, list[str], int]]:
+    """
+    Cherche le prochain en-tête de bloc de données à partir de `depart`.
+    
+    Returns:
+        (début de la ligne d'en-tête, noms des colonnes, début des données)
+        ou None si aucun en-tête. Le début des données vaut -1 si la ligne
+        de tirets qui suit l'en-tête n'est pas encore complète dans `content`.
+    """
+    position = content.find(ENTETE_BLOC, depart)
+    while position != -1:
+        debut_ligne = content.rfind('\n', 0, position) + 1
+        fin_entete = content.find('\n', position)
+        if fin_entete == -1:
+            return debut_ligne, [], -1
+        
+        mots = content[debut_ligne:fin_entete].split()
+        if mots[:3] == ['Element', 'Label', 'Int']:
+            # Les données commencent après la ligne de tirets qui suit l'en-tête
+            tirets = content.find('---', fin_entete)
+            fin_tirets = content.find('\n', tirets) if tirets != -1 else -1
+            debut = fin_tirets + 1 if fin_tirets != -1 else -1
+            return debut_ligne, mots[3:], debut
+        
+        # Mention de la colonne hors en-tête ("Output sorted by column ...")
+        position = content.find(ENTETE_BLOC, fin_entete)
+    
+    return None
+
+
+def convertir_bloc(texte: str, nb_colonnes: int) -> np.ndarray:
+    """
+    Convertit un bloc de lignes numériques en tableau (n, 2 + nb_colonnes).
+    
+    Les lignes vides, non numériques ou qui n'ont pas le bon nombre de
+    colonnes sont ignorées, comme avec la lecture ligne par ligne.
+    """
+    largeur = 2 + nb_colonnes
+    if not texte.strip():
+        return np.empty((0, largeur))
+    
+    try:
+        tableau = np.loadtxt(io.StringIO(texte), dtype=np.float64, comments=None, ndmin=2)
+        if tableau.shape[1] == largeur:
+            return tableau
+    except ValueError:
+        pass
+    
+    # Bloc non conforme: seules les lignes de données valides sont converties
+    motif = re.compile(rf'^[ \t]*\d+[ \t]+\d+(?:[ \t]+{MOTIF_NOMBRE}){{{nb_colonnes}}}[ \t\r]*$',
+                       re.MULTILINE)
+    lignes = [ligne.group(0) for ligne in motif.finditer(texte)]
+    if not lignes:
+        return np.empty((0, largeur))
+    return np.loadtxt(lignes, dtype=np.float64, comments=None, ndmin=2)
+
+
+def lire_blocs_rpt(content: str) -> tuple[list[str], np.ndarray, list[tuple[str, int]]]:
+    """
+    Extrait tous les blocs de données numériques d'un rapport .rpt.
+    
+    Chaque bloc (un par part, plusieurs rapports possibles dans un même
+    fichier) est repéré par son en-tête puis converti d'un seul tenant
+    en tableau NumPy, sans traitement ligne par ligne en Python.
+    
+    Returns:
+        (noms des colonnes, tableau (n, 2 + nb_colonnes), blocs) avec en tête
+        du tableau les colonnes Element Label et Int Pt, et pour chaque bloc
+        le nom de son instance ("for part: ...", '' si absent) et son nombre de lignes
+    """
+    colonnes = None
+    tableaux = []
+    blocs = []
+    
+    fin = 0
+    entete = chercher_entete_bloc(content)
+    while entete is not None and entete[2] != -1:
+        debut_entete, noms, debut = entete
+        if colonnes is None:
+            colonnes = noms
+        elif noms != colonnes:
+            raise ValueError(f"Colonnes incohérentes entre les blocs: {colonnes} / {noms}")
+        
+        # Instance du bloc: dernière mention "for part:" depuis le bloc précédent
+        part = content.rfind('for part:', fin, debut_entete)
+        instance = (content[part + 9:content.find('\n', part)].strip()
+                    if part != -1 else '')
+        
+        fin = MOTIF_FIN_BLOC.search(content, debut)
+        fin = fin.start() if fin else len(content)
+        tableaux.append(convertir_bloc(content[debut:fin], len(noms)))
+        blocs.append((instance, len(tableaux[-1])))
+        
+        entete = chercher_entete_bloc(content, fin)
+    
+    if colonnes is None:
+        return [], np.empty((0, 2)), []
+    
+    return colonnes, np.concatenate(tableaux), blocs
+
+
+def codes_instances_blocs(blocs: list[tuple[str, int]]) -> tuple[list[str], np.ndarray]:
+    """Noms des instances et code d'instance de chaque ligne à partir des blocs d'un rapport."""
+    noms = list(dict.fromkeys(nom for nom, _ in blocs))
+    codes = [noms.index(nom) for nom, _ in blocs]
+    return noms, np.repeat(np.array(codes, dtype=np.int64), [taille for _, taille in blocs])
+
+
+def factoriser(valeurs: np.ndarray, noms: Optional[list] = None) -> tuple[list[str], np.ndarray]:
+    """
+    Codes entiers et noms d'une colonne catégorielle (instance, phase).
+    
+    Une colonne numérique est prise comme codes (noms fournis ou numéros),
+    une colonne de chaînes est factorisée.
+    """
+    valeurs = np.asarray(valeurs)
+    if valeurs.dtype.kind in 'iuf':
+        codes = valeurs.astype(np.int64)
+        if noms is None:
+            noms = range(int(codes.max()) + 1 if len(codes) else 0)
+        return [n.decode() if isinstance(n, bytes) else str(n) for n in noms], codes
+    
+    uniques, codes = np.unique(valeurs.astype(str), return_inverse=True)
+    return uniques.tolist(), codes.astype(np.int64)
+
+
+def lire_fichier_rpt(filepath: str) -> tuple[DonneesRPT, dict]:
     """
-    Lit un fichier .rpt et extrait les données.
+    Lit un fichier .rpt et extrait les données sous forme de tableaux.
     """
     with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
         content = f.read()
     
-    info = detecter_format_fichier(content)
-    donnees = []
+    noms, tableau, blocs = lire_blocs_rpt(content)
+    info = detecter_format_fichier(noms)
     
-    if info['has_deformation']:
-        pattern = r'^\s*\d+\s+\d+\s+([\d.E+-]+)\s+([\d.E+-]+)\s+([\d.E+-]+)\s*$'
-        
-        for line in content.split('\n'):
-            match = re.match(pattern, line)
-            if match:
-                try:
-                    deformation = float(match.group(1))
-                    volume = float(match.group(2))
-                    contrainte = float(match.group(3))
-                    donnees.append(DonneesElement(deformation, volume, contrainte))
-                except ValueError:
-                    continue
+    colonnes = {nom: tableau[:, 2 + i] for i, nom in enumerate(noms)}
+    if noms:
+        colonnes[COLONNE_ELEMENT] = tableau[:, 0]
+        colonnes[COLONNE_POINT] = tableau[:, 1]
+    
+    return donnees_depuis_colonnes(colonnes, info, instances=codes_instances_blocs(blocs)), info
+
+
+def donnees_depuis_colonnes(colonnes: dict[str, np.ndarray], info: dict,
+                            instances: Optional[tuple[list[str], np.ndarray]] = None,
+                            phases: Optional[tuple[list[str], np.ndarray]] = None) -> DonneesRPT:
+    """
+    Construit les données par colonnes à partir d'un dictionnaire {nom: tableau}.
+    
+    instances et phases sont des couples (noms, codes par point), voir factoriser.
+    """
+    def colonne(nom: Optional[str]) -> Optional[np.ndarray]:
+        if nom is None or nom not in colonnes:
+            return None
+        return colonnes[nom]
+    
+    if colonnes and 'IVOL' not in colonnes:
+        raise ValueError(f"Colonne IVOL absente du rapport (colonnes: {list(colonnes)})")
+    
+    volume = colonne('IVOL')
+    contrainte = colonne(info['nom_contrainte'])
+    if volume is None or contrainte is None:
+        volume = contrainte = np.empty(0)
+    
+    n = len(volume)
+    composantes = [c for c in info['composantes'] if c in colonnes]
+    
+    return DonneesRPT(
+        element=colonnes.get(COLONNE_ELEMENT, np.arange(1, n + 1)).astype(np.int64),
+        point=colonnes.get(COLONNE_POINT, np.ones(n)).astype(np.int64),
+        volume=volume,
+        contrainte=contrainte,
+        deformation=colonne(info['nom_deformation']) if info['has_deformation'] else None,
+        composantes=composantes,
+        tenseur=(np.column_stack([colonnes[c] for c in composantes]) if n and composantes
+                 else np.empty((n, len(composantes)))),
+        instance=instances[1] if instances else None,
+        instances=instances[0] if instances else [],
+        phase=phases[1] if phases else None,
+        phases=phases[0] if phases else []
+    )
+
+
+def normaliser_nom_colonne(nom: str) -> str:
+    """Ramène un nom de colonne aux noms du rapport Abaqus ('S11' -> 'S.S11', 'ivol' -> 'IVOL')."""
+    nom = nom.strip()
+    if re.fullmatch(r'[SE]\d\d', nom):
+        return f'{nom[0]}.{nom}'
+    if nom.upper() == 'IVOL':
+        return 'IVOL'
+    return nom
+
+
+def lire_fichier_colonnes(filepath: str) -> tuple[DonneesRPT, dict]:
+    """
+    Lit un fichier de résultats en colonnes (.npz, .npy, .h5/.hdf5, .parquet, .csv).
+    
+    Le format est détecté par l'extension. Les lecteurs HDF5 et Parquet
+    nécessitent h5py et pandas (+ pyarrow), importés seulement si besoin.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    
+    if extension == '.npz':
+        with np.load(filepath) as npz:
+            brutes = {nom: npz[nom] for nom in npz.files}
+    elif extension == '.npy':
+        tableau = np.load(filepath)
+        if tableau.dtype.names is None:
+            raise ValueError("Un .npy doit contenir un tableau structuré (un champ par colonne)")
+        brutes = {nom: tableau[nom] for nom in tableau.dtype.names}
+    elif extension in ('.h5', '.hdf5'):
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("h5py requis pour lire les fichiers HDF5 (pip install h5py)")
+        with h5py.File(filepath, 'r') as f:
+            groupe = f['colonnes'] if 'colonnes' in f else f
+            brutes = {nom: groupe[nom][()] for nom in groupe
+                      if isinstance(groupe[nom], h5py.Dataset)}
+    elif extension == '.parquet':
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas (+ pyarrow) requis pour lire les fichiers Parquet")
+        df = pd.read_parquet(filepath)
+        brutes = {nom: df[nom].to_numpy() for nom in df.columns}
+    elif extension == '.csv':
+        try:
+            import pandas as pd
+            df = pd.read_csv(filepath, engine='c')
+            brutes = {nom: df[nom].to_numpy() for nom in df.columns}
+        except ImportError:
+            with open(filepath, 'r') as f:
+                noms = f.readline().strip().split(',')
+            tableau = np.loadtxt(filepath, delimiter=',', skiprows=1, ndmin=2)
+            brutes = {nom: tableau[:, i] for i, nom in enumerate(noms)}
     else:
-        pattern = r'^\s*\d+\s+\d+\s+([\d.E+-]+)\s+([\d.E+-]+)\s*$'
-        
-        for line in content.split('\n'):
-            match = re.match(pattern, line)
-            if match:
-                try:
-                    volume = float(match.group(1))
-                    contrainte = float(match.group(2))
-                    donnees.append(DonneesElement(None, volume, contrainte))
-                except ValueError:
+        raise ValueError(f"Format non reconnu: {extension} (acceptés: {', '.join(EXTENSIONS_ANALYSABLES)})")
+    
+    # Colonnes catégorielles: codes (+ noms stockés à part en npz/h5) ou chaînes
+    noms_instances = brutes.pop('instances', None)
+    noms_phases = brutes.pop('phases', None)
+    instances = (factoriser(brutes.pop(COLONNE_INSTANCE), noms_instances)
+                 if COLONNE_INSTANCE in brutes else None)
+    phases = (factoriser(brutes.pop(COLONNE_PHASE), noms_phases)
+              if COLONNE_PHASE in brutes else None)
+    
+    colonnes = {normaliser_nom_colonne(nom): np.asarray(valeurs, dtype=np.float64)
+                for nom, valeurs in brutes.items()}
+    info = detecter_format_fichier(list(colonnes))
+    
+    return donnees_depuis_colonnes(colonnes, info, instances, phases), info
+
+
+def lire_fichier_donnees(filepath: str) -> tuple[DonneesRPT, dict]:
+    """Lit un fichier de résultats, rapport .rpt ou fichier colonnes selon l'extension."""
+    if os.path.splitext(filepath)[1].lower() == '.rpt':
+        return lire_fichier_rpt(filepath)
+    return lire_fichier_colonnes(filepath)
+
+
+def convertir_rpt(filepath: str, repertoire_sortie: str, format: str = 'npz') -> str:
+    """
+    Convertit un rapport .rpt en fichier colonnes compressé (npz, h5 ou parquet).
+    
+    Returns:
+        chemin du fichier écrit
+    """
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        noms, tableau, blocs = lire_blocs_rpt(f.read())
+    if not noms:
+        raise ValueError(f"Aucune donnée trouvée dans {filepath}")
+    
+    noms_instances, instance = codes_instances_blocs(blocs)
+    colonnes = {COLONNE_ELEMENT: tableau[:, 0].astype(np.int64),
+                COLONNE_POINT: tableau[:, 1].astype(np.int64),
+                COLONNE_INSTANCE: instance}
+    colonnes.update({nom: tableau[:, 2 + i] for i, nom in enumerate(noms)})
+    
+    os.makedirs(repertoire_sortie, exist_ok=True)
+    base = os.path.join(repertoire_sortie, Path(filepath).stem)
+    
+    if format == 'npz':
+        sortie = base + '.npz'
+        np.savez_compressed(sortie, instances=np.array(noms_instances, dtype=str), **colonnes)
+    elif format == 'h5':
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("h5py requis pour écrire les fichiers HDF5 (pip install h5py)")
+        sortie = base + '.h5'
+        with h5py.File(sortie, 'w') as f:
+            groupe = f.create_group('colonnes')
+            for nom, valeurs in colonnes.items():
+                groupe.create_dataset(nom, data=valeurs, compression='gzip', shuffle=True)
+            groupe.create_dataset('instances', data=np.array(noms_instances, dtype='S'))
+    elif format == 'parquet':
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas (+ pyarrow) requis pour écrire les fichiers Parquet")
+        sortie = base + '.parquet'
+        colonnes[COLONNE_INSTANCE] = pd.Categorical.from_codes(instance, noms_instances)
+        pd.DataFrame(colonnes).to_parquet(sortie, compression='zstd')
+    else:
+        raise ValueError(f"Format de conversion non reconnu: {format} (npz, h5, parquet)")
+    
+    return sortie
+
+
+def lire_fichier_rpt_flux(filepath: str, taille_bloc: int = TAILLE_BLOC_FLUX):
+    """
+    Lit un fichier .rpt par morceaux de taille fixe, en mémoire constante.
+    
+    Les morceaux sont coupés sur une fin de ligne; un en-tête ou une fin de
+    bloc à cheval sur deux morceaux est reporté au morceau suivant.
+    
+    Yields:
+        (noms des colonnes, tableau (n, 2 + nb_colonnes)) pour chaque morceau de données
+    """
+    colonnes = None    # Colonnes du bloc de données en cours (None: hors bloc)
+    reste = ''
+    
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            morceau = f.read(taille_bloc)
+            texte = reste + morceau
+            if morceau:
+                # Conserver la dernière fin de ligne dans le reste pour
+                # détecter une ligne vide à cheval sur deux morceaux
+                coupure = texte.rfind('\n')
+                if coupure == -1:
+                    reste = texte
                     continue
+                # Une ligne vide juste avant la coupure part aussi dans le
+                # reste: ses deux fins de ligne restent dans le même morceau
+                avant = texte[:coupure].rstrip(' \t\r')
+                if avant.endswith('\n'):
+                    coupure = len(avant) - 1
+                texte, reste = texte[:coupure], texte[coupure:]
+            else:
+                reste = ''
+            
+            position = 0
+            while position < len(texte):
+                if colonnes is None:
+                    entete = chercher_entete_bloc(texte, position)
+                    if entete is None:
+                        break
+                    debut_ligne, noms, debut = entete
+                    if debut == -1:
+                        if not morceau:
+                            break
+                        # En-tête incomplet: reporté au morceau suivant
+                        reste = texte[debut_ligne:] + reste
+                        break
+                    colonnes, position = noms, debut
+                else:
+                    fin = MOTIF_FIN_BLOC.search(texte, position)
+                    fin_donnees = fin.start() if fin else len(texte)
+                    tableau = convertir_bloc(texte[position:fin_donnees], len(colonnes))
+                    if len(tableau):
+                        yield colonnes, tableau
+                    if fin is None:
+                        break
+                    colonnes, position = None, fin.start()
+            
+            if not morceau:
+                break
+
+
+class AccumulateurVolumique:
+    """
+    Accumule Σ V·X, ΣV, min et max de plusieurs grandeurs morceau par morceau.
+    
+    Chaque morceau est sommé par np.sum / np.dot (sommation par paires), puis
+    les sommes partielles sont cumulées avec compensation de Neumaier (Kahan
+    amélioré), ce qui garde la précision sur des milliards de points.
+    """
     
-    return donnees, info
+    def __init__(self, nb_composantes: int = 1):
+        self.nb_valeurs = 0
+        # Ligne 0: somme, ligne 1: compensation
+        self._volume = np.zeros((2, 1))
+        self._ponderee = np.zeros((2, nb_composantes))
+        self.minimum = np.full(nb_composantes, math.inf)
+        self.maximum = np.full(nb_composantes, -math.inf)
+    
+    @staticmethod
+    def _cumuler(sommes: np.ndarray, valeur: np.ndarray):
+        total = sommes[0].copy()
+        t = total + valeur
+        sommes[1] += np.where(np.abs(total) >= np.abs(valeur),
+                              (total - t) + valeur, (valeur - t) + total)
+        sommes[0] = t
+    
+    def ajouter(self, valeurs: np.ndarray, volumes: np.ndarray):
+        """Ajoute un morceau de valeurs (n,) ou (n, nb_composantes) et les volumes associés."""
+        if len(valeurs) == 0:
+            return
+        valeurs = valeurs.reshape(len(valeurs), -1)
+        self.nb_valeurs += len(valeurs)
+        self._cumuler(self._volume, np.sum(volumes))
+        self._cumuler(self._ponderee, volumes @ valeurs)
+        self.minimum = np.minimum(self.minimum, valeurs.min(axis=0))
+        self.maximum = np.maximum(self.maximum, valeurs.max(axis=0))
+    
+    @property
+    def volume_total(self) -> float:
+        return float(self._volume.sum())
+    
+    @property
+    def moyennes(self) -> np.ndarray:
+        return self._ponderee.sum(axis=0) / self.volume_total
 
 
-def calculer_moyenne_volumique(valeurs: list[float], volumes: list[float]) -> float:
+def calculer_moyenne_volumique(valeurs: np.ndarray, volumes: np.ndarray):
     """
     Calcule la moyenne volumique: <X> = Σ(Vi * Xi) / Σ(Vi)
+    
+    Avec valeurs de forme (n, k), les k moyennes sont calculées en une seule
+    passe (produit matrice-vecteur) et renvoyées sous forme de tableau.
     """
-    volume_total = sum(volumes)
-    somme_ponderee = sum(v * x for v, x in zip(volumes, valeurs))
-    return somme_ponderee / volume_total
+    volumes = np.asarray(volumes, dtype=np.float64)
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    moyennes = np.dot(volumes, valeurs) / volumes.sum()
+    return float(moyennes) if valeurs.ndim == 1 else moyennes
+
+
+def _parametre_inp(ligne: str, cle: str) -> Optional[str]:
+    """Valeur d'un paramètre 'cle=valeur' d'une ligne de mot-clé Abaqus (None si absent)."""
+    trouve = re.search(rf',\s*{cle}\s*=\s*([^,]+)', ligne, re.IGNORECASE)
+    return trouve.group(1).strip().strip('"') if trouve else None
+
+
+def _lire_ids_inp(lignes: list[str], i: int, generate: bool) -> tuple[list[int], int]:
+    """Lit les numéros d'un *Elset à partir de la ligne i (option generate comprise)."""
+    ids = []
+    while i < len(lignes) and not lignes[i].lstrip().startswith('*'):
+        valeurs = [int(float(v)) for v in lignes[i].split(',') if v.strip()]
+        if generate and len(valeurs) >= 2:
+            ids.extend(range(valeurs[0], valeurs[1] + 1, valeurs[2] if len(valeurs) > 2 else 1))
+        else:
+            ids.extend(valeurs)
+        i += 1
+    return ids, i
+
 
+def _lire_elements_inp(lignes: list[str], i: int) -> tuple[list[int], int]:
+    """Lit les numéros des éléments d'un bloc *Element à partir de la ligne i."""
+    ids = []
+    suite = False  # ligne précédente terminée par une virgule: connectivité continuée
+    while i < len(lignes) and not lignes[i].lstrip().startswith('*'):
+        ligne = lignes[i].strip()
+        if ligne and not suite:
+            ids.append(int(float(ligne.split(',')[0])))
+        suite = ligne.endswith(',')
+        i += 1
+    return ids, i
 
-def analyser_fichier(filepath: str) -> ResultatsAnalyse:
+
+def lire_phases_inp(filepath: str) -> dict[str, dict[int, str]]:
+    """
+    Lit la carte élément -> phase d'un .inp de RVE à partir des *Solid Section.
+    
+    Les sections peuvent être définies dans les parts (elset de la part,
+    appliquée à toutes ses instances) ou au niveau de l'assemblage
+    (elset=INSTANCE.ELSET ou elset d'assemblage avec instance=...). Les
+    elsets viennent des *Elset et du paramètre elset= des *Element.
+    
+    Returns:
+        {nom d'instance en majuscules: {numéro d'élément: matériau}}
+    """
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        lignes = f.readlines()
+    
+    part = None
+    instances = {}          # instance -> part
+    elsets_part = {}        # (part, elset) -> numéros
+    elsets_assemblage = {}  # elset -> (instance, numéros)
+    sections = []           # (part ou None, elset, matériau)
+    
+    i = 0
+    while i < len(lignes):
+        ligne = lignes[i].strip()
+        mot_cle = ligne.split(',')[0].upper()
+        
+        if mot_cle == '*PART':
+            part = (_parametre_inp(ligne, 'name') or '').upper()
+        elif mot_cle == '*END PART':
+            part = None
+        elif mot_cle == '*INSTANCE':
+            instances[(_parametre_inp(ligne, 'name') or '').upper()] = (_parametre_inp(ligne, 'part') or '').upper()
+        elif mot_cle in ('*ELSET', '*ELEMENT'):
+            nom = (_parametre_inp(ligne, 'elset') or '').upper()
+            if mot_cle == '*ELSET':
+                ids, i = _lire_ids_inp(lignes, i + 1, 'GENERATE' in ligne.upper())
+            else:
+                ids, i = _lire_elements_inp(lignes, i + 1)
+            if not nom:
+                continue
+            # Plusieurs blocs de même nom s'ajoutent (comme dans Abaqus)
+            if part is not None:
+                elsets_part.setdefault((part, nom), []).extend(ids)
+            else:
+                instance = (_parametre_inp(ligne, 'instance') or '').upper()
+                elsets_assemblage.setdefault(nom, (instance, []))[1].extend(ids)
+            continue
+        elif mot_cle == '*SOLID SECTION':
+            sections.append((part, (_parametre_inp(ligne, 'elset') or '').upper(),
+                             _parametre_inp(ligne, 'material')))
+        i += 1
+    
+    carte = {}
+    for part_section, elset, materiau in sections:
+        if part_section is not None:
+            cibles = [(instance, elsets_part.get((part_section, elset), []))
+                      for instance, p in instances.items() if p == part_section]
+        elif '.' in elset:
+            instance, nom = elset.split('.', 1)
+            cibles = [(instance, elsets_part.get((instances.get(instance), nom), []))]
+        elif elset in elsets_assemblage:
+            cibles = [elsets_assemblage[elset]]
+        else:
+            cibles = [('', [])]
+        
+        for instance, ids in cibles:
+            if not ids:
+                print(f"  ATTENTION: elset {elset} de la section {materiau} vide ou introuvable ({instance})")
+            carte.setdefault(instance, {}).update(dict.fromkeys(ids, materiau))
+    
+    return carte
+
+
+def codes_phases(donnees: DonneesRPT,
+                 carte: Optional[dict[str, dict[int, str]]] = None) -> tuple[list[str], np.ndarray]:
     """
-    Analyse complète d'un fichier .rpt.
+    Phase de chaque point: colonne 'phase' du fichier si présente, sinon
+    carte (instance, élément) -> matériau lue par lire_phases_inp.
+    
+    La carte est transformée en une table de correspondance indexée par
+    code d'instance * (numéro max + 1) + numéro d'élément, puis appliquée à
+    tous les points en une seule indexation. Code -1: point sans phase.
+    """
+    if donnees.phase is not None:
+        return donnees.phases, donnees.phase
+    if not carte:
+        raise ValueError("Aucune phase: ni colonne 'phase' ni carte des phases (.inp)")
+    
+    if donnees.instance is not None:
+        instance, noms_instances = donnees.instance, donnees.instances
+    elif len(carte) == 1:
+        instance, noms_instances = np.zeros(len(donnees), dtype=np.int64), list(carte)
+    else:
+        raise ValueError("Instance des points inconnue: la carte des phases doit n'avoir qu'une instance")
+    
+    noms_phases = sorted({m for elements in carte.values() for m in elements.values()})
+    index_phase = {m: k for k, m in enumerate(noms_phases)}
+    
+    nb_numeros = int(donnees.element.max(initial=0)) + 1
+    table = np.full(len(noms_instances) * nb_numeros, -1, dtype=np.int64)
+    for code, nom in enumerate(noms_instances):
+        elements = carte.get(nom.upper(), {})
+        numeros = np.fromiter(elements.keys(), dtype=np.int64, count=len(elements))
+        phases = np.fromiter((index_phase[m] for m in elements.values()), dtype=np.int64,
+                             count=len(elements))
+        utiles = numeros < nb_numeros
+        table[code * nb_numeros + numeros[utiles]] = phases[utiles]
+    
+    return noms_phases, table[instance * nb_numeros + donnees.element]
+
+
+def statistiques_phases(donnees: DonneesRPT, noms_phases: list[str],
+                        codes: np.ndarray) -> dict[str, dict]:
+    """
+    Statistiques volumiques par phase de toutes les composantes du rapport.
+    
+    Pour chaque phase p: V_p = Σ Vi, f_p = V_p / V, <X>_p = Σ Vi Xi / V_p et
+    Var_p(X) = Σ Vi (Xi - <X>_p)² / V_p. Toutes les phases et composantes sont
+    réduites ensemble par np.bincount sur l'indice (phase, composante), sans
+    filtrer les données phase par phase. Les points de code -1 forment le
+    groupe PHASE_NON_AFFECTEE.
+    
+    Returns:
+        {phase: {'nb_points', 'volume', 'fraction_volumique',
+                 'moyennes': {composante: valeur}, 'variances': {composante: valeur}}}
+    """
+    if donnees.composantes:
+        noms, valeurs = donnees.composantes, donnees.tenseur
+    else:
+        noms, valeurs = ['contrainte'], donnees.contrainte[:, None]
+    
+    groupes = list(noms_phases) + [PHASE_NON_AFFECTEE]
+    nb_groupes, k = len(groupes), len(noms)
+    groupe = np.where(codes < 0, nb_groupes - 1, codes)
+    volumes = donnees.volume
+    
+    nb_points = np.bincount(groupe, minlength=nb_groupes)
+    volume_groupe = np.bincount(groupe, weights=volumes, minlength=nb_groupes)
+    
+    # Indice de case (phase, composante) de chaque valeur du tableau (n, k)
+    cases = (groupe[:, None] * k + np.arange(k)).ravel()
+    
+    def somme_par_case(poids: np.ndarray) -> np.ndarray:
+        return np.bincount(cases, weights=poids.ravel(), minlength=nb_groupes * k).reshape(nb_groupes, k)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        moyennes = somme_par_case(volumes[:, None] * valeurs) / volume_groupe[:, None]
+        ecarts = valeurs - moyennes[groupe]
+        variances = somme_par_case(volumes[:, None] * ecarts * ecarts) / volume_groupe[:, None]
+    
+    volume_total = volume_groupe.sum()
+    return {
+        nom: {
+            'nb_points': int(nb_points[g]),
+            'volume': float(volume_groupe[g]),
+            'fraction_volumique': float(volume_groupe[g] / volume_total),
+            'moyennes': dict(zip(noms, moyennes[g].tolist())),
+            'variances': dict(zip(noms, variances[g].tolist())),
+        }
+        for g, nom in enumerate(groupes) if nb_points[g] > 0
+    }
+
+
+def analyser_fichier_flux(filepath: str, taille_bloc: int = TAILLE_BLOC_FLUX) -> ResultatsAnalyse:
+    """
+    Analyse d'un fichier .rpt en flux, en mémoire constante.
+    
+    Les moyennes sont identiques à analyser_fichier mais les données brutes
+    ne sont pas conservées (pas de tracé des points).
     """
     nom_fichier = os.path.basename(filepath)
     
+    accumulateur = None
+    colonnes_rapport = None
+    composantes = []
+    nom_contrainte = nom_deformation = None
+    
     try:
-        donnees, info = lire_fichier_rpt(filepath)
+        for colonnes, tableau in lire_fichier_rpt_flux(filepath, taille_bloc):
+            if colonnes_rapport is None:
+                if 'IVOL' not in colonnes:
+                    raise ValueError(f"Colonne IVOL absente du rapport (colonnes: {colonnes})")
+                info = detecter_format_fichier(colonnes)
+                nom_contrainte = info['nom_contrainte']
+                nom_deformation = info['nom_deformation']
+                if nom_contrainte not in colonnes:
+                    raise ValueError(f"Aucune colonne de contrainte S.Sxx (colonnes: {colonnes})")
+                colonnes_rapport = colonnes
+                composantes = info['composantes']
+                indices = [2 + colonnes.index(c) for c in composantes]
+                i_volume = 2 + colonnes.index('IVOL')
+                accumulateur = AccumulateurVolumique(len(composantes))
+            elif colonnes != colonnes_rapport:
+                # Même règle que lire_blocs_rpt: les indices du premier bloc
+                # ne valent que pour des blocs de mêmes colonnes
+                raise ValueError(f"Colonnes incohérentes entre les blocs: {colonnes_rapport} / {colonnes}")
+            
+            accumulateur.ajouter(tableau[:, indices], tableau[:, i_volume])
+    except Exception as e:
+        return ResultatsAnalyse(
+            fichier=nom_fichier,
+            nom_contrainte="",
+            nom_deformation=None,
+            nb_elements=0,
+            volume_total=0,
+            contrainte_moyenne_vol=0,
+            contrainte_min=0,
+            contrainte_max=0,
+            deformation_moyenne_vol=None,
+            deformation_min=None,
+            deformation_max=None,
+            module_elasticite=None,
+            erreur=str(e)
+        )
+    
+    if accumulateur is None or accumulateur.nb_valeurs == 0:
+        return ResultatsAnalyse(
+            fichier=nom_fichier,
+            nom_contrainte=nom_contrainte or 'S.S11',
+            nom_deformation=nom_deformation,
+            nb_elements=0,
+            volume_total=0,
+            contrainte_moyenne_vol=0,
+            contrainte_min=0,
+            contrainte_max=0,
+            deformation_moyenne_vol=None,
+            deformation_min=None,
+            deformation_max=None,
+            module_elasticite=None,
+            erreur="Aucune donnée trouvée dans le fichier"
+        )
+    
+    moyennes_tenseur = dict(zip(composantes, accumulateur.moyennes.tolist()))
+    i_contrainte = composantes.index(nom_contrainte)
+    
+    deformation_moyenne_vol = deformation_min = deformation_max = None
+    module_elasticite = None
+    if nom_deformation is not None:
+        i_deformation = composantes.index(nom_deformation)
+        deformation_moyenne_vol = moyennes_tenseur[nom_deformation]
+        deformation_min = float(accumulateur.minimum[i_deformation])
+        deformation_max = float(accumulateur.maximum[i_deformation])
+        if deformation_moyenne_vol != 0:
+            module_elasticite = moyennes_tenseur[nom_contrainte] / deformation_moyenne_vol
+    
+    return ResultatsAnalyse(
+        fichier=nom_fichier,
+        nom_contrainte=nom_contrainte,
+        nom_deformation=nom_deformation,
+        nb_elements=accumulateur.nb_valeurs,
+        volume_total=accumulateur.volume_total,
+        contrainte_moyenne_vol=moyennes_tenseur[nom_contrainte],
+        contrainte_min=float(accumulateur.minimum[i_contrainte]),
+        contrainte_max=float(accumulateur.maximum[i_contrainte]),
+        deformation_moyenne_vol=deformation_moyenne_vol,
+        deformation_min=deformation_min,
+        deformation_max=deformation_max,
+        module_elasticite=module_elasticite,
+        moyennes_tenseur=moyennes_tenseur
+    )
+
+
+def analyser_fichier(filepath: str, flux: bool = False) -> ResultatsAnalyse:
+    """
+    Analyse complète d'un fichier de résultats (.rpt ou format colonnes).
+    
+    Avec flux=True, un .rpt est lu par morceaux (voir analyser_fichier_flux);
+    les formats colonnes sont toujours lus directement.
+    """
+    if flux and os.path.splitext(filepath)[1].lower() == '.rpt':
+        return analyser_fichier_flux(filepath)
+    
+    nom_fichier = os.path.basename(filepath)
+    
+    try:
+        donnees, info = lire_fichier_donnees(filepath)
     except Exception as e:
         return ResultatsAnalyse(
             fichier=nom_fichier,
@@ -184,15 +976,19 @@ def analyser_fichier(filepath: str) -> ResultatsAnalyse:
             erreur="Aucune donnée trouvée dans le fichier"
         )
     
-    # Extraire les listes
-    volumes = [d.volume for d in donnees]
-    contraintes = [d.contrainte for d in donnees]
+    # Colonnes
+    volumes = donnees.volume
+    contraintes = donnees.contrainte
+    
+    # Moyennes volumiques de toutes les composantes en une seule passe
+    moyennes_tenseur = dict(zip(donnees.composantes,
+                                calculer_moyenne_volumique(donnees.tenseur, volumes).tolist()))
     
     # Calculs pour la contrainte
-    volume_total = sum(volumes)
-    contrainte_moyenne_vol = calculer_moyenne_volumique(contraintes, volumes)
-    contrainte_min = min(contraintes)
-    contrainte_max = max(contraintes)
+    volume_total = float(volumes.sum())
+    contrainte_moyenne_vol = moyennes_tenseur[info['nom_contrainte']]
+    contrainte_min = float(contraintes.min())
+    contrainte_max = float(contraintes.max())
     
     # Calculs pour la déformation (si disponible)
     deformation_moyenne_vol = None
@@ -200,11 +996,11 @@ def analyser_fichier(filepath: str) -> ResultatsAnalyse:
     deformation_max = None
     module_elasticite = None
     
-    if info['has_deformation']:
-        deformations = [d.deformation for d in donnees if d.deformation is not None]
-        deformation_moyenne_vol = calculer_moyenne_volumique(deformations, volumes)
-        deformation_min = min(deformations)
-        deformation_max = max(deformations)
+    if donnees.deformation is not None:
+        deformations = donnees.deformation
+        deformation_moyenne_vol = moyennes_tenseur[info['nom_deformation']]
+        deformation_min = float(deformations.min())
+        deformation_max = float(deformations.max())
         
         if deformation_moyenne_vol != 0:
             module_elasticite = contrainte_moyenne_vol / deformation_moyenne_vol
@@ -222,10 +1018,168 @@ def analyser_fichier(filepath: str) -> ResultatsAnalyse:
         deformation_min=deformation_min,
         deformation_max=deformation_max,
         module_elasticite=module_elasticite,
+        moyennes_tenseur=moyennes_tenseur,
         donnees=donnees
     )
 
 
+def empreinte_fichier(filepath: str) -> str:
+    """Empreinte SHA-1 du contenu d'un fichier, lu par morceaux."""
+    sha1 = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        for morceau in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(morceau)
+    return sha1.hexdigest()
+
+
+class CacheResultats:
+    """
+    Cache persistant des résultats d'analyse (SQLite).
+    
+    Une entrée est identifiée par le chemin du fichier et le mode d'analyse
+    (complet ou flux). Elle reste valide tant que la taille et la date de
+    modification du fichier sont inchangées, ou à défaut tant que l'empreinte
+    SHA-1 du contenu est identique. Les champs scalaires de ResultatsAnalyse
+    sont stockés en JSON; en mode complet et avec stocker_donnees=True, les
+    données brutes sont stockées à part dans un .npz nommé par l'empreinte
+    du fichier (copie complète des tableaux: désactivé par défaut). Sans ce
+    .npz, un résultat n'est servi que si les données par point ne sont pas
+    demandées (avec_donnees) et que le fichier n'a pas de colonne 'phase'.
+    """
+    
+    def __init__(self, repertoire: str, stocker_donnees: bool = False):
+        self.dossier = Path(repertoire) / DOSSIER_CACHE
+        self.dossier.mkdir(exist_ok=True)
+        self.stocker_donnees = stocker_donnees
+        self.connexion = sqlite3.connect(self.dossier / 'resultats.sqlite')
+        self.connexion.execute(
+            'CREATE TABLE IF NOT EXISTS resultats ('
+            'chemin TEXT, mode TEXT, taille INTEGER, mtime_ns INTEGER, '
+            'empreinte TEXT, version INTEGER, resultats TEXT, '
+            'PRIMARY KEY (chemin, mode))'
+        )
+    
+    @staticmethod
+    def _mode(flux: bool) -> str:
+        return 'flux' if flux else 'complet'
+    
+    def _fichier_donnees(self, empreinte: str) -> Path:
+        return self.dossier / f'{empreinte}.npz'
+    
+    def lire(self, filepath: str, flux: bool = False,
+             avec_donnees: bool = False) -> Optional[ResultatsAnalyse]:
+        """Renvoie le résultat en cache s'il est encore valide, sinon None."""
+        chemin = os.path.abspath(filepath)
+        ligne = self.connexion.execute(
+            'SELECT taille, mtime_ns, empreinte, version, resultats FROM resultats '
+            'WHERE chemin = ? AND mode = ?', (chemin, self._mode(flux))
+        ).fetchone()
+        if ligne is None or ligne[3] != VERSION_CACHE:
+            return None
+        
+        taille, mtime_ns, empreinte, _, champs = ligne
+        stat = os.stat(chemin)
+        if (stat.st_size, stat.st_mtime_ns) != (taille, mtime_ns):
+            # Fichier touché: il reste valide si son contenu n'a pas changé
+            if stat.st_size != taille or empreinte_fichier(chemin) != empreinte:
+                return None
+            with self.connexion:
+                self.connexion.execute(
+                    'UPDATE resultats SET mtime_ns = ? WHERE chemin = ? AND mode = ?',
+                    (stat.st_mtime_ns, chemin, self._mode(flux)))
+        
+        champs = json.loads(champs)
+        phase_par_point = champs.pop('phase_par_point', False)
+        res = ResultatsAnalyse(**champs)
+        if not flux:
+            fichier_donnees = self._fichier_donnees(empreinte)
+            if not fichier_donnees.exists():
+                # Données par point non stockées: à relire si elles servent
+                return None if avec_donnees or phase_par_point else res
+            with np.load(fichier_donnees) as npz:
+                res.donnees = DonneesRPT(
+                    element=npz['element'],
+                    point=npz['point'],
+                    volume=npz['volume'],
+                    contrainte=npz['contrainte'],
+                    deformation=npz['deformation'] if 'deformation' in npz else None,
+                    composantes=npz['composantes'].tolist(),
+                    tenseur=npz['tenseur'],
+                    instance=npz['instance'] if 'instance' in npz else None,
+                    instances=npz['instances'].tolist(),
+                    phase=npz['phase'] if 'phase' in npz else None,
+                    phases=npz['phases'].tolist()
+                )
+        return res
+    
+    def ecrire(self, filepath: str, res: ResultatsAnalyse, flux: bool = False):
+        """Enregistre un résultat (les analyses en erreur ne sont pas mises en cache)."""
+        if res.erreur is not None:
+            return
+        
+        chemin = os.path.abspath(filepath)
+        stat = os.stat(chemin)
+        empreinte = empreinte_fichier(chemin)
+        champs = {f.name: getattr(res, f.name) for f in dataclasses.fields(res)
+                  if f.name != 'donnees'}
+        champs['phase_par_point'] = res.donnees is not None and res.donnees.phase is not None
+        
+        if not flux and self.stocker_donnees and res.donnees is not None:
+            d = res.donnees
+            tableaux = dict(element=d.element, point=d.point, volume=d.volume,
+                            contrainte=d.contrainte, tenseur=d.tenseur,
+                            composantes=np.array(d.composantes, dtype=str),
+                            instances=np.array(d.instances, dtype=str),
+                            phases=np.array(d.phases, dtype=str))
+            for nom in ('deformation', 'instance', 'phase'):
+                if getattr(d, nom) is not None:
+                    tableaux[nom] = getattr(d, nom)
+            np.savez(self._fichier_donnees(empreinte), **tableaux)
+        
+        ancienne = self.connexion.execute(
+            'SELECT empreinte FROM resultats WHERE chemin = ? AND mode = ?',
+            (chemin, self._mode(flux))).fetchone()
+        with self.connexion:
+            self.connexion.execute(
+                'INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (chemin, self._mode(flux), stat.st_size, stat.st_mtime_ns,
+                 empreinte, VERSION_CACHE, json.dumps(champs)))
+        
+        # Supprimer les données brutes d'une ancienne version du fichier
+        if ancienne and ancienne[0] != empreinte:
+            encore_utilisee = self.connexion.execute(
+                'SELECT 1 FROM resultats WHERE empreinte = ?', (ancienne[0],)).fetchone()
+            if not encore_utilisee:
+                self._fichier_donnees(ancienne[0]).unlink(missing_ok=True)
+    
+    def fermer(self):
+        self.connexion.close()
+
+
+def ouvrir_cache(repertoire: str, stocker_donnees: bool = False) -> Optional[CacheResultats]:
+    """Ouvre le cache des résultats, ou None (avec un avertissement) s'il ne peut pas l'être."""
+    try:
+        return CacheResultats(repertoire, stocker_donnees)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Attention: cache des résultats désactivé pour {repertoire} ({e})")
+        return None
+
+
+def analyser_fichier_cache(filepath: str, flux: bool = False,
+                           cache: Optional[CacheResultats] = None,
+                           avec_donnees: bool = False) -> ResultatsAnalyse:
+    """Analyse un fichier en passant par le cache des résultats s'il est fourni."""
+    if cache is not None:
+        res = cache.lire(filepath, flux, avec_donnees)
+        if res is not None:
+            return res
+    
+    res = analyser_fichier(filepath, flux=flux)
+    if cache is not None:
+        cache.ecrire(filepath, res, flux)
+    return res
+
+
 def tracer_resultats(res: ResultatsAnalyse, save_path: Optional[str] = None, output_dir: str = "figures"):
     """
     Trace les graphiques de répartition de la contrainte et de la déformation
@@ -233,17 +1187,15 @@ def tracer_resultats(res: ResultatsAnalyse, save_path: Optional[str] = None, out
     """
     # Créer le dossier de sortie si nécessaire
     os.makedirs(output_dir, exist_ok=True)
-    if res.erreur or len(res.donnees) == 0:
+    if res.erreur or res.donnees is None or len(res.donnees) == 0:
         print(f"Impossible de tracer: {res.erreur or 'Pas de données'}")
         return
     
     # Extraire les données
-    volumes = np.array([d.volume for d in res.donnees])
-    contraintes = np.array([d.contrainte for d in res.donnees])
+    volumes = res.donnees.volume
+    contraintes = res.donnees.contrainte
     
     has_deformation = res.deformation_moyenne_vol is not None
-    if has_deformation:
-        deformations = np.array([d.deformation for d in res.donnees])
     
     # Configuration de la figure
     if has_deformation:
@@ -257,9 +1209,14 @@ def tracer_resultats(res: ResultatsAnalyse, save_path: Optional[str] = None, out
     # ==================== Graphique 1: Contrainte ====================
     ax1 = axes[0]
     
-    # Scatter plot
-    scatter1 = ax1.scatter(volumes, contraintes, c=contraintes, cmap='RdYlBu_r', 
-                           alpha=0.6, s=15, edgecolors='none')
+    # Scatter plot (densité hexbin au-delà de SEUIL_DENSITE points)
+    densite = len(volumes) > SEUIL_DENSITE
+    if densite:
+        scatter1 = ax1.hexbin(volumes, contraintes, gridsize=200, bins='log',
+                              cmap='RdYlBu_r', mincnt=1)
+    else:
+        scatter1 = ax1.scatter(volumes, contraintes, c=contraintes, cmap='RdYlBu_r', 
+                               alpha=0.6, s=15, edgecolors='none')
     
     # Ligne de la moyenne volumique
     ax1.axhline(y=res.contrainte_moyenne_vol, color='red', linestyle='--', linewidth=2,
@@ -278,16 +1235,20 @@ def tracer_resultats(res: ResultatsAnalyse, save_path: Optional[str] = None, out
     
     # Colorbar
     cbar1 = plt.colorbar(scatter1, ax=ax1)
-    cbar1.set_label(res.nom_contrainte, fontsize=10)
+    cbar1.set_label('Nombre de points' if densite else res.nom_contrainte, fontsize=10)
     
     # ==================== Graphique 2: Déformation ====================
     if has_deformation:
         ax2 = axes[1]
-        deformations = np.array([d.deformation for d in res.donnees if d.deformation is not None])
+        deformations = res.donnees.deformation
         
         # Scatter plot
-        scatter2 = ax2.scatter(volumes, deformations, c=deformations, cmap='viridis',
-                               alpha=0.6, s=15, edgecolors='none')
+        if densite:
+            scatter2 = ax2.hexbin(volumes, deformations, gridsize=200, bins='log',
+                                  cmap='viridis', mincnt=1)
+        else:
+            scatter2 = ax2.scatter(volumes, deformations, c=deformations, cmap='viridis',
+                                   alpha=0.6, s=15, edgecolors='none')
         
         # Ligne de la moyenne volumique
         deform_moy = res.deformation_moyenne_vol if res.deformation_moyenne_vol is not None else 0.0
@@ -311,7 +1272,7 @@ def tracer_resultats(res: ResultatsAnalyse, save_path: Optional[str] = None, out
         
         # Colorbar
         cbar2 = plt.colorbar(scatter2, ax=ax2)
-        cbar2.set_label(nom_deform, fontsize=10)
+        cbar2.set_label('Nombre de points' if densite else nom_deform, fontsize=10)
     
     # ==================== Encadré avec les résultats ====================
     # Créer un texte récapitulatif
@@ -351,16 +1312,30 @@ def tracer_resultats(res: ResultatsAnalyse, save_path: Optional[str] = None, out
         print(f"Figure sauvegardée: {save_path}")
     else:
         # Sauvegarder par défaut dans le dossier figures
-        default_path = os.path.join(output_dir, res.fichier.replace('.rpt', '_analyse.png'))
+        default_path = os.path.join(output_dir, os.path.splitext(res.fichier)[0] + '_analyse.png')
         plt.savefig(default_path, dpi=150, bbox_inches='tight')
         print(f"Figure sauvegardée: {default_path}")
     
     plt.close(fig)
 
 
+def indices_decimation(n: int, nb_max: int = SEUIL_DECIMATION) -> np.ndarray:
+    """
+    Indices d'un sous-échantillon d'au plus nb_max points parmi n.
+    
+    Tirage aléatoire à graine fixe (figures reproductibles), trié pour
+    conserver l'ordre des éléments; tous les points si n <= nb_max.
+    """
+    if n <= nb_max:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(0).choice(n, nb_max, replace=False))
+
+
 def tracer_comparaison_fichiers(resultats: list[ResultatsAnalyse], save_path: Optional[str] = None, output_dir: str = "figures"):
     """
     Trace une comparaison des résultats de plusieurs fichiers.
+    
+    Les nuages de points sont décimés à SEUIL_DECIMATION points par fichier.
     """
     # Créer le dossier de sortie si nécessaire
     os.makedirs(output_dir, exist_ok=True)
@@ -380,10 +1355,12 @@ def tracer_comparaison_fichiers(resultats: list[ResultatsAnalyse], save_path: Op
     # ==================== Graphique 1: Contraintes vs IVOL ====================
     ax1 = axes[0, 0]
     for i, res in enumerate(resultats_valides):
-        volumes = [d.volume for d in res.donnees]
-        contraintes = [d.contrainte for d in res.donnees]
-        ax1.scatter(volumes, contraintes, c=[colors[i]], alpha=0.3, s=5, label=res.fichier)
-        ax1.axhline(y=res.contrainte_moyenne_vol, color=colors[i], linestyle='--', linewidth=2)
+        if res.donnees is not None:
+            sel = indices_decimation(len(res.donnees))
+            ax1.scatter(res.donnees.volume[sel], res.donnees.contrainte[sel], c=[colors[i]],
+                        alpha=0.3, s=5, label=res.fichier)
+        ax1.axhline(y=res.contrainte_moyenne_vol, color=colors[i], linestyle='--', linewidth=2,
+                    label=res.fichier if res.donnees is None else None)
     
     ax1.set_xlabel('IVOL')
     ax1.set_ylabel('Contrainte')
@@ -394,10 +1371,12 @@ def tracer_comparaison_fichiers(resultats: list[ResultatsAnalyse], save_path: Op
     # ==================== Graphique 2: Déformations vs IVOL ====================
     ax2 = axes[0, 1]
     for i, res in enumerate(resultats_valides):
-        volumes = [d.volume for d in res.donnees]
-        deformations = [d.deformation for d in res.donnees]
-        ax2.scatter(volumes, deformations, c=[colors[i]], alpha=0.3, s=5, label=res.fichier)
-        ax2.axhline(y=res.deformation_moyenne_vol, color=colors[i], linestyle='--', linewidth=2)
+        if res.donnees is not None:
+            sel = indices_decimation(len(res.donnees))
+            ax2.scatter(res.donnees.volume[sel], res.donnees.deformation[sel], c=[colors[i]],
+                        alpha=0.3, s=5, label=res.fichier)
+        ax2.axhline(y=res.deformation_moyenne_vol, color=colors[i], linestyle='--', linewidth=2,
+                    label=res.fichier if res.donnees is None else None)
     
     ax2.set_xlabel('IVOL')
     ax2.set_ylabel('Déformation')
@@ -464,6 +1443,35 @@ def tracer_comparaison_fichiers(resultats: list[ResultatsAnalyse], save_path: Op
     plt.close(fig)
 
 
+def _initialiser_agg():
+    """Initialise un processus de tracé avec le backend non interactif Agg."""
+    matplotlib.use('Agg')
+
+
+def tracer_figures(resultats: list[ResultatsAnalyse], comparaison: bool = True,
+                   jobs: int = 1, output_dir: str = "figures"):
+    """
+    Trace les figures de répartition de chaque fichier, puis la comparaison
+    globale (si comparaison=True et plusieurs fichiers).
+    
+    Avec jobs > 1 (ou 0 pour tous les cœurs), chaque figure est rendue dans
+    un processus séparé avec le backend Agg.
+    """
+    taches = [partial(tracer_resultats, res, output_dir=output_dir)
+              for res in resultats if res.erreur is None]
+    if comparaison and len(resultats) > 1:
+        taches.append(partial(tracer_comparaison_fichiers, resultats, output_dir=output_dir))
+    
+    jobs = min(jobs or os.cpu_count() or 1, max(len(taches), 1))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser_agg) as pool:
+            for future in [pool.submit(tache) for tache in taches]:
+                future.result()
+    else:
+        for tache in taches:
+            tache()
+
+
 def afficher_resultats(res: ResultatsAnalyse):
     """Affiche les résultats de manière formatée."""
     print("\n" + "=" * 70)
@@ -500,17 +1508,77 @@ def afficher_resultats(res: ResultatsAnalyse):
         print("-" * 70)
         print(f"  E = <σ> / <ε> = {res.contrainte_moyenne_vol:.6f} / {res.deformation_moyenne_vol:.6f}")
         print(f"  >>> MODULE D'ÉLASTICITÉ E = {res.module_elasticite:.4f} <<<")
+    
+    # Autres composantes (rapport multi-colonnes)
+    autres = [c for c in res.moyennes_tenseur if c not in (res.nom_contrainte, res.nom_deformation)]
+    if autres:
+        print("\n" + "-" * 70)
+        print("MOYENNES VOLUMIQUES DES AUTRES COMPOSANTES")
+        print("-" * 70)
+        for nom in autres:
+            print(f"  <{nom}> = {res.moyennes_tenseur[nom]:.6f}")
+
 
+def assembler_rigidite_effective(resultats: list[ResultatsAnalyse]) -> Optional[np.ndarray]:
+    """
+    Assemble la matrice de rigidité effective 6x6 (notation de Voigt) à partir
+    des moyennes volumiques de plusieurs cas de charge: <σ>_k = C <ε>_k.
+    
+    Chaque cas de charge doit fournir les 6 composantes S.Sij et E.Eij.
+    Avec plus de 6 cas indépendants, C est obtenue par moindres carrés.
+    
+    Returns:
+        C (6, 6) ou None si moins de 6 cas de charge indépendants
+    """
+    noms_s = [f'S.S{c}' for c in COMPOSANTES_VOIGT]
+    noms_e = [f'E.E{c}' for c in COMPOSANTES_VOIGT]
+    
+    cas = [r for r in resultats if r.erreur is None and
+           all(n in r.moyennes_tenseur for n in noms_s + noms_e)]
+    if len(cas) < 6:
+        return None
+    
+    sigma = np.array([[r.moyennes_tenseur[n] for n in noms_s] for r in cas])
+    epsilon = np.array([[r.moyennes_tenseur[n] for n in noms_e] for r in cas])
+    if np.linalg.matrix_rank(epsilon) < 6:
+        return None
+    
+    # Σ = Ε Cᵀ  (une ligne par cas de charge)
+    C_transposee, *_ = np.linalg.lstsq(epsilon, sigma, rcond=None)
+    return C_transposee.T
+
+
+def afficher_rigidite_effective(C: np.ndarray):
+    """Affiche la matrice de rigidité effective 6x6."""
+    print("\n" + "=" * 70)
+    print("MATRICE DE RIGIDITÉ EFFECTIVE C (Voigt: 11, 22, 33, 12, 13, 23)")
+    print("=" * 70)
+    print(" " * 6 + "".join(f"{c:>12}" for c in COMPOSANTES_VOIGT))
+    for c, ligne in zip(COMPOSANTES_VOIGT, C):
+        print(f"{c:>6}" + "".join(f"{v:>12.4f}" for v in ligne))
 
-def traiter_repertoire(repertoire: str, plot: bool = False) -> list[ResultatsAnalyse]:
+
+def traiter_repertoire(repertoire: str, plot: bool = False, flux: bool = False,
+                       jobs: int = 1, cache: bool = True, cache_donnees: bool = False,
+                       avec_donnees: bool = False) -> list[ResultatsAnalyse]:
     """
-    Traite tous les fichiers .rpt d'un répertoire.
+    Traite tous les fichiers de résultats (.rpt ou formats colonnes) d'un répertoire.
+    
+    Avec jobs > 1 (ou 0 pour tous les cœurs), les fichiers sont analysés dans
+    un pool de processus. Les résultats sont rendus dans l'ordre des fichiers
+    et les tracés éventuels ne sont faits qu'une fois toutes les analyses finies.
+    
+    Avec cache=True, les fichiers inchangés depuis la dernière exécution sont
+    servis par le cache (voir CacheResultats) et seuls les autres sont analysés.
+    cache_donnees stocke aussi les données brutes; avec_donnees (ou plot)
+    impose des résultats avec leurs données par point.
     """
     path = Path(repertoire)
-    fichiers_rpt = list(path.glob("*.rpt"))
+    fichiers_rpt = [f for f in path.iterdir()
+                    if f.is_file() and f.suffix.lower() in EXTENSIONS_ANALYSABLES]
     
     if not fichiers_rpt:
-        print(f"Aucun fichier .rpt trouvé dans {repertoire}")
+        print(f"Aucun fichier de résultats ({', '.join(EXTENSIONS_ANALYSABLES)}) trouvé dans {repertoire}")
         return []
     
     print(f"\n{'#' * 70}")
@@ -519,19 +1587,156 @@ def traiter_repertoire(repertoire: str, plot: bool = False) -> list[ResultatsAna
     print(f"# Nombre de fichiers: {len(fichiers_rpt)}")
     print(f"{'#' * 70}")
     
-    tous_resultats = []
-    for fichier in sorted(fichiers_rpt):
-        resultats = analyser_fichier(str(fichier))
-        tous_resultats.append(resultats)
+    chemins = [str(fichier) for fichier in sorted(fichiers_rpt)]
+    
+    # Phase 0: résultats déjà en cache
+    cache_resultats = ouvrir_cache(repertoire, cache_donnees) if cache else None
+    avec_donnees = avec_donnees or plot
+    tous_resultats = [cache_resultats.lire(chemin, flux, avec_donnees)
+                      if cache_resultats is not None else None
+                      for chemin in chemins]
+    a_analyser = [chemin for chemin, res in zip(chemins, tous_resultats) if res is None]
+    if cache_resultats is not None:
+        print(f"# Servis par le cache: {len(chemins) - len(a_analyser)}/{len(chemins)}")
+    
+    # Phase 1: analyses (séquentielles ou en parallèle, ordre conservé par map)
+    analyse = partial(analyser_fichier, flux=flux)
+    nb_processus = min(jobs or os.cpu_count() or 1, max(len(a_analyser), 1))
+    if nb_processus > 1:
+        with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+            nouveaux = list(pool.map(analyse, a_analyser,
+                                     chunksize=max(1, len(a_analyser) // (4 * nb_processus))))
+    else:
+        nouveaux = [analyse(chemin) for chemin in a_analyser]
+    
+    iter_nouveaux = iter(zip(a_analyser, nouveaux))
+    for i, res in enumerate(tous_resultats):
+        if res is None:
+            chemin, tous_resultats[i] = next(iter_nouveaux)
+            if cache_resultats is not None:
+                cache_resultats.ecrire(chemin, tous_resultats[i], flux)
+    if cache_resultats is not None:
+        cache_resultats.fermer()
+    
+    for resultats in tous_resultats:
         afficher_resultats(resultats)
-        
-        # Tracer si demandé
-        if plot and resultats.erreur is None:
-            tracer_resultats(resultats)
+    
+    # Phase 2: tracés si demandés
+    if plot:
+        tracer_figures(tous_resultats, comparaison=False, jobs=jobs)
     
     return tous_resultats
 
 
+def surveiller_repertoire(repertoire: str, plot: bool = False, flux: bool = False,
+                          cache: bool = True, cache_donnees: bool = False,
+                          intervalle: float = INTERVALLE_SURVEILLANCE,
+                          nb_iterations: Optional[int] = None) -> list[ResultatsAnalyse]:
+    """
+    Surveille un répertoire et traite les fichiers .rpt au fur et à mesure
+    de leur écriture par Abaqus.
+    
+    Le répertoire est scruté toutes les `intervalle` secondes. Un fichier
+    nouveau ou modifié n'est analysé qu'une fois sa taille et sa date de
+    modification stables entre deux passages (écriture terminée). Seuls ces
+    fichiers sont analysés; le résumé (et les figures de comparaison avec
+    plot=True) est alors mis à jour à partir des résultats déjà connus.
+    
+    nb_iterations limite le nombre de passages (None: jusqu'à Ctrl+C).
+    """
+    signatures = {}   # chemin -> (taille, mtime_ns) du dernier fichier analysé
+    en_attente = {}   # chemin -> signature vue au passage précédent
+    resultats = {}    # chemin -> ResultatsAnalyse
+    cache_resultats = ouvrir_cache(repertoire, cache_donnees) if cache else None
+    
+    print(f"\n{'#' * 70}")
+    print(f"# SURVEILLANCE DU RÉPERTOIRE: {repertoire} (Ctrl+C pour arrêter)")
+    print(f"{'#' * 70}")
+    
+    iteration = 0
+    try:
+        while nb_iterations is None or iteration < nb_iterations:
+            iteration += 1
+            a_traiter = []
+            presents = set()
+            
+            with os.scandir(repertoire) as entrees:
+                for entree in entrees:
+                    if (os.path.splitext(entree.name)[1].lower() not in EXTENSIONS_ANALYSABLES
+                            or not entree.is_file()):
+                        continue
+                    stat = entree.stat()
+                    signature = (stat.st_size, stat.st_mtime_ns)
+                    presents.add(entree.path)
+                    
+                    if signatures.get(entree.path) == signature:
+                        continue
+                    if en_attente.get(entree.path) != signature:
+                        # Fichier nouveau ou encore en cours d'écriture
+                        en_attente[entree.path] = signature
+                        continue
+                    del en_attente[entree.path]
+                    signatures[entree.path] = signature
+                    a_traiter.append(entree.path)
+            
+            supprimes = set(resultats) - presents
+            for chemin in supprimes:
+                del resultats[chemin]
+                del signatures[chemin]
+            
+            if a_traiter or supprimes:
+                for chemin in sorted(a_traiter):
+                    res = analyser_fichier_cache(chemin, flux=flux, cache=cache_resultats,
+                                                 avec_donnees=plot)
+                    resultats[chemin] = res
+                    afficher_resultats(res)
+                    if plot and res.erreur is None:
+                        tracer_resultats(res)
+                
+                tous_resultats = [resultats[chemin] for chemin in sorted(resultats)]
+                afficher_resume(tous_resultats)
+                if plot and len(tous_resultats) > 1:
+                    tracer_comparaison_fichiers(tous_resultats)
+            
+            if nb_iterations is None or iteration < nb_iterations:
+                time.sleep(intervalle)
+    except KeyboardInterrupt:
+        print("\nArrêt de la surveillance")
+    finally:
+        if cache_resultats is not None:
+            cache_resultats.fermer()
+    
+    return [resultats[chemin] for chemin in sorted(resultats)]
+
+
+def afficher_statistiques_phases(res: ResultatsAnalyse,
+                                 carte: Optional[dict[str, dict[int, str]]] = None):
+    """Calcule et affiche les statistiques par phase d'un résultat (voir statistiques_phases)."""
+    if res.erreur:
+        return
+    
+    print("\n" + "-" * 70)
+    print(f"STATISTIQUES PAR PHASE - {res.fichier}")
+    print("-" * 70)
+    
+    if res.donnees is None:
+        print("  Indisponibles en mode --stream (données par point non conservées)")
+        return
+    
+    try:
+        stats = statistiques_phases(res.donnees, *codes_phases(res.donnees, carte))
+    except ValueError as e:
+        print(f"  {e}")
+        return
+    
+    for phase, s in stats.items():
+        print(f"\n  {phase}: {s['nb_points']} points, V = {s['volume']:.6f}, "
+              f"f = {s['fraction_volumique']:.4f}")
+        for composante, moyenne in s['moyennes'].items():
+            print(f"    <{composante}> = {moyenne:>14.6g}   écart-type = "
+                  f"{math.sqrt(max(s['variances'][composante], 0.0)):.6g}")
+
+
 def afficher_resume(resultats: list[ResultatsAnalyse]):
     """Affiche un résumé de tous les résultats."""
     resultats_valides = [r for r in resultats if r.erreur is None]
@@ -568,36 +1773,88 @@ def main():
         print("  python moyenne_volumique.py ./datas")
         print("  python moyenne_volumique.py ./datas --plot")
         print("  python moyenne_volumique.py ./datas/S11_E11_sym.rpt --plot")
+        print("  python moyenne_volumique.py ./datas --jobs 8")
         sys.exit(1)
     
     chemin = sys.argv[1]
     plot = '--plot' in sys.argv
+    flux = '--stream' in sys.argv
+    cache = '--no-cache' not in sys.argv
+    cache_donnees = '--cache-data' in sys.argv
+    
+    carte_phases = None
+    if '--phases' in sys.argv:
+        try:
+            carte_phases = lire_phases_inp(sys.argv[sys.argv.index('--phases') + 1])
+        except (IndexError, OSError) as e:
+            print(f"Erreur: --phases attend un fichier .inp lisible ({e})")
+            sys.exit(1)
     
-    if os.path.isfile(chemin):
+    jobs = 1
+    if '--jobs' in sys.argv:
+        try:
+            jobs = int(sys.argv[sys.argv.index('--jobs') + 1])
+        except (IndexError, ValueError):
+            print("Erreur: --jobs attend un nombre de processus")
+            sys.exit(1)
+    
+    if '--convert' in sys.argv:
+        # Convertir les .rpt en fichiers colonnes compressés
+        try:
+            sortie = sys.argv[sys.argv.index('--convert') + 1]
+        except IndexError:
+            print("Erreur: --convert attend un répertoire de sortie")
+            sys.exit(1)
+        format = sys.argv[sys.argv.index('--format') + 1] if '--format' in sys.argv else 'npz'
+        sources = [chemin] if os.path.isfile(chemin) else sorted(str(f) for f in Path(chemin).glob("*.rpt"))
+        for source in sources:
+            fichier = convertir_rpt(source, sortie, format)
+            print(f"{source} -> {fichier} ({os.path.getsize(source) / 1e6:.1f} Mo -> "
+                  f"{os.path.getsize(fichier) / 1e6:.1f} Mo)")
+        
+    elif os.path.isfile(chemin):
         # Traiter un seul fichier
-        if not chemin.endswith('.rpt'):
-            print("Erreur: Le fichier doit avoir l'extension .rpt")
+        if os.path.splitext(chemin)[1].lower() not in EXTENSIONS_ANALYSABLES:
+            print(f"Erreur: Le fichier doit avoir l'une des extensions {', '.join(EXTENSIONS_ANALYSABLES)}")
             sys.exit(1)
-        resultats = analyser_fichier(chemin)
+        cache_resultats = ouvrir_cache(os.path.dirname(chemin) or '.', cache_donnees) if cache else None
+        resultats = analyser_fichier_cache(chemin, flux=flux, cache=cache_resultats,
+                                           avec_donnees=plot or carte_phases is not None)
+        if cache_resultats is not None:
+            cache_resultats.fermer()
         afficher_resultats(resultats)
+        if carte_phases is not None or (resultats.donnees is not None
+                                        and resultats.donnees.phase is not None):
+            afficher_statistiques_phases(resultats, carte_phases)
         
         if plot:
             tracer_resultats(resultats)
         
+    elif os.path.isdir(chemin) and '--watch' in sys.argv:
+        # Traiter les fichiers .rpt au fur et à mesure de leur écriture
+        surveiller_repertoire(chemin, plot=plot, flux=flux, cache=cache,
+                              cache_donnees=cache_donnees)
+        
     elif os.path.isdir(chemin):
         # Traiter tous les fichiers .rpt du répertoire
-        tous_resultats = traiter_repertoire(chemin, plot=False)
+        tous_resultats = traiter_repertoire(chemin, plot=False, flux=flux, jobs=jobs,
+                                            cache=cache, cache_donnees=cache_donnees,
+                                            avec_donnees=plot or carte_phases is not None)
         afficher_resume(tous_resultats)
         
-        # Tracer la comparaison si demandé
+        # Statistiques par phase si une carte est donnée ou une colonne 'phase' lue
+        for res in tous_resultats:
+            if carte_phases is not None or (res.donnees is not None and res.donnees.phase is not None):
+                afficher_statistiques_phases(res, carte_phases)
+        
+        # Rigidité effective complète si les cas de charge le permettent
+        C = assembler_rigidite_effective(tous_resultats)
+        if C is not None:
+            afficher_rigidite_effective(C)
+        
+        # Tracer les figures et la comparaison globale si demandé
         if plot:
-            for res in tous_resultats:
-                if res.erreur is None:
-                    tracer_resultats(res)
-            
-            # Tracer la comparaison globale
-            if len(tous_resultats) > 1:
-                tracer_comparaison_fichiers(tous_resultats)
+            tracer_figures(tous_resultats, comparaison=True, jobs=jobs)
     else:
         print(f"Erreur: '{chemin}' n'est ni un fichier ni un répertoire valide")
         sys.exit(1)
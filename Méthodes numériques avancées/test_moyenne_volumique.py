@@ -0,0 +1,146 @@
+"""
+Tests de la lecture des rapports .rpt: la lecture en flux doit donner les
+mêmes résultats que la lecture complète quelle que soit la taille des morceaux.
+
+Usage:
+    python -m pytest test_moyenne_volumique.py
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import moyenne_volumique as mv
+
+DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datas')
+
+ENTETE = (
+    "Field Output reported at integration points for part: PART-1-1\n"
+    "\n"
+    "   Element Label             Int           E.E11            IVOL           S.S11\n"
+    "                              Pt          @Loc 1          @Loc 1          @Loc 1\n"
+    "---------------------------------------------------------------------------------\n"
+)
+
+
+def rapport_synthetique(chemin, nb_lignes, fin_de_ligne='\n', graine=0):
+    """Écrit un rapport à deux blocs terminé par une ligne vide."""
+    valeurs = np.random.default_rng(graine).random((nb_lignes, 3))
+    lignes = [f"{k:16d}{1:16d}{e:16.6E}{v:16.6E}{s:16.6E}"
+              for k, (e, v, s) in enumerate(valeurs, 1)]
+    moitie = nb_lignes // 2
+    texte = (ENTETE + '\n'.join(lignes[:moitie]) + '\n\n' +
+             ENTETE + '\n'.join(lignes[moitie:]) + '\n\n')
+    with open(chemin, 'w', newline='') as f:
+        f.write(texte.replace('\n', fin_de_ligne))
+    return chemin
+
+
+def verifier_flux(chemin, tailles):
+    complet = mv.analyser_fichier(chemin)
+    assert complet.erreur is None
+    for taille in tailles:
+        flux = mv.analyser_fichier_flux(chemin, taille)
+        assert flux.erreur is None, (taille, flux.erreur)
+        assert flux.nb_elements == complet.nb_elements, taille
+        assert flux.volume_total == pytest.approx(complet.volume_total, rel=1e-12)
+        for nom, moyenne in complet.moyennes_tenseur.items():
+            assert flux.moyennes_tenseur[nom] == pytest.approx(moyenne, rel=1e-12), (taille, nom)
+
+
+@pytest.mark.parametrize('fin_de_ligne', ['\n', '\r\n'])
+def test_flux_rapport_termine_par_ligne_vide(tmp_path, fin_de_ligne):
+    chemin = rapport_synthetique(str(tmp_path / 'synthetique.rpt'), 200, fin_de_ligne)
+    verifier_flux(chemin, list(range(8, 130)) + [4096, 10**7])
+
+
+def test_flux_tailles_de_morceaux_rapport_abaqus():
+    chemin = os.path.join(DATAS, 'S33_E33_sym.rpt')
+    verifier_flux(chemin, [20, 26, 31, 32, 38, 39, 52, 62, 76, 78] + list(range(100, 4000, 397)))
+
+
+def test_flux_colonnes_incoherentes_entre_blocs(tmp_path):
+    entete_inverse = ENTETE.replace("E.E11            IVOL           S.S11",
+                                    "S.S11            IVOL           E.E11")
+    bloc_1 = "".join(f"{k:16d}{1:16d}{1.0:16.6E}{1.0:16.6E}{200.0:16.6E}\n" for k in range(1, 4))
+    bloc_2 = "".join(f"{k:16d}{1:16d}{200.0:16.6E}{1.0:16.6E}{1.0:16.6E}\n" for k in range(4, 7))
+    chemin = tmp_path / 'melange.rpt'
+    chemin.write_text(ENTETE + bloc_1 + "\n" + entete_inverse + bloc_2 + "\n")
+    complet = mv.analyser_fichier(str(chemin))
+    assert "Colonnes incohérentes" in complet.erreur
+    for taille in [64, 10**7]:
+        flux = mv.analyser_fichier_flux(str(chemin), taille)
+        assert flux.erreur is not None and "Colonnes incohérentes" in flux.erreur, taille
+
+
+def test_convertir_bloc_ignore_lignes_invalides():
+    texte = ("   1   1   1.0E-01   2.0   3.0\n"
+             "   texte non numérique\n"
+             "   2   1   4.0   5.0\n"
+             "   3   1   7.0   8.0   9.0\n"
+             "   \n")
+    tableau = mv.convertir_bloc(texte, 3)
+    np.testing.assert_array_equal(tableau, [[1, 1, 0.1, 2, 3], [3, 1, 7, 8, 9]])
+    assert mv.convertir_bloc('\n', 3).shape == (0, 5)
+
+
+def test_detection_format_depuis_colonnes():
+    info = mv.detecter_format_fichier(['Element', 'Int', 'E.E33', 'IVOL', 'S.S11', 'S.S33'])
+    assert info['has_deformation']
+    assert info['nom_deformation'] == 'E.E33'
+    assert info['nom_contrainte'] == 'S.S11'
+    assert info['composantes'] == mv.composantes_tenseur(['E.E33', 'S.S11', 'S.S33'])
+
+
+def test_cache_inaccessible_desactive(tmp_path, capsys):
+    fichier = tmp_path / 'pas_un_repertoire'
+    fichier.write_text('')
+    assert mv.ouvrir_cache(str(fichier)) is None
+    assert 'cache des résultats désactivé' in capsys.readouterr().out
+
+
+def test_cache_sans_donnees_brutes(tmp_path):
+    chemin = rapport_synthetique(str(tmp_path / 'synthetique.rpt'), 50)
+    cache = mv.ouvrir_cache(str(tmp_path))
+    res = mv.analyser_fichier_cache(chemin, cache=cache)
+    assert res.donnees is not None
+    assert not list((tmp_path / mv.DOSSIER_CACHE).glob('*.npz'))
+    
+    servi = cache.lire(chemin)
+    assert servi.donnees is None
+    assert servi.moyennes_tenseur == res.moyennes_tenseur
+    assert cache.lire(chemin, avec_donnees=True) is None
+    cache.fermer()
+    
+    cache = mv.ouvrir_cache(str(tmp_path), stocker_donnees=True)
+    mv.analyser_fichier_cache(chemin, cache=cache, avec_donnees=True)
+    np.testing.assert_array_equal(cache.lire(chemin, avec_donnees=True).donnees.volume,
+                                  res.donnees.volume)
+    cache.fermer()
+
+
+def test_phases_inp_elset_des_elements(tmp_path):
+    inp = tmp_path / 'rve.inp'
+    inp.write_text(
+        "*Part, name=RVE\n"
+        "*Node\n"
+        "1, 0., 0., 0.\n"
+        "*Element, type=C3D8R, elset=FIBRE\n"
+        "1, 1, 2, 3, 4, 5, 6, 7, 8\n"
+        "2, 1, 2, 3, 4,\n"
+        "   5, 6, 7, 8\n"
+        "*Element, type=C3D8R\n"
+        "3, 1, 2, 3, 4, 5, 6, 7, 8\n"
+        "*Elset, elset=MATRICE\n"
+        "3\n"
+        "*Solid Section, elset=FIBRE, material=Verre\n"
+        ",\n"
+        "*Solid Section, elset=MATRICE, material=Epoxy\n"
+        ",\n"
+        "*End Part\n"
+        "*Assembly, name=Assembly\n"
+        "*Instance, name=RVE-1, part=RVE\n"
+        "*End Instance\n"
+        "*End Assembly\n")
+    assert mv.lire_phases_inp(str(inp)) == {'RVE-1': {1: 'Verre', 2: 'Verre', 3: 'Epoxy'}}
@@ -0,0 +1,201 @@
+"""
+Balayage de parametres de la simulation de flux mobile
+(flux_mobile_face_superieure.py) avec un pool de processus.
+
+Parametres balayables: flux_value, velocity, spot_radius, esize; les autres
+gardent les valeurs du driver. Plan d'experiences:
+    --grille   produit cartesien de listes de valeurs   nom=v1,v2,...
+    --lhs N    hypercube latin de N cas sur des plages  nom=min:max
+
+Chaque cas tourne dans un processus de travail (solveur local, ou session
+MAPDL lancee une fois par processus avec --mapdl et reutilisee pour tous
+ses cas). Le champ de temperature de chaque pas est enregistre
+(champs_temperature.py), puis reduit en indicateurs:
+    T_pic        temperature maximale atteinte (C)
+    duree_seuil  duree maximale passee au-dessus de --seuil par un noeud (s)
+    profondeur   profondeur affectee: noeud le plus profond ayant depasse --seuil (m)
+
+Resultats: SORTIE/balayage.csv (une ligne par cas), champs et journaux
+de chaque cas dans SORTIE/.
+
+Usage:
+    python balayage_flux_mobile.py --grille flux_value=1e5,2e5 velocity=0.003,0.006
+    python balayage_flux_mobile.py --lhs 8 flux_value=1e5:3e5 spot_radius=0.004:0.008 --graine 0
+    options: --jobs N  --mapdl  --seuil 30  --sortie balayage
+"""
+
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import numpy as np
+
+# Parametres du driver pouvant etre balayes
+PARAMETRES_BALAYAGE = ('flux_value', 'velocity', 'spot_radius', 'esize')
+
+# Port de la premiere session MAPDL; le processus de travail k utilise PORT_MAPDL + k
+PORT_MAPDL = 50052
+
+# Session MAPDL du processus de travail (backend mapdl uniquement)
+_MAPDL = None
+
+
+def plan_grille(valeurs):
+    """Produit cartesien {nom: [v1, v2, ...]} -> liste de dicts de parametres."""
+    noms = list(valeurs)
+    return [dict(zip(noms, combinaison))
+            for combinaison in itertools.product(*(valeurs[nom] for nom in noms))]
+
+
+def plan_hypercube_latin(plages, nb_cas, graine=None):
+    """Hypercube latin de nb_cas cas sur {nom: (min, max)} -> liste de dicts."""
+    from scipy.stats import qmc
+
+    noms = list(plages)
+    echantillon = qmc.LatinHypercube(d=len(noms), seed=graine).random(nb_cas)
+    bornes = np.array([plages[nom] for nom in noms], dtype=float)
+    valeurs = qmc.scale(echantillon, bornes[:, 0], bornes[:, 1])
+    return [dict(zip(noms, map(float, ligne))) for ligne in valeurs]
+
+
+def _initialiser_processus(backend, ports):
+    """Lance la session MAPDL du processus de travail (une par processus)."""
+    global _MAPDL
+    import matplotlib
+    matplotlib.use('Agg')
+    if backend == 'mapdl':
+        from ansys.mapdl.core import launch_mapdl
+        _MAPDL = launch_mapdl(port=ports.get(), cleanup_on_exit=True)
+
+
+def executer_cas(numero, parametres, backend, seuil, repertoire):
+    """
+    Execute un cas du balayage dans le processus courant.
+
+    Retourne: dict parametres + indicateurs + temps de calcul (s)
+    """
+    import flux_mobile_face_superieure as driver
+    from champs_temperature import lire_champs
+
+    for nom, valeur in parametres.items():
+        setattr(driver, nom, valeur)
+    driver.SOURCE_FORME = None
+    driver.CHAMPS_FICHIER = os.path.join(repertoire, f"cas_{numero:03d}.npz")
+    driver.INTERVALLE_CHAMPS = 1
+
+    debut = time.perf_counter()
+    with open(os.path.join(repertoire, f"cas_{numero:03d}.log"), 'w') as journal, \
+            redirect_stdout(journal):
+        if backend == 'local':
+            driver.simuler_local()
+        else:
+            driver.simuler_mapdl(mapdl=_MAPDL, visualiser=False)
+    duree = time.perf_counter() - debut
+
+    champs = lire_champs(driver.CHAMPS_FICHIER)
+    return {'cas': numero, **parametres,
+            'T_pic': float(champs.T_max.max()),
+            'duree_seuil': float(champs.duree_au_dessus(seuil).max()),
+            'profondeur': champs.profondeur_affectee(seuil),
+            'temps_calcul': duree}
+
+
+def executer_balayage(plan, backend='local', jobs=None, seuil=30.0, repertoire='balayage'):
+    """
+    Execute tous les cas du plan avec un pool de jobs processus.
+
+    Retourne: liste de dicts (une ligne par cas, dans l'ordre du plan)
+    """
+    import multiprocessing
+
+    os.makedirs(repertoire, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(plan))
+
+    ports = None
+    if backend == 'mapdl':
+        ports = multiprocessing.Manager().Queue()
+        for k in range(jobs):
+            ports.put(PORT_MAPDL + k)
+
+    print(f"Balayage: {len(plan)} cas, backend {backend}, {jobs} processus")
+    resultats = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser_processus,
+                             initargs=(backend, ports)) as pool:
+        futures = [pool.submit(executer_cas, numero, parametres, backend, seuil, repertoire)
+                   for numero, parametres in enumerate(plan)]
+        for future in futures:
+            ligne = future.result()
+            resultats.append(ligne)
+            print(f"  cas {ligne['cas']:3d}: T_pic {ligne['T_pic']:7.1f} C | "
+                  f"duree > seuil {ligne['duree_seuil']:6.1f} s | "
+                  f"profondeur {ligne['profondeur']*1000:5.1f} mm | {ligne['temps_calcul']:6.1f} s")
+    return resultats
+
+
+def ecrire_tableau(resultats, fichier):
+    with open(fichier, 'w', newline='') as f:
+        ecrivain = csv.DictWriter(f, fieldnames=list(resultats[0]))
+        ecrivain.writeheader()
+        ecrivain.writerows(resultats)
+    print(f"Tableau des resultats: {fichier}")
+
+
+def _lire_parametres(arguments, separateur):
+    """Arguments nom=... -> {nom: valeurs}, separateur ',' (liste) ou ':' (plage)."""
+    valeurs = {}
+    for argument in arguments:
+        nom, _, texte = argument.partition('=')
+        if nom not in PARAMETRES_BALAYAGE:
+            raise ValueError(f"Parametre non balayable: {nom} ({', '.join(PARAMETRES_BALAYAGE)})")
+        valeurs[nom] = [float(v) for v in texte.split(separateur)]
+        if separateur == ':' and len(valeurs[nom]) != 2:
+            raise ValueError(f"Plage attendue nom=min:max: {argument}")
+    return valeurs
+
+
+def main(argv):
+    if '--grille' not in argv and '--lhs' not in argv:
+        print(__doc__)
+        return 1
+
+    options = {'--jobs': None, '--seuil': '30', '--sortie': 'balayage', '--graine': None}
+    arguments = []
+    i = 0
+    while i < len(argv):
+        if argv[i] in options:
+            options[argv[i]] = argv[i + 1]
+            i += 2
+        elif argv[i] == '--lhs':
+            nb_cas = int(argv[i + 1])
+            i += 2
+        else:
+            if '=' in argv[i]:
+                arguments.append(argv[i])
+            i += 1
+
+    try:
+        if '--lhs' in argv:
+            plages = _lire_parametres(arguments, ':')
+            graine = None if options['--graine'] is None else int(options['--graine'])
+            plan = plan_hypercube_latin(plages, nb_cas, graine)
+        else:
+            plan = plan_grille(_lire_parametres(arguments, ','))
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        return 1
+
+    backend = 'mapdl' if '--mapdl' in argv else 'local'
+    jobs = None if options['--jobs'] is None else int(options['--jobs'])
+    resultats = executer_balayage(plan, backend, jobs, float(options['--seuil']),
+                                  options['--sortie'])
+    ecrire_tableau(resultats, os.path.join(options['--sortie'], 'balayage.csv'))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
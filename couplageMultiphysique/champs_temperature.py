@@ -0,0 +1,394 @@
+"""
+Series temporelles de champs de temperature nodaux: ecriture pendant le
+calcul transitoire et post-traitement hors ligne.
+
+Le driver (flux_mobile_face_superieure.py --champs FICHIER) ecrit le champ
+complet tous les N pas; faces, cycles thermiques aux sondes et coupes sont
+ensuite extraits du fichier sans re-interroger le solveur.
+
+Post-traitement vectorise sur toute la serie temporelle: un arbre KD des
+noeuds est construit une fois (a la premiere requete), puis
+    sondes                T(t) en des points quelconques (trilineaire si
+                          les noeuds forment une grille produit, sinon
+                          ponderation inverse de la distance des voisins)
+    statistiques_faces    min / max / moyenne de chaque face a chaque instant
+    echantillonner_coupe  champ sur une grille reguliere d'un plan
+    profondeur_isotherme  profondeur de l'isotherme en fonction de x
+
+Formats (detection par extension):
+    .h5 / .hdf5  HDF5 (h5py), ecriture au fil du calcul par blocs de
+                 TAILLE_BLOC_TEMPS champs, datasets decoupes et compresses
+    .npz         NumPy compresse, champs gardes en memoire et ecrits a la
+                 fermeture (le format ne permet pas l'ajout)
+
+Contenu: noeuds (n, 3), ids (n,), temps (n_t,), temperature (n_t, n).
+
+Usage hors ligne:
+    python champs_temperature.py champs.h5
+    python champs_temperature.py champs.h5 --sonde 0.05 0.01 0.01 --coupe Y 0.01
+    python champs_temperature.py champs.h5 --isotherme 30
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from scipy.spatial import cKDTree
+
+# Nombre de champs par bloc d'ecriture / par chunk HDF5 (axe temps)
+TAILLE_BLOC_TEMPS = 16
+
+# Nombre maximal de noeuds par chunk HDF5 (axe noeuds)
+TAILLE_CHUNK_NOEUDS = 65536
+
+# Precision de stockage des temperatures (0.01 C a 1000 C en float32)
+TYPE_CHAMPS = np.float32
+
+# Tolerance de selection des noeuds sur un plan (m)
+TOLERANCE_PLAN = 1e-6
+
+# Nombre de noeuds voisins interpoles par sonde
+VOISINS_SONDE = 8
+
+
+def _format_fichier(fichier):
+    extension = os.path.splitext(fichier)[1].lower()
+    if extension in ('.h5', '.hdf5'):
+        return 'h5'
+    if extension == '.npz':
+        return 'npz'
+    raise ValueError(f"Format de fichier de champs non reconnu: {fichier} (.h5, .hdf5, .npz)")
+
+
+def _importer_h5py():
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError("h5py requis pour les fichiers de champs HDF5 (pip install h5py)")
+    return h5py
+
+
+class EcrivainChamps:
+    """
+    Ecriture incrementale des champs de temperature nodaux.
+
+    noeuds: (n, 3) coordonnees, dans l'ordre des champs passes a ajouter()
+    ids: (n,) numeros des noeuds (par defaut 1..n)
+    """
+
+    def __init__(self, fichier, noeuds, ids=None):
+        self.fichier = fichier
+        self.format = _format_fichier(fichier)
+        self.noeuds = np.asarray(noeuds, dtype=float)
+        self.ids = np.arange(1, len(noeuds) + 1) if ids is None else np.asarray(ids)
+        self.nb_champs = 0
+        self._temps = []
+        self._champs = []
+
+        if self.format == 'h5':
+            h5py = _importer_h5py()
+            n = len(self.noeuds)
+            self._h5 = h5py.File(fichier, 'w')
+            self._h5.create_dataset('noeuds', data=self.noeuds)
+            self._h5.create_dataset('ids', data=self.ids)
+            self._h5.create_dataset('temps', shape=(0,), maxshape=(None,), dtype=float,
+                                    chunks=(TAILLE_BLOC_TEMPS,))
+            self._h5.create_dataset('temperature', shape=(0, n), maxshape=(None, n),
+                                    dtype=TYPE_CHAMPS,
+                                    chunks=(TAILLE_BLOC_TEMPS, min(n, TAILLE_CHUNK_NOEUDS)),
+                                    compression='gzip', shuffle=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fermer()
+
+    def ajouter(self, t, T):
+        """Ajoute le champ T (n,) a l'instant t."""
+        self._temps.append(t)
+        self._champs.append(np.asarray(T, dtype=TYPE_CHAMPS))
+        self.nb_champs += 1
+        if self.format == 'h5' and len(self._champs) >= TAILLE_BLOC_TEMPS:
+            self._vider()
+
+    def _vider(self):
+        """Ecrit les champs en attente dans le fichier HDF5 (un bloc)."""
+        if not self._champs:
+            return
+        temps, temperature = self._h5['temps'], self._h5['temperature']
+        debut, nb = len(temps), len(self._champs)
+        temps.resize((debut + nb,))
+        temperature.resize((debut + nb, temperature.shape[1]))
+        temps[debut:] = self._temps
+        temperature[debut:] = np.stack(self._champs)
+        self._temps, self._champs = [], []
+
+    def fermer(self):
+        if self.format == 'h5':
+            if self._h5 is not None:
+                self._vider()
+                self._h5.close()
+                self._h5 = None
+        elif self._champs is not None:
+            temperature = (np.stack(self._champs) if self._champs
+                           else np.empty((0, len(self.noeuds)), dtype=TYPE_CHAMPS))
+            np.savez_compressed(self.fichier, noeuds=self.noeuds, ids=self.ids,
+                                temps=np.array(self._temps, dtype=float), temperature=temperature)
+            self._temps, self._champs = None, None
+
+
+@dataclass
+class ChampsTemperature:
+    """Serie temporelle de champs de temperature nodaux lue depuis un fichier."""
+    noeuds: np.ndarray          # (n, 3)
+    ids: np.ndarray             # (n,)
+    temps: np.ndarray           # (n_t,)
+    temperature: np.ndarray     # (n_t, n)
+
+    @property
+    def T_max(self):
+        """Temperature maximale de chaque champ (n_t,)."""
+        return self.temperature.max(axis=1)
+
+    @property
+    def T_min(self):
+        return self.temperature.min(axis=1)
+
+    def duree_au_dessus(self, seuil, t0=0.0):
+        """
+        Duree (s) passee au-dessus de seuil par chaque noeud (n,): chaque champ
+        stocke vaut pour l'intervalle qui le separe du precedent (t0 pour le premier).
+        """
+        largeurs = np.diff(self.temps, prepend=t0)
+        return largeurs @ (self.temperature > seuil)
+
+    def profondeur_affectee(self, seuil):
+        """
+        Profondeur (m), sous la face superieure, du noeud le plus profond dont
+        la temperature a depasse seuil (0 si aucun).
+        """
+        affectes = self.temperature.max(axis=0) > seuil
+        if not np.any(affectes):
+            return 0.0
+        return float(self.noeuds[:, 2].max() - self.noeuds[affectes, 2].min())
+
+    def indice_temps(self, t):
+        """Indice du champ stocke le plus proche de l'instant t."""
+        return int(np.argmin(np.abs(self.temps - t)))
+
+    def noeuds_plan(self, axe, valeur):
+        """Masque des noeuds du plan axe = valeur (axe 0, 1, 2 ou 'X', 'Y', 'Z')."""
+        axe = 'XYZ'.index(axe.upper()) if isinstance(axe, str) else axe
+        return np.abs(self.noeuds[:, axe] - valeur) < TOLERANCE_PLAN
+
+    def temperatures_faces(self, indice=-1):
+        """Temperatures des noeuds de chaque face de la boite englobante, au champ indice."""
+        mini, maxi = self.noeuds.min(axis=0), self.noeuds.max(axis=0)
+        T = self.temperature[indice]
+        return {nom: T[self.noeuds_plan(axe, valeur)]
+                for nom, axe, valeur in [('top', 2, maxi[2]), ('bottom', 2, mini[2]),
+                                         ('x0', 0, mini[0]), ('xL', 0, maxi[0]),
+                                         ('y0', 1, mini[1]), ('yW', 1, maxi[1])]}
+
+    @cached_property
+    def arbre(self):
+        """Arbre KD des coordonnees des noeuds (construit a la premiere requete)."""
+        return cKDTree(self.noeuds)
+
+    def noeuds_proches(self, points):
+        """Indices des noeuds les plus proches de points (m, 3)."""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        return self.arbre.query(points)[1]
+
+    @cached_property
+    def grille(self):
+        """
+        Interpolateur trilineaire de toute la serie si les noeuds forment une
+        grille produit (maillages du driver), sinon None.
+        """
+        arrondis = np.round(self.noeuds, 9)
+        axes, indices = zip(*(np.unique(arrondis[:, d], return_inverse=True) for d in range(3)))
+        if np.prod([len(a) for a in axes]) != len(self.noeuds):
+            return None
+        valeurs = np.empty(tuple(len(a) for a in axes) + (len(self.temps),))
+        valeurs[indices] = self.temperature.T
+        return RegularGridInterpolator(axes, valeurs)
+
+    def sondes(self, points, voisins=VOISINS_SONDE):
+        """
+        Historiques de temperature en des points quelconques (m, 3):
+        interpolation trilineaire sur une grille produit, sinon ponderation
+        inverse de la distance sur les noeuds voisins (arbre KD).
+
+        Retourne: (n_t, m)
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        if self.grille is not None:
+            bornes = [(a[0], a[-1]) for a in self.grille.grid]
+            return self.grille(np.clip(points, *np.array(bornes).T)).T
+        voisins = min(voisins, len(self.noeuds))
+        distances, indices = self.arbre.query(points, k=voisins)
+        distances, indices = distances.reshape(len(points), -1), indices.reshape(len(points), -1)
+        poids = 1.0 / np.maximum(distances, 1e-12) ** 2
+        poids /= poids.sum(axis=1, keepdims=True)
+        return np.einsum('tmk,mk->tm', self.temperature[:, indices], poids)
+
+    def statistiques_faces(self):
+        """
+        Min, max et moyenne de chaque face de la boite englobante a chaque instant.
+
+        Retourne: dict nom -> dict 'min', 'max', 'moyenne' -> (n_t,)
+        """
+        mini, maxi = self.noeuds.min(axis=0), self.noeuds.max(axis=0)
+        statistiques = {}
+        for nom, axe, valeur in [('top', 2, maxi[2]), ('bottom', 2, mini[2]),
+                                 ('x0', 0, mini[0]), ('xL', 0, maxi[0]),
+                                 ('y0', 1, mini[1]), ('yW', 1, maxi[1])]:
+            T = self.temperature[:, self.noeuds_plan(axe, valeur)]
+            statistiques[nom] = {'min': T.min(axis=1), 'max': T.max(axis=1),
+                                 'moyenne': T.mean(axis=1)}
+        return statistiques
+
+    def echantillonner_coupe(self, axe, valeur, n1=50, n2=20):
+        """
+        Champ sur une grille reguliere n1 x n2 du plan axe = valeur (axes du
+        plan dans l'ordre X, Y, Z restants), pour tous les instants.
+
+        Retourne: (u (n1,), v (n2,), temperatures (n_t, n1, n2))
+        """
+        axe = 'XYZ'.index(axe.upper()) if isinstance(axe, str) else axe
+        axe_u, axe_v = [d for d in range(3) if d != axe]
+        mini, maxi = self.noeuds.min(axis=0), self.noeuds.max(axis=0)
+        u = np.linspace(mini[axe_u], maxi[axe_u], n1)
+        v = np.linspace(mini[axe_v], maxi[axe_v], n2)
+        points = np.empty((n1, n2, 3))
+        points[..., axe] = valeur
+        points[..., axe_u], points[..., axe_v] = np.meshgrid(u, v, indexing='ij')
+        return u, v, self.sondes(points.reshape(-1, 3)).reshape(-1, n1, n2)
+
+    def profondeur_isotherme(self, niveau, y=None):
+        """
+        Profondeur (m) de l'isotherme niveau sous la face superieure en
+        fonction de x, dans le plan de noeuds le plus proche de y (milieu
+        de la largeur par defaut), a chaque instant. Premiere traversee en
+        descendant chaque colonne de noeuds, interpolee lineairement en z;
+        0 si la face superieure est sous le niveau.
+
+        Retourne: (x (nx,), profondeurs (n_t, nx))
+        """
+        mini, maxi = self.noeuds.min(axis=0), self.noeuds.max(axis=0)
+        y = 0.5 * (mini[1] + maxi[1]) if y is None else y
+        niveaux_y = np.unique(np.round(self.noeuds[:, 1], 9))
+        plan = self.noeuds_plan(1, niveaux_y[np.argmin(np.abs(niveaux_y - y))])
+
+        # Grille (z décroissant, x croissant) des noeuds du plan
+        x_plan, z_plan = np.round(self.noeuds[plan, 0], 9), np.round(self.noeuds[plan, 2], 9)
+        x, ix = np.unique(x_plan, return_inverse=True)
+        z, iz = np.unique(z_plan, return_inverse=True)
+        if len(x) * len(z) != np.count_nonzero(plan):
+            raise ValueError("Les noeuds du plan ne forment pas une grille (x, z)")
+        z = z[::-1]
+        T = np.empty((len(self.temps), len(z), len(x)))
+        T[:, len(z) - 1 - iz, ix] = self.temperature[:, plan]
+
+        dessous = T < niveau
+        premier = np.where(dessous.any(axis=1), dessous.argmax(axis=1), len(z))   # (n_t, nx)
+        profondeur = np.where(premier == len(z), z[0] - z[-1], 0.0)
+        traverse = (premier > 0) & (premier < len(z))
+        t_idx, x_idx = np.nonzero(traverse)
+        j = premier[traverse]
+        T_haut, T_bas = T[t_idx, j - 1, x_idx], T[t_idx, j, x_idx]
+        z_iso = z[j - 1] + (niveau - T_haut) * (z[j] - z[j - 1]) / (T_bas - T_haut)
+        profondeur[traverse] = z[0] - z_iso
+        return x, profondeur
+
+    def cycles_thermiques(self, points):
+        """
+        Cycles thermiques T(t) aux noeuds les plus proches des sondes
+        (voir sondes pour des points quelconques).
+
+        Retourne: (indices des noeuds (m,), temperatures (n_t, m))
+        """
+        indices = self.noeuds_proches(points)
+        return indices, self.temperature[:, indices]
+
+    def coupe(self, axe, valeur, indice=-1):
+        """
+        Champ sur le plan de noeuds axe = valeur le plus proche.
+
+        Retourne: (coordonnees (k, 3), temperatures (k,))
+        """
+        axe = 'XYZ'.index(axe.upper()) if isinstance(axe, str) else axe
+        niveaux = np.unique(self.noeuds[:, axe])
+        plan = niveaux[np.argmin(np.abs(niveaux - valeur))]
+        masque = self.noeuds_plan(axe, plan)
+        return self.noeuds[masque], self.temperature[indice, masque]
+
+
+def lire_champs(fichier):
+    """Lit un fichier de champs (.h5, .hdf5 ou .npz) en memoire."""
+    if not os.path.exists(fichier):
+        raise FileNotFoundError(f"Fichier de champs non trouve: {fichier}")
+
+    if _format_fichier(fichier) == 'h5':
+        h5py = _importer_h5py()
+        with h5py.File(fichier, 'r') as f:
+            return ChampsTemperature(f['noeuds'][()], f['ids'][()], f['temps'][()],
+                                     f['temperature'][()])
+
+    with np.load(fichier) as f:
+        return ChampsTemperature(f['noeuds'], f['ids'], f['temps'], f['temperature'])
+
+
+def main(argv):
+    if not argv or argv[0].startswith('--'):
+        print(__doc__)
+        return 1
+
+    champs = lire_champs(argv[0])
+    print(f"{argv[0]}: {len(champs.temps)} champs, {len(champs.ids)} noeuds, "
+          f"t = {champs.temps[0]:g} a {champs.temps[-1]:g} s")
+    print(f"Temperature maximale: {champs.T_max.max():.1f} C "
+          f"(t = {champs.temps[np.argmax(champs.T_max)]:g} s)")
+
+    print(f"\nTemperatures des faces a t = {champs.temps[-1]:g} s:")
+    for nom, T in champs.temperatures_faces().items():
+        print(f"  {nom:6s} Tmin {T.min():7.1f} | Tmax {T.max():7.1f} | Tmoy {T.mean():7.1f} C")
+
+    i = 1
+    while i < len(argv):
+        if argv[i] == '--sonde':
+            point = [float(v) for v in argv[i + 1:i + 4]]
+            cycle = champs.sondes(point)[:, 0]
+            pic = np.argmax(cycle)
+            print(f"\nSonde {point}:")
+            print(f"  Tpic {cycle[pic]:.1f} C a t = {champs.temps[pic]:g} s, "
+                  f"Tfinale {cycle[-1]:.1f} C")
+            i += 4
+        elif argv[i] == '--isotherme':
+            niveau = float(argv[i + 1])
+            x, profondeurs = champs.profondeur_isotherme(niveau)
+            enveloppe = profondeurs.max(axis=0)
+            print(f"\nIsotherme {niveau:g} C, profondeur maximale sur la serie (plan y median):")
+            print("  x (mm) | profondeur (mm)")
+            for xk, pk in zip(x[::max(1, len(x) // 20)], enveloppe[::max(1, len(x) // 20)]):
+                print(f"  {xk*1000:6.1f} | {pk*1000:8.2f}")
+            i += 2
+        elif argv[i] == '--coupe':
+            axe, valeur = argv[i + 1], float(argv[i + 2])
+            coords, T = champs.coupe(axe, valeur)
+            print(f"\nCoupe {axe} = {valeur:g} ({len(T)} noeuds, t = {champs.temps[-1]:g} s): "
+                  f"Tmin {T.min():.1f} | Tmax {T.max():.1f} C")
+            i += 3
+        else:
+            print(f"Option inconnue: {argv[i]}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,76 +1,93 @@
 """
 Simulation de flux thermique mobile sur la face supérieure uniquement.
 Le flux est appliqué au centre de la face supérieure (Z=H) et se déplace le long de X.
+
+Deux backends de calcul:
+    mapdl  ANSYS MAPDL (SOLID70), necessite une licence
+    local  solveur elements finis NumPy/SciPy (solveur_thermique_local.py),
+           memes maillage, materiau, conditions aux limites et chargement
+
+Deux modes de chargement:
+    par pas      flux uniforme sur les noeuds du spot, reapplique a chaque pas dt
+                 (un pas de charge et une resolution par pas)
+    --source F   source continue F = chapeau | gaussienne | goldak (source_mobile.py)
+                 appliquee une seule fois (table X, Y, TIME pour MAPDL, fonction
+                 pour le solveur local), puis pas de temps automatiques
+                 (pas fixes dt pour chapeau avec le solveur local);
+                 goldak (volumique) avec le backend local uniquement
+
+Usage:
+    python flux_mobile_face_superieure.py                              # MAPDL
+    python flux_mobile_face_superieure.py --local                      # Euler implicite
+    python flux_mobile_face_superieure.py --local --crank-nicolson
+    python flux_mobile_face_superieure.py --local --source gaussienne
+    python flux_mobile_face_superieure.py --local --champs champs.h5 --intervalle-champs 2
+    python flux_mobile_face_superieure.py --local --repere-mobile [--comparer]
+    python flux_mobile_face_superieure.py --local --raffinement
+
+--champs FICHIER (.h5 ou .npz) enregistre le champ de temperature complet
+tous les --intervalle-champs pas (5 par defaut); voir champs_temperature.py
+pour le post-traitement hors ligne (faces, sondes, coupes) et
+thermo_mecanique.py pour l'etage thermo-elastique.
+
+--repere-mobile (backend local) resout directement le regime quasi
+stationnaire dans le repere lie au spot (advection-diffusion stabilisee
+SUPG, une seule resolution creuse), spot fixe en X_REPERE; --comparer lance
+aussi le calcul transitoire et compare au champ ou le spot passe en X_REPERE.
+
+--raffinement (backend local, spot uniforme) maille finement (esize /
+RAFFINEMENT) une fenetre qui suit le spot et grossierement le reste; la
+fenetre est deplacee quand le spot approche de son bord avant, avec
+transfert du champ par interpolation trilineaire.
 """
 
-from ansys.mapdl.core import launch_mapdl
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-# =========================
-# LANCEMENT MAPDL
-# =========================
-mapdl = launch_mapdl()
-mapdl.clear()
-mapdl.prep7()
-mapdl.title('Flux mobile sur face superieure uniquement')
+from source_mobile import planifier_spot, SourceMobile, ecrire_table_flux_apdl
+from champs_temperature import EcrivainChamps, lire_champs
 
 # =========================
-# GÉOMÉTRIE ET MAILLAGE 3D
+# BACKEND DE CALCUL
 # =========================
-L = 0.1      # 10 cm de long (X)
-W = 0.02     # 2 cm de large (Y)
-H = 0.01     # 1 cm d'épaisseur (Z)
-
-print(f"Creation geometrie: {L*1000}x{W*1000}x{H*1000} mm")
-
-mapdl.block(0, L, 0, W, 0, H)
+BACKEND = 'local' if '--local' in sys.argv else 'mapdl'
+THETA = 0.5 if '--crank-nicolson' in sys.argv else 1.0   # backend local uniquement
+SOURCE_FORME = sys.argv[sys.argv.index('--source') + 1] if '--source' in sys.argv else None
 
-# Élément thermique 3D
-mapdl.et(1, 'SOLID70')
+# Enregistrement des champs de température complets (None: pas d'enregistrement)
+CHAMPS_FICHIER = sys.argv[sys.argv.index('--champs') + 1] if '--champs' in sys.argv else None
+INTERVALLE_CHAMPS = (int(sys.argv[sys.argv.index('--intervalle-champs') + 1])
+                     if '--intervalle-champs' in sys.argv else 5)
 
-# Maillage
-mapdl.esize(0.002)
-mapdl.vmesh('ALL')
+# Régime quasi stationnaire dans le repère du spot (backend local uniquement)
+REPERE_MOBILE = '--repere-mobile' in sys.argv
 
-num_elem = mapdl.mesh.n_elem
-num_nodes = mapdl.mesh.n_node
-print(f"Maillage: {num_elem} elements, {num_nodes} noeuds")
+# Maillage raffiné autour du spot (backend local uniquement)
+RAFFINEMENT_SPOT = '--raffinement' in sys.argv
 
 # =========================
-# CRÉER UN COMPONENT POUR LA FACE SUPÉRIEURE UNIQUEMENT
+# GÉOMÉTRIE ET MAILLAGE 3D
 # =========================
-# Sélectionner UNIQUEMENT les nœuds sur Z = H (face supérieure)
-mapdl.nsel('S', 'LOC', 'Z', H - 1e-6, H + 1e-6)
-top_nodes = mapdl.mesh.nnum.copy()
-mapdl.cm('TOP_FACE', 'NODE')
-print(f"Nombre de noeuds sur la face superieure: {len(top_nodes)}")
-
-mapdl.allsel()
+L = 0.1      # 10 cm de long (X)
+W = 0.02     # 2 cm de large (Y)
+H = 0.01     # 1 cm d'épaisseur (Z)
+esize = 0.002
 
 # =========================
 # MATÉRIAU - ACIER
 # =========================
-mapdl.mp('KXX', 1, 50.0)      # Conductivité thermique (W/m·K)
-mapdl.mp('KYY', 1, 50.0)
-mapdl.mp('KZZ', 1, 50.0)
-mapdl.mp('DENS', 1, 7850)     # Densité (kg/m³)
-mapdl.mp('C', 1, 460)         # Capacité calorifique (J/kg·K)
-
-print("\nProprietes materiau (Acier):")
-print(f"  Conductivite: 50 W/m.K")
-print(f"  Densite: 7850 kg/m3")
-print(f"  Capacite thermique: 460 J/kg.K")
+conductivite = 50.0     # Conductivité thermique (W/m·K)
+densite = 7850          # Densité (kg/m³)
+capacite = 460          # Capacité calorifique (J/kg·K)
 
 # =========================
-# CONDITIONS INITIALES
+# CONDITIONS INITIALES ET CONVECTION
 # =========================
-mapdl.ic('ALL', 'TEMP', 20.0)
-
-# Convection sur face inférieure seulement (contact avec support)
-mapdl.nsel('S', 'LOC', 'Z', -1e-6, 1e-6)
-mapdl.sf('ALL', 'CONV', 100.0, 20.0)
-mapdl.allsel()
+T_initiale = 20.0
+h_convection = 100.0    # Face inférieure (contact avec support), W/m²·K
+T_exterieure = 20.0
 
 # =========================
 # PARAMÈTRES DU FLUX MOBILE
@@ -84,259 +101,899 @@ x_start = 0.01          # Position initiale X (m)
 velocity = 0.003        # Vitesse de déplacement 3 mm/s
 spot_radius = 0.006     # Rayon du spot 6 mm
 y_center = W / 2.0      # Centre en Y (milieu de la largeur)
+X_REPERE = L / 2.0      # Position du spot pour le calcul en repère mobile
+
+# Fenêtre raffinée (--raffinement): tailles relatives à esize, étendue en rayons de spot
+RAFFINEMENT = 2.0       # Taille fine = esize / RAFFINEMENT
+GROSSISSEMENT = 2.0     # Taille grossière = esize * GROSSISSEMENT
+FENETRE_ARRIERE = 2.0   # Fenêtre fine derrière le centre du spot
+FENETRE_AVANT = 4.0     # Fenêtre fine devant le centre du spot
+
+
+def afficher_parametres():
+    print(f"\n=== PARAMETRES FLUX MOBILE ===")
+    print(f"Intensite flux: {flux_value/1000:.0f} kW/m2")
+    print(f"Vitesse: {velocity*1000:.1f} mm/s")
+    print(f"Rayon spot: {spot_radius*1000:.0f} mm")
+    print(f"Position Y du centre: {y_center*1000:.1f} mm (centre de la piece)")
+    print(f"Temps total: {total_time} s")
+    print(f"Nombre de pas: {num_steps}")
+
+
+def planning_face_superieure(top_coords):
+    """
+    Planning du spot (source_mobile.py) sur les noeuds de la face superieure:
+    noeuds charges a chaque pas, calcules une fois avant la boucle transitoire.
+    """
+    planning = planifier_spot(top_coords, x_start, velocity, y_center, spot_radius,
+                              dt, num_steps, L - spot_radius)
+    touches = np.isfinite(planning.entree).sum()
+    print(f"Planning du spot: {planning.n_pas} pas, {touches} noeuds de la face superieure "
+          f"traverses par le spot")
+    return planning
+
+
+def source_continue():
+    """Source continue SOURCE_FORME de meme puissance que le spot uniforme."""
+    return SourceMobile(SOURCE_FORME, puissance=flux_value * np.pi * spot_radius**2,
+                        rayon=spot_radius, x_start=x_start, velocity=velocity,
+                        y_center=y_center, z_surface=H)
+
+
+def noeuds_spot_a(planning, t):
+    """Nombre de noeuds de la face superieure dans le spot au pas le plus proche de t."""
+    return int(planning.nb_noeuds_actifs[min(int(round(t / dt)), planning.n_pas - 1)])
+
+
+def ouvrir_champs(noeuds, ids=None):
+    """Ecrivain des champs de temperature si --champs est donne, sinon None."""
+    if CHAMPS_FICHIER is None:
+        return None
+    print(f"Champs de temperature: {CHAMPS_FICHIER} (tous les {INTERVALLE_CHAMPS} pas)")
+    return EcrivainChamps(CHAMPS_FICHIER, noeuds, ids)
+
+
+def enregistrer_champ(step, n_pas):
+    """Champ enregistre tous les INTERVALLE_CHAMPS pas et toujours au dernier pas."""
+    return step % INTERVALLE_CHAMPS == 0 or step == n_pas - 1
+
+
+def simuler_mapdl(mapdl=None, visualiser=True):
+    """
+    Simulation transitoire avec ANSYS MAPDL.
+
+    mapdl: session existante a reutiliser (balayage de parametres); elle est
+           alors laissee ouverte. Par defaut une session est lancee et fermee.
+    visualiser: vues pyvista de la temperature finale
+
+    Retourne: (results, temperatures par face)
+    """
+    # =========================
+    # LANCEMENT MAPDL
+    # =========================
+    session_locale = mapdl is None
+    if session_locale:
+        from ansys.mapdl.core import launch_mapdl
+        mapdl = launch_mapdl()
+    mapdl.clear()
+    mapdl.prep7()
+    mapdl.title('Flux mobile sur face superieure uniquement')
+
+    print(f"Creation geometrie: {L*1000}x{W*1000}x{H*1000} mm")
+
+    mapdl.block(0, L, 0, W, 0, H)
+
+    # Élément thermique 3D
+    mapdl.et(1, 'SOLID70')
+
+    # Maillage
+    mapdl.esize(esize)
+    mapdl.vmesh('ALL')
+
+    num_elem = mapdl.mesh.n_elem
+    num_nodes = mapdl.mesh.n_node
+    print(f"Maillage: {num_elem} elements, {num_nodes} noeuds")
+
+    # =========================
+    # CRÉER UN COMPONENT POUR LA FACE SUPÉRIEURE UNIQUEMENT
+    # =========================
+    # Sélectionner UNIQUEMENT les nœuds sur Z = H (face supérieure)
+    mapdl.nsel('S', 'LOC', 'Z', H - 1e-6, H + 1e-6)
+    top_nodes = mapdl.mesh.nnum.copy()
+    top_coords = mapdl.mesh.nodes.copy()   # coordonnees lues une seule fois
+    mapdl.cm('TOP_FACE', 'NODE')
+    print(f"Nombre de noeuds sur la face superieure: {len(top_nodes)}")
 
-print(f"\n=== PARAMETRES FLUX MOBILE ===")
-print(f"Intensite flux: {flux_value/1000:.0f} kW/m2")
-print(f"Vitesse: {velocity*1000:.1f} mm/s")
-print(f"Rayon spot: {spot_radius*1000:.0f} mm")
-print(f"Position Y du centre: {y_center*1000:.1f} mm (centre de la piece)")
-print(f"Temps total: {total_time} s")
-print(f"Nombre de pas: {num_steps}")
+    mapdl.allsel()
 
-# =========================
-# SOLUTION TRANSITOIRE
-# =========================
-mapdl.slashsolu()
-mapdl.antype('TRANS')
-mapdl.trnopt('FULL')
+    # =========================
+    # MATÉRIAU - ACIER
+    # =========================
+    mapdl.mp('KXX', 1, conductivite)
+    mapdl.mp('KYY', 1, conductivite)
+    mapdl.mp('KZZ', 1, conductivite)
+    mapdl.mp('DENS', 1, densite)
+    mapdl.mp('C', 1, capacite)
+
+    print("\nProprietes materiau (Acier):")
+    print(f"  Conductivite: {conductivite:g} W/m.K")
+    print(f"  Densite: {densite:g} kg/m3")
+    print(f"  Capacite thermique: {capacite:g} J/kg.K")
+
+    # =========================
+    # CONDITIONS INITIALES
+    # =========================
+    mapdl.ic('ALL', 'TEMP', T_initiale)
+
+    # Convection sur face inférieure seulement (contact avec support)
+    mapdl.nsel('S', 'LOC', 'Z', -1e-6, 1e-6)
+    mapdl.sf('ALL', 'CONV', h_convection, T_exterieure)
+    mapdl.allsel()
 
-mapdl.time(0)
-mapdl.autots('ON')
-mapdl.deltim(dt, dt/10, dt*2)
-mapdl.kbc(0)
-mapdl.tref(20)
-mapdl.outres('ALL', 'ALL')
+    afficher_parametres()
+    planning = planning_face_superieure(top_coords)
+    champs = ouvrir_champs(mapdl.mesh.nodes, mapdl.mesh.nnum)
 
-# =========================
-# BOUCLE PRINCIPALE - FLUX MOBILE
-# =========================
-print("\n=== DEBUT SIMULATION ===")
-print("Temps(s) | Position(mm) | Noeuds spot | Tmax(C)")
-print("-" * 55)
-
-results = {'time': [], 'x_pos': [], 'T_max': [], 'T_min': [], 'n_nodes': []}
-
-for step in range(num_steps + 1):
-    current_time = step * dt
-    
-    # Position actuelle du spot
-    x_center = x_start + velocity * current_time
-    
-    # Arrêter si le spot sort de la pièce
-    if x_center > L - spot_radius:
-        print(f"Spot sort de la piece a t={current_time:.1f}s")
-        break
-    
-    # 1. SUPPRIMER TOUS LES FLUX PRÉCÉDENTS
-    mapdl.allsel()
-    mapdl.sfdele('ALL', 'HFLUX')
-    
-    # 2. SÉLECTIONNER LES NŒUDS DU SPOT SUR LA FACE SUPÉRIEURE UNIQUEMENT
-    
-    # D'abord sélectionner UNIQUEMENT la face supérieure (Z = H)
-    mapdl.nsel('S', 'LOC', 'Z', H - 1e-6, H + 1e-6)
-    
-    # Puis restreindre à la zone du spot (rectangle englobant)
-    x_min = max(0, x_center - spot_radius)
-    x_max = min(L, x_center + spot_radius)
-    y_min = max(0, y_center - spot_radius)
-    y_max = min(W, y_center + spot_radius)
-    
-    mapdl.nsel('R', 'LOC', 'X', x_min, x_max)
-    mapdl.nsel('R', 'LOC', 'Y', y_min, y_max)
-    
-    # Récupérer les nœuds sélectionnés
-    selected_nodes = mapdl.mesh.nnum
-    
-    # Filtrer pour garder uniquement les nœuds dans le cercle du spot
-    spot_nodes = []
-    for node in selected_nodes:
-        x = mapdl.queries.nx(node)
-        y = mapdl.queries.ny(node)
-        distance = np.sqrt((x - x_center)**2 + (y - y_center)**2)
-        if distance <= spot_radius:
-            spot_nodes.append(node)
-    
-    # 3. APPLIQUER LE FLUX UNIQUEMENT SUR CES NŒUDS
-    if len(spot_nodes) > 0:
-        # Sélectionner uniquement les nœuds du spot
-        mapdl.nsel('NONE')
-        for node in spot_nodes:
-            mapdl.nsel('A', 'NODE', '', node)
-        
-        # Appliquer le flux thermique
-        mapdl.sf('ALL', 'HFLUX', flux_value)
-        n_nodes_flux = len(spot_nodes)
+    if SOURCE_FORME is None:
+        results = _solution_mapdl_par_pas(mapdl, top_nodes, planning, champs)
     else:
-        n_nodes_flux = 0
-        print(f"Attention: aucun noeud dans le spot a t={current_time:.1f}s")
-    
-    # 4. RÉSOUDRE
-    mapdl.allsel()  # Important: resélectionner tout pour la résolution
-    mapdl.time(current_time + dt)
-    mapdl.solve()
-    
-    # 5. SUIVI DES RÉSULTATS (tous les 5 pas)
-    if step % 5 == 0:
-        mapdl.post1()
-        mapdl.set('LAST')
-        all_temps = mapdl.post_processing.nodal_temperature()
-        T_max = np.max(all_temps)
-        T_min = np.min(all_temps)
-        
-        results['time'].append(current_time)
-        results['x_pos'].append(x_center * 1000)
-        results['T_max'].append(T_max)
-        results['T_min'].append(T_min)
-        results['n_nodes'].append(n_nodes_flux)
-        
-        print(f"{current_time:6.1f}   | {x_center*1000:9.1f}    | {n_nodes_flux:11d} | {T_max:8.1f}")
-        
-        mapdl.slashsolu()
+        results = _solution_mapdl_tabulaire(mapdl, top_coords, planning, champs)
 
-mapdl.finish()
-print("\n=== SIMULATION TERMINEE ===")
+    print("\n=== SIMULATION TERMINEE ===")
 
-# =========================
-# POST-TRAITEMENT
-# =========================
-mapdl.post1()
-mapdl.set('LAST')
-
-# Vérification: température sur chaque face
-print("\n=== VERIFICATION DES TEMPERATURES PAR FACE ===")
-
-# Face supérieure (Z = H) - où le flux a été appliqué
-mapdl.nsel('S', 'LOC', 'Z', H - 1e-6, H + 1e-6)
-temps_top = mapdl.post_processing.nodal_temperature()
-print(f"Face SUPERIEURE (Z={H*1000}mm) - FLUX APPLIQUE ICI:")
-print(f"    Tmin={temps_top.min():.1f}C, Tmax={temps_top.max():.1f}C")
-
-# Face inférieure (Z = 0)
-mapdl.nsel('S', 'LOC', 'Z', -1e-6, 1e-6)
-temps_bottom = mapdl.post_processing.nodal_temperature()
-print(f"Face inferieure (Z=0mm):")
-print(f"    Tmin={temps_bottom.min():.1f}C, Tmax={temps_bottom.max():.1f}C")
-
-# Faces latérales X
-mapdl.nsel('S', 'LOC', 'X', -1e-6, 1e-6)
-temps_x0 = mapdl.post_processing.nodal_temperature()
-print(f"Face laterale X=0:")
-print(f"    Tmin={temps_x0.min():.1f}C, Tmax={temps_x0.max():.1f}C")
-
-mapdl.nsel('S', 'LOC', 'X', L - 1e-6, L + 1e-6)
-temps_xL = mapdl.post_processing.nodal_temperature()
-print(f"Face laterale X={L*1000}mm:")
-print(f"    Tmin={temps_xL.min():.1f}C, Tmax={temps_xL.max():.1f}C")
-
-# Faces latérales Y
-mapdl.nsel('S', 'LOC', 'Y', -1e-6, 1e-6)
-temps_y0 = mapdl.post_processing.nodal_temperature()
-print(f"Face laterale Y=0:")
-print(f"    Tmin={temps_y0.min():.1f}C, Tmax={temps_y0.max():.1f}C")
-
-mapdl.nsel('S', 'LOC', 'Y', W - 1e-6, W + 1e-6)
-temps_yW = mapdl.post_processing.nodal_temperature()
-print(f"Face laterale Y={W*1000}mm:")
-print(f"    Tmin={temps_yW.min():.1f}C, Tmax={temps_yW.max():.1f}C")
-
-mapdl.allsel()
+    # =========================
+    # POST-TRAITEMENT
+    # =========================
+    mapdl.post1()
+    mapdl.set('LAST')
 
-# =========================
-# VISUALISATIONS
-# =========================
-print("\n=== GENERATION DES VISUALISATIONS ===")
-
-# Vue 3D isométrique
-mapdl.post_processing.plot_nodal_temperature(
-    cmap='jet',
-    show_edges=True,
-    background='white',
-    title='Distribution de temperature - Flux sur face superieure uniquement',
-    cpos='iso'
-)
-
-# Coupe longitudinale (plan Y = y_center)
-mapdl.nsel('S', 'LOC', 'Y', y_center - 0.002, y_center + 0.002)
-mapdl.post_processing.plot_nodal_temperature(
-    cmap='jet',
-    show_edges=True,
-    background='white',
-    title=f'Coupe longitudinale Y={y_center*1000:.0f}mm - Propagation en profondeur',
-    cpos='xz'
-)
-
-mapdl.allsel()
+    if champs is not None:
+        # Faces extraites hors ligne du dernier champ enregistré (pas final)
+        champs.fermer()
+        temperatures_faces = lire_champs(CHAMPS_FICHIER).temperatures_faces()
+    else:
+        temperatures_faces = {}
+        for nom, axe, valeur in [('top', 'Z', H), ('bottom', 'Z', 0.0),
+                                 ('x0', 'X', 0.0), ('xL', 'X', L),
+                                 ('y0', 'Y', 0.0), ('yW', 'Y', W)]:
+            mapdl.nsel('S', 'LOC', axe, valeur - 1e-6, valeur + 1e-6)
+            temperatures_faces[nom] = mapdl.post_processing.nodal_temperature()
+
+        mapdl.allsel()
+
+    if not visualiser:
+        mapdl.finish()
+        if session_locale:
+            mapdl.exit()
+        return results, temperatures_faces
+
+    # =========================
+    # VISUALISATIONS
+    # =========================
+    print("\n=== GENERATION DES VISUALISATIONS ===")
+
+    # Vue 3D isométrique
+    mapdl.post_processing.plot_nodal_temperature(
+        cmap='jet',
+        show_edges=True,
+        background='white',
+        title='Distribution de temperature - Flux sur face superieure uniquement',
+        cpos='iso'
+    )
+
+    # Coupe longitudinale (plan Y = y_center)
+    mapdl.nsel('S', 'LOC', 'Y', y_center - 0.002, y_center + 0.002)
+    mapdl.post_processing.plot_nodal_temperature(
+        cmap='jet',
+        show_edges=True,
+        background='white',
+        title=f'Coupe longitudinale Y={y_center*1000:.0f}mm - Propagation en profondeur',
+        cpos='xz'
+    )
 
-# =========================
-# GRAPHIQUES MATPLOTLIB
-# =========================
-print("\nGeneration des graphiques...")
-
-fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-
-# Graphique 1: Évolution température max
-ax1 = axes[0, 0]
-ax1.plot(results['time'], results['T_max'], 'r-o', linewidth=2, markersize=4, label='Tmax')
-ax1.plot(results['time'], results['T_min'], 'b-s', linewidth=2, markersize=4, label='Tmin')
-ax1.set_xlabel('Temps (s)')
-ax1.set_ylabel('Temperature (C)')
-ax1.set_title('Evolution des temperatures')
-ax1.grid(True, alpha=0.3)
-ax1.legend()
-
-# Graphique 2: Position du spot vs Tmax
-ax2 = axes[0, 1]
-ax2.plot(results['x_pos'], results['T_max'], 'r-o', linewidth=2, markersize=4)
-ax2.set_xlabel('Position X du spot (mm)')
-ax2.set_ylabel('Temperature max (C)')
-ax2.set_title('Temperature max vs position du spot')
-ax2.grid(True, alpha=0.3)
-
-# Graphique 3: Nombre de nœuds dans le spot
-ax3 = axes[1, 0]
-ax3.plot(results['time'], results['n_nodes'], 'g-o', linewidth=2, markersize=4)
-ax3.set_xlabel('Temps (s)')
-ax3.set_ylabel('Nombre de noeuds')
-ax3.set_title('Noeuds dans la zone du spot (face superieure)')
-ax3.grid(True, alpha=0.3)
-
-# Graphique 4: Gradient thermique
-ax4 = axes[1, 1]
-gradient = np.array(results['T_max']) - np.array(results['T_min'])
-ax4.plot(results['time'], gradient, 'm-o', linewidth=2, markersize=4)
-ax4.set_xlabel('Temps (s)')
-ax4.set_ylabel('Gradient (C)')
-ax4.set_title('Gradient thermique (Tmax - Tmin)')
-ax4.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('flux_mobile_resultats.png', dpi=150)
-print("Graphique sauvegarde: flux_mobile_resultats.png")
-plt.show()
+    mapdl.allsel()
 
-# =========================
-# RÉSUMÉ FINAL
-# =========================
-print("\n" + "=" * 60)
-print("RESUME DE LA SIMULATION")
-print("=" * 60)
-print(f"Temperature maximale atteinte: {max(results['T_max']):.1f} C")
-print(f"Temperature minimale finale: {min(results['T_min']):.1f} C")
-print(f"Gradient max: {max(results['T_max']) - min(results['T_min']):.1f} C")
-print(f"Face superieure - Tmax: {temps_top.max():.1f} C (flux applique ici)")
-print(f"Face inferieure - Tmax: {temps_bottom.max():.1f} C (propagation par conduction)")
-print("=" * 60)
-
-# Export des résultats
-try:
-    import pandas as pd
-    df = pd.DataFrame(results)
-    df.to_csv('flux_mobile_donnees.csv', index=False)
-    print("Donnees exportees: flux_mobile_donnees.csv")
-except ImportError:
-    print("pandas non disponible - export CSV ignore")
-
-# Fermeture propre
-mapdl.exit()
-print("\nSimulation terminee avec succes!")
+    # Fermeture propre
+    if session_locale:
+        mapdl.exit()
+
+    return results, temperatures_faces
+
+
+def _options_transitoires_mapdl(mapdl):
+    # =========================
+    # SOLUTION TRANSITOIRE
+    # =========================
+    mapdl.slashsolu()
+    mapdl.antype('TRANS')
+    mapdl.trnopt('FULL')
+
+    mapdl.time(0)
+    mapdl.autots('ON')
+    mapdl.deltim(dt, dt/10, dt*2)
+    mapdl.kbc(0)
+    mapdl.tref(20)
+    mapdl.outres('ALL', 'ALL')
+
+
+def _solution_mapdl_par_pas(mapdl, top_nodes, planning, champs=None):
+    """Flux uniforme reapplique a chaque pas sur les noeuds du spot (un pas de charge par pas)."""
+    # =========================
+    # PLANNING DU SPOT: UN COMPONENT DE NŒUDS PAR PAS, CRÉÉ AVANT LA RÉSOLUTION
+    # =========================
+    nb_noeuds_spot = planning.nb_noeuds_actifs
+    for step in range(planning.n_pas):
+        if nb_noeuds_spot[step] > 0:
+            mapdl.nsel('S', 'NODE', '', top_nodes[planning.noeuds(step)])
+            mapdl.cm(f'SPOT_{step}', 'NODE')
+    mapdl.allsel()
+
+    _options_transitoires_mapdl(mapdl)
+
+    # =========================
+    # BOUCLE PRINCIPALE - FLUX MOBILE
+    # =========================
+    print("\n=== DEBUT SIMULATION ===")
+    print("Temps(s) | Position(mm) | Noeuds spot | Tmax(C)")
+    print("-" * 55)
+
+    results = {'time': [], 'x_pos': [], 'T_max': [], 'T_min': [], 'n_nodes': []}
+
+    for step in range(planning.n_pas):
+        current_time = planning.temps[step]
+
+        # Position actuelle du spot
+        x_center = planning.x_centres[step]
+
+        # 1. SUPPRIMER TOUS LES FLUX PRÉCÉDENTS
+        mapdl.allsel()
+        mapdl.sfdele('ALL', 'HFLUX')
+
+        # 2. APPLIQUER LE FLUX SUR LES NŒUDS DU SPOT (component préparé)
+        n_nodes_flux = int(nb_noeuds_spot[step])
+        if n_nodes_flux > 0:
+            mapdl.cmsel('S', f'SPOT_{step}')
+            mapdl.sf('ALL', 'HFLUX', flux_value)
+        else:
+            print(f"Attention: aucun noeud dans le spot a t={current_time:.1f}s")
+
+        # 4. RÉSOUDRE
+        mapdl.allsel()  # Important: resélectionner tout pour la résolution
+        mapdl.time(current_time + dt)
+        mapdl.solve()
+
+        # 5. SUIVI DES RÉSULTATS (tous les 5 pas) ET CHAMPS (tous les INTERVALLE_CHAMPS pas
+        #    et au dernier pas)
+        suivi = step % 5 == 0
+        enregistrement = champs is not None and enregistrer_champ(step, planning.n_pas)
+        if suivi or enregistrement:
+            mapdl.post1()
+            mapdl.set('LAST')
+            all_temps = mapdl.post_processing.nodal_temperature()
+            if enregistrement:
+                champs.ajouter(current_time + dt, all_temps)
+
+        if suivi:
+            T_max = np.max(all_temps)
+            T_min = np.min(all_temps)
+
+            results['time'].append(current_time)
+            results['x_pos'].append(x_center * 1000)
+            results['T_max'].append(T_max)
+            results['T_min'].append(T_min)
+            results['n_nodes'].append(n_nodes_flux)
+
+            print(f"{current_time:6.1f}   | {x_center*1000:9.1f}    | {n_nodes_flux:11d} | {T_max:8.1f}")
+
+        if suivi or enregistrement:
+            mapdl.slashsolu()
+
+    # Arrêt si le spot sort de la pièce
+    if planning.sortie_piece:
+        print(f"Spot sort de la piece a t={planning.n_pas * dt:.1f}s")
+
+    mapdl.finish()
+    return results
+
+
+def _solution_mapdl_tabulaire(mapdl, top_coords, planning, champs=None):
+    """
+    Source continue appliquee une seule fois: table HFLUX(X, Y, TIME) sur la
+    face superieure, puis un seul pas de charge avec pas de temps automatiques.
+    """
+    source = source_continue()
+    t_fin = planning.n_pas * dt
+
+    # Table du flux sur la grille des noeuds de la face supérieure, un plan par dt
+    x = np.unique(np.round(top_coords[:, 0], 9))
+    y = np.unique(np.round(top_coords[:, 1], 9))
+    temps = np.arange(planning.n_pas + 1) * dt
+    ecrire_table_flux_apdl('flux_mobile_table.mac', source, x, y, temps, nom='QFLX')
+    mapdl.input('flux_mobile_table.mac')
+
+    mapdl.cmsel('S', 'TOP_FACE')
+    mapdl.sf('ALL', 'HFLUX', '%QFLX%')
+    mapdl.allsel()
+
+    _options_transitoires_mapdl(mapdl)
+
+    print(f"\n=== DEBUT SIMULATION (source {source.forme}, table QFLX) ===")
+    mapdl.time(t_fin)
+    mapdl.solve()
+    mapdl.finish()
+
+    # Suivi des résultats à partir des sous-pas enregistrés (OUTRES,ALL)
+    print("Temps(s) | Position(mm) | Noeuds spot | Tmax(C)")
+    print("-" * 55)
+
+    results = {'time': [], 'x_pos': [], 'T_max': [], 'T_min': [], 'n_nodes': []}
+
+    mapdl.post1()
+    mapdl.set('FIRST')
+    t_suivi = 0.0
+    t_champs = 0.0
+    nsets = mapdl.post_processing.nsets
+    for k in range(nsets):
+        t = mapdl.post_processing.time
+        suivi = t >= t_suivi - 1e-9
+        enregistrement = champs is not None and (t >= t_champs - 1e-9 or k == nsets - 1)
+        if suivi or enregistrement:
+            all_temps = mapdl.post_processing.nodal_temperature()
+        if enregistrement:
+            champs.ajouter(t, all_temps)
+            t_champs += INTERVALLE_CHAMPS * dt
+        if suivi:
+            n_nodes_flux = noeuds_spot_a(planning, t)
+            results['time'].append(t)
+            results['x_pos'].append(source.centre(t) * 1000)
+            results['T_max'].append(np.max(all_temps))
+            results['T_min'].append(np.min(all_temps))
+            results['n_nodes'].append(n_nodes_flux)
+            print(f"{t:6.1f}   | {source.centre(t)*1000:9.1f}    | {n_nodes_flux:11d} | {np.max(all_temps):8.1f}")
+            t_suivi += 5 * dt
+        mapdl.set('NEXT')
+
+    mapdl.finish()
+    return results
+
+
+def simuler_local(theta=THETA):
+    """
+    Simulation transitoire avec le solveur local (solveur_thermique_local.py).
+
+    Memes etapes que simuler_mapdl: a chaque pas, flux HFLUX sur les faces
+    superieures dont les 4 noeuds sont dans le spot, puis resolution d'un pas
+    dt (chargement constant sur le pas). Les seconds membres de tous les pas
+    sont construits avant la boucle a partir du planning du spot.
+    Avec SOURCE_FORME, la source continue est evaluee aux points de Gauss et
+    integree avec des pas de temps automatiques (IntegrateurAdaptatif), sauf
+    la source chapeau, discontinue en temps, integree a pas fixes dt.
+
+    Retourne: (results, temperatures par face)
+    """
+    import scipy.sparse as sp
+    from solveur_thermique_local import (mailler_bloc, matrices_volumiques, convection,
+                                         IntegrateurSurface, IntegrateurVolume,
+                                         flux_faces_selectionnees, IntegrateurTemporel,
+                                         IntegrateurAdaptatif)
+
+    print(f"Creation geometrie: {L*1000}x{W*1000}x{H*1000} mm")
+
+    maillage = mailler_bloc(L, W, H, esize)
+    print(f"Maillage: {maillage.n_elem} elements, {maillage.n_noeuds} noeuds")
+
+    noeuds = maillage.noeuds
+    top_nodes = np.unique(maillage.faces['ZH'])
+    top_coords = noeuds[top_nodes]
+    print(f"Nombre de noeuds sur la face superieure: {len(top_nodes)}")
+
+    print("\nProprietes materiau (Acier):")
+    print(f"  Conductivite: {conductivite:g} W/m.K")
+    print(f"  Densite: {densite:g} kg/m3")
+    print(f"  Capacite thermique: {capacite:g} J/kg.K")
+
+    K, C = matrices_volumiques(maillage, conductivite, densite, capacite)
+    H_conv, f_conv = convection(maillage, ['Z0'], h_convection, T_exterieure)
+    surface_sup = IntegrateurSurface(noeuds, maillage.faces['ZH'])
+
+    afficher_parametres()
+    schema = 'Crank-Nicolson' if theta == 0.5 else 'Euler implicite'
+    print(f"Integration temporelle: {schema} (theta={theta})")
+
+    planning = planning_face_superieure(top_coords)
+    T = np.full(maillage.n_noeuds, T_initiale)
+    champs = ouvrir_champs(noeuds)
+
+    print("\n=== DEBUT SIMULATION ===")
+    print("Temps(s) | Position(mm) | Noeuds spot | Tmax(C)")
+    print("-" * 55)
+
+    results = {'time': [], 'x_pos': [], 'T_max': [], 'T_min': [], 'n_nodes': []}
+
+    def suivre(t, x_center, n_nodes_flux, T):
+        results['time'].append(t)
+        results['x_pos'].append(x_center * 1000)
+        results['T_max'].append(T.max())
+        results['T_min'].append(T.min())
+        results['n_nodes'].append(n_nodes_flux)
+        print(f"{t:6.1f}   | {x_center*1000:9.1f}    | {n_nodes_flux:11d} | {T.max():8.1f}")
+
+    if SOURCE_FORME is not None:
+        # Source continue appliquée une seule fois, pas de temps automatiques
+        source = source_continue()
+        if source.volumique:
+            volume = IntegrateurVolume(maillage)
+            P = volume.points
+            def second_membre(t):
+                return f_conv + volume.vecteur(source.source_volumique(P[..., 0], P[..., 1], P[..., 2], t))
+        else:
+            P = surface_sup.points
+            def second_membre(t):
+                return f_conv + surface_sup.vecteur(source.flux_surfacique(P[..., 0], P[..., 1], t))
+
+        t_fin = planning.n_pas * dt
+        if source.forme == 'chapeau':
+            # Bord franc: chargement discontinu en temps, le pas automatique
+            # resterait a dt_min; pas fixes dt comme le mode par pas
+            integrateur = IntegrateurTemporel(K + H_conv, C, dt, theta)
+            def pas_fixes(T):
+                f_n = second_membre(0.0)
+                for step in range(1, planning.n_pas + 1):
+                    f_np1 = second_membre(step * dt)
+                    T = integrateur.pas(T, f_n, f_np1)
+                    f_n = f_np1
+                    yield step * dt, T
+            adaptatif = None
+            pas = pas_fixes(T)
+        else:
+            adaptatif = IntegrateurAdaptatif(K + H_conv, C, dt, dt/10, dt*2, theta)
+            pas = adaptatif.integrer(T, t_fin, second_membre)
+
+        t_suivi = 0.0
+        t_champs = 0.0
+        for t, T in pas:
+            if t >= t_suivi - 1e-9:
+                suivre(t, source.centre(t), noeuds_spot_a(planning, t), T)
+                t_suivi += 5 * dt
+            if champs is not None and (t >= t_champs - 1e-9 or t >= t_fin - 1e-9):
+                champs.ajouter(t, T)
+                t_champs += INTERVALLE_CHAMPS * dt
+
+        if adaptatif is None:
+            print(f"Source {source.forme}: {planning.n_pas} pas fixes")
+        else:
+            print(f"Source {source.forme}: {adaptatif.nb_pas} pas acceptes, {adaptatif.nb_refus} refuses, "
+                  f"{adaptatif.nb_factorisations} factorisations")
+        if planning.sortie_piece:
+            print(f"Spot sort de la piece a t={planning.n_pas * dt:.1f}s")
+        print("\n=== SIMULATION TERMINEE ===")
+        if champs is not None:
+            champs.fermer()
+        return results, temperatures_par_face(noeuds, T)
+
+    # Seconds membres HFLUX de tous les pas, à partir du planning du spot
+    selections = sp.csr_matrix((planning.actifs.data, top_nodes[planning.actifs.indices],
+                                planning.actifs.indptr),
+                               shape=(planning.n_pas, maillage.n_noeuds))
+    F_flux = flux_faces_selectionnees(surface_sup, selections, flux_value)
+    nb_noeuds_spot = planning.nb_noeuds_actifs
+
+    integrateur = IntegrateurTemporel(K + H_conv, C, dt, theta)
+
+    for step in range(planning.n_pas):
+        current_time = planning.temps[step]
+        x_center = planning.x_centres[step]
+
+        n_nodes_flux = int(nb_noeuds_spot[step])
+        if n_nodes_flux == 0:
+            print(f"Attention: aucun noeud dans le spot a t={current_time:.1f}s")
+
+        T = integrateur.pas(T, f_conv + F_flux[step].toarray().ravel())
+
+        if step % 5 == 0:
+            suivre(current_time, x_center, n_nodes_flux, T)
+        if champs is not None and enregistrer_champ(step, planning.n_pas):
+            champs.ajouter(current_time + dt, T)
+
+    if planning.sortie_piece:
+        print(f"Spot sort de la piece a t={planning.n_pas * dt:.1f}s")
+
+    print("\n=== SIMULATION TERMINEE ===")
+    if champs is not None:
+        champs.fermer()
+
+    return results, temperatures_par_face(noeuds, T)
+
+
+def maillage_fenetre(x_centre):
+    """
+    Maillage gradue fin autour du spot centre en x_centre: fenetre
+    [x_centre - FENETRE_ARRIERE r, x_centre + FENETRE_AVANT r] en X, bande
+    de 1.5 r autour de la trajectoire en Y, profondeur r sous la face
+    superieure en Z.
+
+    Retourne: (maillage, fin de la fenetre en X)
+    """
+    from solveur_thermique_local import mailler_grille, coordonnees_graduees
+
+    h_fin, h_grossier = esize / RAFFINEMENT, esize * GROSSISSEMENT
+    fin_fenetre = min(x_centre + FENETRE_AVANT * spot_radius, L)
+    x = coordonnees_graduees(L, h_fin, h_grossier, x_centre - FENETRE_ARRIERE * spot_radius, fin_fenetre)
+    y = coordonnees_graduees(W, h_fin, h_grossier, y_center - 1.5 * spot_radius, y_center + 1.5 * spot_radius)
+    z = coordonnees_graduees(H, h_fin, h_grossier, H - spot_radius, H)
+    return mailler_grille(x, y, z), fin_fenetre
+
+
+def simuler_local_raffine(theta=THETA):
+    """
+    Simulation transitoire locale sur un maillage fin qui suit le spot.
+
+    Le maillage est reconstruit (matrices, factorisation, planning du spot)
+    quand le bord avant du spot arrive a un rayon du bord avant de la
+    fenetre fine; le champ est transfere par interpolation trilineaire.
+
+    Retourne: (results, temperatures par face)
+    """
+    import scipy.sparse as sp
+    from solveur_thermique_local import (mailler_bloc, matrices_volumiques, convection,
+                                         IntegrateurSurface, flux_faces_selectionnees,
+                                         IntegrateurTemporel, transferer_champ)
+
+    h_fin = esize / RAFFINEMENT
+    reference_fine = mailler_bloc(L, W, H, h_fin)
+    print(f"Maillage uniforme equivalent (esize={h_fin*1000:g} mm): {reference_fine.n_noeuds} noeuds")
+
+    afficher_parametres()
+    schema = 'Crank-Nicolson' if theta == 0.5 else 'Euler implicite'
+    print(f"Integration temporelle: {schema} (theta={theta})")
+
+    # Champs enregistrés sur le maillage uniforme esize (ensemble de noeuds fixe)
+    reference = mailler_bloc(L, W, H, esize)
+    champs = ouvrir_champs(reference.noeuds)
+
+    print("\n=== DEBUT SIMULATION ===")
+    print("Temps(s) | Position(mm) | Noeuds spot | Tmax(C)")
+    print("-" * 55)
+
+    results = {'time': [], 'x_pos': [], 'T_max': [], 'T_min': [], 'n_nodes': []}
+    maillage, T, fin_fenetre = None, None, -np.inf
+    nb_maillages, noeuds_cumules = 0, 0
+
+    for step in range(num_steps + 1):
+        x_center = x_start + velocity * step * dt
+
+        # Nouveau maillage quand le spot approche du bord avant de la fenêtre
+        if maillage is None or (x_center + 2 * spot_radius > fin_fenetre and fin_fenetre < L):
+            nouveau, fin_fenetre = maillage_fenetre(x_center)
+            if maillage is None:
+                T = np.full(nouveau.n_noeuds, T_initiale)
+            else:
+                energie = (C @ T).sum()
+                T = transferer_champ(maillage, T, nouveau)
+            maillage = nouveau
+            noeuds = maillage.noeuds
+
+            K, C = matrices_volumiques(maillage, conductivite, densite, capacite)
+            H_conv, f_conv = convection(maillage, ['Z0'], h_convection, T_exterieure)
+            surface_sup = IntegrateurSurface(noeuds, maillage.faces['ZH'])
+            integrateur = IntegrateurTemporel(K + H_conv, C, dt, theta)
+
+            top_nodes = np.unique(maillage.faces['ZH'])
+            planning = planning_face_superieure(noeuds[top_nodes])
+            selections = sp.csr_matrix((planning.actifs.data, top_nodes[planning.actifs.indices],
+                                        planning.actifs.indptr),
+                                       shape=(planning.n_pas, maillage.n_noeuds))
+            F_flux = flux_faces_selectionnees(surface_sup, selections, flux_value)
+            nb_noeuds_spot = planning.nb_noeuds_actifs
+
+            nb_maillages += 1
+            message = f"Maillage {nb_maillages}: fenetre fine jusqu'a X={fin_fenetre*1000:.1f} mm, {maillage.n_noeuds} noeuds"
+            if nb_maillages > 1:
+                message += f", variation d'energie au transfert {((C @ T).sum() / energie - 1) * 100:+.3f} %"
+            print(message)
+
+        if step >= planning.n_pas:
+            break
+
+        current_time = step * dt
+        n_nodes_flux = int(nb_noeuds_spot[step])
+        if n_nodes_flux == 0:
+            print(f"Attention: aucun noeud dans le spot a t={current_time:.1f}s")
+
+        T = integrateur.pas(T, f_conv + F_flux[step].toarray().ravel())
+        noeuds_cumules += maillage.n_noeuds
+
+        if step % 5 == 0:
+            results['time'].append(current_time)
+            results['x_pos'].append(x_center * 1000)
+            results['T_max'].append(T.max())
+            results['T_min'].append(T.min())
+            results['n_nodes'].append(n_nodes_flux)
+            print(f"{current_time:6.1f}   | {x_center*1000:9.1f}    | {n_nodes_flux:11d} | {T.max():8.1f}")
+        if champs is not None and enregistrer_champ(step, planning.n_pas):
+            champs.ajouter(current_time + dt, transferer_champ(maillage, T, reference))
+
+    if planning.sortie_piece:
+        print(f"Spot sort de la piece a t={planning.n_pas * dt:.1f}s")
+
+    print("\n=== SIMULATION TERMINEE ===")
+    print(f"{nb_maillages} maillages, {noeuds_cumules / max(step, 1):.0f} noeuds en moyenne par pas "
+          f"({noeuds_cumules / max(step, 1) / reference_fine.n_noeuds * 100:.0f} % du maillage uniforme fin)")
+    if champs is not None:
+        champs.fermer()
+
+    return results, temperatures_par_face(noeuds, T)
+
+
+def temperatures_par_face(noeuds, T):
+    """Temperatures des noeuds de chaque face du bloc (backend local)."""
+    temperatures_faces = {}
+    for nom, axe, valeur in [('top', 2, H), ('bottom', 2, 0.0),
+                             ('x0', 0, 0.0), ('xL', 0, L),
+                             ('y0', 1, 0.0), ('yW', 1, W)]:
+        temperatures_faces[nom] = T[np.abs(noeuds[:, axe] - valeur) < 1e-6]
+    return temperatures_faces
+
+
+def simuler_repere_mobile():
+    """
+    Regime quasi stationnaire dans le repere lie au spot (solveur local).
+
+    Le spot est fixe en X_REPERE et la matiere defile a -velocity selon X:
+    (K + A + H_conv) T = f, avec A la matrice d'advection SUPG. La matiere
+    entre a T_initiale par la face X = L (en amont du spot) et sort
+    librement par X = 0. Meme chargement que le calcul transitoire (spot
+    uniforme, ou source continue SOURCE_FORME), evalue pour le spot en X_REPERE.
+
+    Retourne: (noeuds, T)
+    """
+    import scipy.sparse as sp
+    from solveur_thermique_local import (mailler_bloc, matrices_volumiques, convection,
+                                         IntegrateurSurface, IntegrateurVolume,
+                                         flux_faces_selectionnees, matrice_advection,
+                                         resoudre_dirichlet)
+
+    print(f"Creation geometrie: {L*1000}x{W*1000}x{H*1000} mm")
+    maillage = mailler_bloc(L, W, H, esize)
+    noeuds = maillage.noeuds
+    print(f"Maillage: {maillage.n_elem} elements, {maillage.n_noeuds} noeuds")
+
+    K, _ = matrices_volumiques(maillage, conductivite, densite, capacite)
+    H_conv, f_conv = convection(maillage, ['Z0'], h_convection, T_exterieure)
+    A = matrice_advection(maillage, conductivite, densite, capacite, (-velocity, 0.0, 0.0))
+    surface_sup = IntegrateurSurface(noeuds, maillage.faces['ZH'])
+
+    afficher_parametres()
+    Pe = densite * capacite * velocity * esize / (2.0 * conductivite)
+    print(f"Repere mobile: spot fixe en X={X_REPERE*1000:.1f} mm, Peclet de maille {Pe:.2f}")
+
+    # Chargement du spot en X_REPERE
+    t_spot = (X_REPERE - x_start) / velocity
+    if SOURCE_FORME is None:
+        top_nodes = np.unique(maillage.faces['ZH'])
+        d2 = (noeuds[top_nodes, 0] - X_REPERE) ** 2 + (noeuds[top_nodes, 1] - y_center) ** 2
+        dans_spot = top_nodes[d2 <= (spot_radius + 1e-9) ** 2]
+        selection = sp.csr_matrix((np.ones(len(dans_spot), dtype=bool),
+                                   (np.zeros(len(dans_spot), dtype=int), dans_spot)),
+                                  shape=(1, maillage.n_noeuds))
+        f_flux = flux_faces_selectionnees(surface_sup, selection, flux_value).toarray().ravel()
+        print(f"Noeuds dans le spot: {len(dans_spot)}")
+    else:
+        source = source_continue()
+        if source.volumique:
+            volume = IntegrateurVolume(maillage)
+            P = volume.points
+            f_flux = volume.vecteur(source.source_volumique(P[..., 0], P[..., 1], P[..., 2], t_spot))
+        else:
+            P = surface_sup.points
+            f_flux = surface_sup.vecteur(source.flux_surfacique(P[..., 0], P[..., 1], t_spot))
+        print(f"Source continue {source.forme} centree en X={source.centre(t_spot)*1000:.1f} mm")
+
+    entree = np.unique(maillage.faces['XL'])
+    T = resoudre_dirichlet(K + A + H_conv, f_conv + f_flux, entree, T_initiale)
+
+    i_max = np.argmax(T)
+    print("\n=== REGIME QUASI STATIONNAIRE ===")
+    print(f"Tmax: {T[i_max]:.1f} C a {(noeuds[i_max, 0] - X_REPERE)*1000:+.1f} mm du centre du spot")
+    afficher_isothermes(noeuds, T)
+    return noeuds, T
+
+
+def dimensions_isotherme(noeuds, T, niveau):
+    """
+    Dimensions (m) de la zone T > niveau, a la resolution des noeuds:
+    (longueur suivant X, largeur suivant Y, profondeur sous la face superieure).
+    """
+    zone = T > niveau
+    if not np.any(zone):
+        return 0.0, 0.0, 0.0
+    x, y, z = noeuds[zone].T
+    return float(np.ptp(x)), float(np.ptp(y)), float(noeuds[:, 2].max() - z.min())
+
+
+def niveaux_isothermes(T_max):
+    """Isothermes a 25, 50 et 75 % de l'echauffement maximal."""
+    return T_initiale + np.array([0.25, 0.5, 0.75]) * (T_max - T_initiale)
+
+
+def afficher_isothermes(noeuds, T, niveaux=None):
+    niveaux = niveaux_isothermes(T.max()) if niveaux is None else niveaux
+    print("Isotherme (C) | Longueur (mm) | Largeur (mm) | Profondeur (mm)")
+    for niveau in niveaux:
+        longueur, largeur, profondeur = dimensions_isotherme(noeuds, T, niveau)
+        print(f"{niveau:12.1f}  | {longueur*1000:12.1f}  | {largeur*1000:11.1f}  | {profondeur*1000:14.1f}")
+
+
+def comparer_transitoire(noeuds, T_stationnaire):
+    """
+    Lance le calcul transitoire local et compare son champ, quand le spot
+    passe en X_REPERE, au regime quasi stationnaire.
+    """
+    import os
+    import tempfile
+
+    global CHAMPS_FICHIER, INTERVALLE_CHAMPS
+    print("\n=== CALCUL TRANSITOIRE DE COMPARAISON ===")
+    with tempfile.TemporaryDirectory() as repertoire:
+        CHAMPS_FICHIER = os.path.join(repertoire, 'champs_transitoire.npz')
+        INTERVALLE_CHAMPS = 1
+        simuler_local()
+        champs = lire_champs(CHAMPS_FICHIER)
+    CHAMPS_FICHIER = None
+
+    # Champ stocké en fin de pas; en mode par pas, le spot est placé en début de pas
+    t_cible = (X_REPERE - x_start) / velocity + (dt if SOURCE_FORME is None else 0.0)
+    indice = champs.indice_temps(t_cible)
+    T_transitoire = champs.temperature[indice].astype(float)
+
+    print(f"\n=== COMPARAISON (spot en X={X_REPERE*1000:.1f} mm, t={champs.temps[indice]:.1f} s) ===")
+    print(f"Tmax quasi stationnaire: {T_stationnaire.max():.1f} C")
+    print(f"Tmax transitoire:        {T_transitoire.max():.1f} C")
+    print(f"Ecart max sur le champ:  {np.abs(T_transitoire - T_stationnaire).max():.1f} C")
+    print("Isothermes du regime quasi stationnaire appliquees au transitoire:")
+    afficher_isothermes(noeuds, T_transitoire, niveaux_isothermes(T_stationnaire.max()))
+
+    # Profil sur l'axe du spot, face supérieure
+    axe = (np.abs(noeuds[:, 1] - y_center) < 1e-6) & (np.abs(noeuds[:, 2] - H) < 1e-6)
+    if not np.any(axe):
+        return
+    ordre = np.argsort(noeuds[axe, 0])
+    x = (noeuds[axe, 0][ordre] - X_REPERE) * 1000
+    plt.figure(figsize=(8, 5))
+    plt.plot(x, T_stationnaire[axe][ordre], 'r-', linewidth=2, label='Quasi stationnaire (repere mobile)')
+    plt.plot(x, T_transitoire[axe][ordre], 'b--', linewidth=2,
+             label=f'Transitoire, t={champs.temps[indice]:.1f} s')
+    plt.xlabel('Distance au centre du spot (mm)')
+    plt.ylabel('Temperature (C)')
+    plt.title('Face superieure, axe du spot')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.savefig('flux_mobile_repere_mobile.png', dpi=150)
+    print("Graphique sauvegarde: flux_mobile_repere_mobile.png")
+    plt.show()
+
+
+def afficher_temperatures_faces(temperatures_faces):
+    # Vérification: température sur chaque face
+    print("\n=== VERIFICATION DES TEMPERATURES PAR FACE ===")
+
+    libelles = {
+        'top': f"Face SUPERIEURE (Z={H*1000}mm) - FLUX APPLIQUE ICI:",
+        'bottom': "Face inferieure (Z=0mm):",
+        'x0': "Face laterale X=0:",
+        'xL': f"Face laterale X={L*1000}mm:",
+        'y0': "Face laterale Y=0:",
+        'yW': f"Face laterale Y={W*1000}mm:",
+    }
+    for nom, libelle in libelles.items():
+        temps = temperatures_faces[nom]
+        print(libelle)
+        print(f"    Tmin={temps.min():.1f}C, Tmax={temps.max():.1f}C")
+
+
+def tracer_resultats(results):
+    # =========================
+    # GRAPHIQUES MATPLOTLIB
+    # =========================
+    print("\nGeneration des graphiques...")
+
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+
+    # Graphique 1: Évolution température max
+    ax1 = axes[0, 0]
+    ax1.plot(results['time'], results['T_max'], 'r-o', linewidth=2, markersize=4, label='Tmax')
+    ax1.plot(results['time'], results['T_min'], 'b-s', linewidth=2, markersize=4, label='Tmin')
+    ax1.set_xlabel('Temps (s)')
+    ax1.set_ylabel('Temperature (C)')
+    ax1.set_title('Evolution des temperatures')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    # Graphique 2: Position du spot vs Tmax
+    ax2 = axes[0, 1]
+    ax2.plot(results['x_pos'], results['T_max'], 'r-o', linewidth=2, markersize=4)
+    ax2.set_xlabel('Position X du spot (mm)')
+    ax2.set_ylabel('Temperature max (C)')
+    ax2.set_title('Temperature max vs position du spot')
+    ax2.grid(True, alpha=0.3)
+
+    # Graphique 3: Nombre de nœuds dans le spot
+    ax3 = axes[1, 0]
+    ax3.plot(results['time'], results['n_nodes'], 'g-o', linewidth=2, markersize=4)
+    ax3.set_xlabel('Temps (s)')
+    ax3.set_ylabel('Nombre de noeuds')
+    ax3.set_title('Noeuds dans la zone du spot (face superieure)')
+    ax3.grid(True, alpha=0.3)
+
+    # Graphique 4: Gradient thermique
+    ax4 = axes[1, 1]
+    gradient = np.array(results['T_max']) - np.array(results['T_min'])
+    ax4.plot(results['time'], gradient, 'm-o', linewidth=2, markersize=4)
+    ax4.set_xlabel('Temps (s)')
+    ax4.set_ylabel('Gradient (C)')
+    ax4.set_title('Gradient thermique (Tmax - Tmin)')
+    ax4.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig('flux_mobile_resultats.png', dpi=150)
+    print("Graphique sauvegarde: flux_mobile_resultats.png")
+    plt.show()
+
+
+def afficher_resume(results, temperatures_faces):
+    # =========================
+    # RÉSUMÉ FINAL
+    # =========================
+    print("\n" + "=" * 60)
+    print("RESUME DE LA SIMULATION")
+    print("=" * 60)
+    print(f"Temperature maximale atteinte: {max(results['T_max']):.1f} C")
+    print(f"Temperature minimale finale: {min(results['T_min']):.1f} C")
+    print(f"Gradient max: {max(results['T_max']) - min(results['T_min']):.1f} C")
+    print(f"Face superieure - Tmax: {temperatures_faces['top'].max():.1f} C (flux applique ici)")
+    print(f"Face inferieure - Tmax: {temperatures_faces['bottom'].max():.1f} C (propagation par conduction)")
+    print("=" * 60)
+
+
+def exporter_resultats(results):
+    # Export des résultats
+    try:
+        import pandas as pd
+        df = pd.DataFrame(results)
+        df.to_csv('flux_mobile_donnees.csv', index=False)
+        print("Donnees exportees: flux_mobile_donnees.csv")
+    except ImportError:
+        print("pandas non disponible - export CSV ignore")
+
+
+if __name__ == "__main__":
+    print(f"Backend de calcul: {BACKEND}")
+    if SOURCE_FORME is not None:
+        print(f"Source continue: {SOURCE_FORME}")
+        if SOURCE_FORME == 'goldak' and BACKEND == 'mapdl':
+            print("Erreur: la source goldak (volumique) n'est disponible qu'avec --local")
+            sys.exit(1)
+    if REPERE_MOBILE:
+        if BACKEND != 'local':
+            print("Erreur: le calcul en repere mobile n'est disponible qu'avec --local")
+            sys.exit(1)
+        noeuds, T = simuler_repere_mobile()
+        if '--comparer' in sys.argv:
+            comparer_transitoire(noeuds, T)
+        sys.exit(0)
+    if RAFFINEMENT_SPOT and (BACKEND != 'local' or SOURCE_FORME is not None):
+        print("Erreur: --raffinement n'est disponible qu'avec --local et le spot uniforme")
+        sys.exit(1)
+    if RAFFINEMENT_SPOT:
+        results, temperatures_faces = simuler_local_raffine()
+    elif BACKEND == 'local':
+        results, temperatures_faces = simuler_local()
+    else:
+        results, temperatures_faces = simuler_mapdl()
+
+    afficher_temperatures_faces(temperatures_faces)
+    tracer_resultats(results)
+    afficher_resume(results, temperatures_faces)
+    exporter_resultats(results)
+
+    print("\nSimulation terminee avec succes!")
@@ -0,0 +1,227 @@
+"""
+Modele reduit POD/Galerkin du flux mobile (flux_mobile_face_superieure.py,
+solveur local, spot uniforme) parametre par l'intensite du flux et la
+vitesse du spot.
+
+Hors ligne:
+    1. snapshots: champs de temperature de chaque pas pour des cas
+       d'apprentissage, calcules en parallele par balayage_flux_mobile.py
+    2. base POD: SVD des ecarts T - T_initiale, troncature a 1 - tolerance
+       de l'energie des valeurs singulieres
+    3. projection de Galerkin des operateurs creux du modele complet:
+       Cr = V^T C V, Kr = V^T (K + H_conv) V, et du flux sur chaque face de
+       la face superieure, Br = V^T P
+
+En ligne, pour (flux_value, velocity): une face est chargee au pas k quand
+ses 4 noeuds sont dans le spot, soit s_debut <= velocity * t_k <= s_fin
+(fenetres en distance parcourue, independantes de la vitesse). Le second
+membre reduit vaut flux_value * (faces chargees) @ Br^T et la theta-methode
+avance un systeme r x r: quelques millisecondes par cas.
+
+Usage:
+    python modele_reduit.py --apprentissage flux_value=1e5,3e5 velocity=0.002,0.004,0.006 \\
+                            --test flux_value=2e5 velocity=0.003,0.005 [--jobs N] [--tolerance 1e-6]
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import flux_mobile_face_superieure as driver
+from balayage_flux_mobile import executer_balayage, plan_grille, _lire_parametres
+from champs_temperature import lire_champs
+
+# Fraction de l'energie des valeurs singulieres negligee par la troncature
+TOLERANCE_POD = 1e-6
+
+
+@dataclass
+class ModeleReduit:
+    """Modele reduit POD/Galerkin (theta-methode a pas dt constant)."""
+    base: np.ndarray            # (n_noeuds, r) modes POD
+    T_ref: float                # etat de reference (T_initiale)
+    M_etat: np.ndarray          # (r, r) (Cr/dt + theta Kr)^-1 (Cr/dt - (1 - theta) Kr)
+    M_charge: np.ndarray        # (r, r) (Cr/dt + theta Kr)^-1
+    f0: np.ndarray              # (r,) second membre reduit constant (convection)
+    Br: np.ndarray              # (r, n_faces) flux unitaire reduit des faces traversees
+    s_debut: np.ndarray         # (n_faces,) distance parcourue a l'entree de la face dans le spot
+    s_fin: np.ndarray           # (n_faces,) distance parcourue a la sortie
+    faces: dict                 # nom -> indices des noeuds de chaque face du bloc
+    dt: float
+    num_steps: int
+    x_start: float
+    x_max: float
+
+    @property
+    def rang(self):
+        return self.base.shape[1]
+
+    def simuler(self, flux_value, velocity):
+        """
+        Calcul en ligne d'un cas.
+
+        Retourne: dict time (n_pas,), T_max, T_min (n_pas,), faces (champ final par face)
+        """
+        temps = np.arange(self.num_steps + 1) * self.dt
+        n_pas = int(np.count_nonzero(self.x_start + velocity * temps <= self.x_max))
+        distance = velocity * temps[:n_pas, None]
+        chargees = (distance >= self.s_debut) & (distance <= self.s_fin)
+        F = flux_value * (chargees.astype(float) @ self.Br.T)
+
+        a = np.zeros(self.rang)
+        historique = np.empty((n_pas, self.rang))
+        for k in range(n_pas):
+            a = self.M_etat @ a + self.M_charge @ (self.f0 + F[k])
+            historique[k] = a
+
+        champs = self.T_ref + historique @ self.base.T
+        return {'time': temps[:n_pas] + self.dt,
+                'T_max': champs.max(axis=1),
+                'T_min': champs.min(axis=1),
+                'faces': {nom: champs[-1, noeuds] for nom, noeuds in self.faces.items()}}
+
+
+def operateurs_complets():
+    """
+    Maillage, operateurs creux et fenetres des faces de la face superieure du
+    modele complet (memes parametres que le driver).
+    """
+    from solveur_thermique_local import (mailler_bloc, matrices_volumiques, convection,
+                                         IntegrateurSurface)
+    from source_mobile import planifier_spot
+
+    maillage = mailler_bloc(driver.L, driver.W, driver.H, driver.esize)
+    K, C = matrices_volumiques(maillage, driver.conductivite, driver.densite, driver.capacite)
+    H_conv, f_conv = convection(maillage, ['Z0'], driver.h_convection, driver.T_exterieure)
+    surface_sup = IntegrateurSurface(maillage.noeuds, maillage.faces['ZH'])
+
+    # Fenêtres des noeuds en distance parcourue (planning à vitesse unité)
+    planning = planifier_spot(maillage.noeuds, driver.x_start, 1.0, driver.y_center,
+                              driver.spot_radius, driver.dt, 0, np.inf)
+    faces_sup = maillage.faces['ZH']
+    s_debut = planning.entree[faces_sup].max(axis=1)
+    s_fin = planning.sortie[faces_sup].min(axis=1)
+    traversees = s_debut <= s_fin
+
+    faces = {}
+    for nom, axe, valeur in [('top', 2, driver.H), ('bottom', 2, 0.0),
+                             ('x0', 0, 0.0), ('xL', 0, driver.L),
+                             ('y0', 1, 0.0), ('yW', 1, driver.W)]:
+        faces[nom] = np.flatnonzero(np.abs(maillage.noeuds[:, axe] - valeur) < 1e-6)
+
+    P = surface_sup.operateur()[:, traversees]
+    return K + H_conv, C, f_conv, P, s_debut[traversees], s_fin[traversees], faces
+
+
+def construire_modele(fichiers_snapshots, tolerance=TOLERANCE_POD, theta=None):
+    """
+    Base POD des snapshots (fichiers de champs) et projection de Galerkin.
+
+    Retourne: ModeleReduit
+    """
+    theta = driver.THETA if theta is None else theta
+    T_ref = driver.T_initiale
+
+    snapshots = np.hstack([lire_champs(f).temperature.T.astype(float) - T_ref
+                           for f in fichiers_snapshots])
+    U, sigma, _ = np.linalg.svd(snapshots, full_matrices=False)
+    energie = np.cumsum(sigma ** 2) / np.sum(sigma ** 2)
+    rang = int(np.searchsorted(energie, 1.0 - tolerance) + 1)
+    V = U[:, :rang]
+    print(f"POD: {snapshots.shape[1]} snapshots, {rang} modes "
+          f"(energie negligee {1.0 - energie[rang - 1]:.1e})")
+
+    A, C, f_conv, P, s_debut, s_fin, faces = operateurs_complets()
+    Ar = V.T @ (A @ V)
+    Cr = V.T @ (C @ V)
+    dt = driver.dt
+    M_charge = np.linalg.inv(Cr / dt + theta * Ar)
+    M_etat = M_charge @ (Cr / dt - (1.0 - theta) * Ar)
+    f0 = V.T @ (f_conv - A @ np.full(A.shape[0], T_ref))
+
+    return ModeleReduit(V, T_ref, M_etat, M_charge, f0, V.T @ P.toarray(), s_debut, s_fin,
+                        faces, dt, driver.num_steps, driver.x_start,
+                        driver.L - driver.spot_radius)
+
+
+def verifier_modele(modele, plan_test, fichiers_test):
+    """
+    Compare le modele reduit au modele complet sur des cas de test.
+
+    Retourne: liste de dicts (erreurs en C, temps de calcul en s)
+    """
+    print("\nCas de test (erreurs du modele reduit):")
+    print("  flux (kW/m2) | vitesse (mm/s) | err Tmax(t) | err champ final | t reduit (ms)")
+    lignes = []
+    for parametres, fichier in zip(plan_test, fichiers_test):
+        champs = lire_champs(fichier)
+        debut = time.perf_counter()
+        reduit = modele.simuler(parametres.get('flux_value', driver.flux_value),
+                                parametres.get('velocity', driver.velocity))
+        duree = time.perf_counter() - debut
+
+        n = min(len(reduit['T_max']), len(champs.temps))
+        erreur_tmax = np.abs(reduit['T_max'][:n] - champs.T_max[:n]).max()
+        final = np.concatenate(list(reduit['faces'].values()))
+        complet = np.concatenate(list(champs.temperatures_faces().values()))
+        erreur_champ = np.abs(final - complet).max()
+        print(f"  {parametres.get('flux_value', driver.flux_value)/1000:12.0f} | "
+              f"{parametres.get('velocity', driver.velocity)*1000:14.2f} | "
+              f"{erreur_tmax:9.3f} C | {erreur_champ:13.3f} C | {duree*1000:12.2f}")
+        lignes.append({**parametres, 'erreur_T_max': erreur_tmax,
+                       'erreur_faces': erreur_champ, 'temps_reduit': duree})
+    return lignes
+
+
+def main(argv):
+    if '--apprentissage' not in argv or '--test' not in argv:
+        print(__doc__)
+        return 1
+
+    def arguments_apres(option):
+        i = argv.index(option) + 1
+        arguments = []
+        while i < len(argv) and not argv[i].startswith('--'):
+            arguments.append(argv[i])
+            i += 1
+        return arguments
+
+    try:
+        plan_appr = plan_grille(_lire_parametres(arguments_apres('--apprentissage'), ','))
+        plan_test = plan_grille(_lire_parametres(arguments_apres('--test'), ','))
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        return 1
+    if any(set(p) - {'flux_value', 'velocity'} for p in plan_appr + plan_test):
+        print("Erreur: le modele reduit est parametre par flux_value et velocity uniquement")
+        return 1
+
+    jobs = int(argv[argv.index('--jobs') + 1]) if '--jobs' in argv else None
+    tolerance = float(argv[argv.index('--tolerance') + 1]) if '--tolerance' in argv else TOLERANCE_POD
+    sortie = argv[argv.index('--sortie') + 1] if '--sortie' in argv else 'modele_reduit'
+
+    # Snapshots du modèle complet (tous les pas), apprentissage et test
+    repertoire_appr = os.path.join(sortie, 'apprentissage')
+    repertoire_test = os.path.join(sortie, 'test')
+    complet_appr = executer_balayage(plan_appr, 'local', jobs, driver.T_initiale, repertoire_appr)
+    complet_test = executer_balayage(plan_test, 'local', jobs, driver.T_initiale, repertoire_test)
+
+    debut = time.perf_counter()
+    modele = construire_modele([os.path.join(repertoire_appr, f"cas_{k:03d}.npz")
+                                for k in range(len(plan_appr))], tolerance)
+    print(f"Construction du modele reduit: {time.perf_counter() - debut:.2f} s")
+
+    lignes = verifier_modele(modele, plan_test, [os.path.join(repertoire_test, f"cas_{k:03d}.npz")
+                                                 for k in range(len(plan_test))])
+    temps_complet = np.mean([ligne['temps_calcul'] for ligne in complet_test])
+    temps_reduit = np.mean([ligne['temps_reduit'] for ligne in lignes])
+    print(f"\nTemps moyen par cas: complet {temps_complet:.2f} s, reduit {temps_reduit*1000:.2f} ms "
+          f"(x{temps_complet / temps_reduit:.0f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,499 @@
+"""
+Solveur elements finis thermique transitoire local (NumPy/SciPy).
+
+Remplace MAPDL pour l'etude du flux mobile quand ANSYS n'est pas disponible:
+maillage structure du bloc L x W x H en hexaedres a 8 noeuds (equivalent
+SOLID70), assemblage creux des matrices de conductivite et de capacite,
+conditions de convection (CONV) et de flux impose (HFLUX) sur les faces,
+integration temporelle implicite par theta-methode:
+    theta = 1.0  Euler implicite
+    theta = 0.5  Crank-Nicolson
+
+Toutes les integrations (volume et surface) sont vectorisees sur l'ensemble
+des elements; la matrice du systeme est factorisee une seule fois par pas
+de temps.
+
+Les maillages sont des grilles produit (coordonnees x, y, z quelconques):
+uniformes (mailler_bloc) ou graduees, fines dans une fenetre et grossieres
+ailleurs (coordonnees_graduees); un champ nodal se transfere d'une grille a
+l'autre par interpolation trilineaire (transferer_champ).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.interpolate import RegularGridInterpolator
+from scipy.sparse.linalg import splu
+
+# Coordonnees naturelles des 8 noeuds de l'hexaedre (ordre SOLID70: I J K L M N O P)
+NOEUDS_NATURELS_HEXA = np.array([
+    (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)
+], dtype=float)
+
+# Coordonnees naturelles des 4 noeuds du quadrangle de face
+NOEUDS_NATURELS_QUAD = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=float)
+
+# Points de Gauss 2 points par direction (poids unitaires)
+GAUSS_1D = np.array([-1.0, 1.0]) / np.sqrt(3.0)
+
+# Renumerotation des factorisations LU (matrices a structure symetrique)
+PERMUTATION_LU = 'MMD_AT_PLUS_A'
+
+
+@dataclass
+class MaillageHexa:
+    """Maillage hexaedrique structure d'un bloc."""
+    noeuds: np.ndarray      # (n_noeuds, 3) coordonnees
+    elements: np.ndarray    # (n_elem, 8) connectivite, ordre SOLID70
+    faces: dict             # nom -> (n_faces, 4) connectivite des quadrangles de bord
+    divisions: tuple        # (nx, ny, nz) nombre d'elements par direction
+    axes: tuple = None      # (x, y, z) coordonnees de la grille produit
+
+    @property
+    def n_noeuds(self):
+        return len(self.noeuds)
+
+    @property
+    def n_elem(self):
+        return len(self.elements)
+
+
+def mailler_bloc(L, W, H, esize):
+    """
+    Maille le bloc [0, L] x [0, W] x [0, H] avec des hexaedres de taille
+    proche de esize (comme ESIZE + VMESH sur un bloc).
+
+    Faces de bord: 'X0', 'XL', 'Y0', 'YW', 'Z0' (inferieure), 'ZH' (superieure),
+    orientees vers l'exterieur.
+    """
+    nx, ny, nz = (max(1, int(round(d / esize))) for d in (L, W, H))
+    return mailler_grille(np.linspace(0.0, L, nx + 1), np.linspace(0.0, W, ny + 1),
+                          np.linspace(0.0, H, nz + 1))
+
+
+def mailler_grille(x, y, z):
+    """
+    Maille la grille produit des coordonnees croissantes x, y, z en
+    hexaedres (memes numerotation et faces de bord que mailler_bloc).
+    """
+    nx, ny, nz = len(x) - 1, len(y) - 1, len(z) - 1
+
+    # Numerotation i + (nx+1) * (j + (ny+1) * k)
+    Z, Y, X = np.meshgrid(z, y, x, indexing='ij')
+    noeuds = np.column_stack([X.ravel(), Y.ravel(), Z.ravel()])
+    num = np.arange(len(noeuds)).reshape(nz + 1, ny + 1, nx + 1)
+
+    # Coin (i, j, k) de chaque element puis ses 8 noeuds
+    c = num[:-1, :-1, :-1]
+    elements = np.stack([
+        c, c + 1, c + (nx + 1) + 1, c + (nx + 1),
+        c + (nx + 1) * (ny + 1), c + (nx + 1) * (ny + 1) + 1,
+        c + (nx + 1) * (ny + 1) + (nx + 1) + 1, c + (nx + 1) * (ny + 1) + (nx + 1)
+    ], axis=-1).reshape(-1, 8)
+
+    def quads(grille, inverser):
+        """Quadrangles d'une grille 2D de numeros (normale sortante si inverser)."""
+        q = np.stack([grille[:-1, :-1], grille[:-1, 1:], grille[1:, 1:], grille[1:, :-1]],
+                     axis=-1).reshape(-1, 4)
+        return q[:, ::-1] if inverser else q
+
+    faces = {
+        'Z0': quads(num[0], True),
+        'ZH': quads(num[-1], False),
+        'Y0': quads(num[:, 0, :], False),
+        'YW': quads(num[:, -1, :], True),
+        'X0': quads(num[:, :, 0], True),
+        'XL': quads(num[:, :, -1], False),
+    }
+
+    return MaillageHexa(noeuds, elements, faces, (nx, ny, nz), (x, y, z))
+
+
+def _graduer(longueur, h_depart, h_max, ratio):
+    """
+    Pas croissant h_depart * ratio^k (borne a h_max) couvrant exactement
+    longueur; retourne les abscisses cumulees depuis 0.
+    """
+    if longueur <= 0:
+        return np.zeros(1)
+    pas = []
+    h = h_depart
+    while sum(pas) + h < longueur:
+        pas.append(h)
+        h = min(h * ratio, h_max)
+    if not pas or longueur - sum(pas) > 0.5 * pas[-1]:
+        pas.append(longueur - sum(pas))
+    pas = np.array(pas) * longueur / sum(pas)
+    return np.concatenate([[0.0], np.cumsum(pas)])
+
+
+def coordonnees_graduees(longueur, h_fin, h_grossier, debut_fin, fin_fin, ratio=1.5):
+    """
+    Coordonnees de [0, longueur] de pas h_fin sur [debut_fin, fin_fin] et
+    croissant geometriquement (ratio) jusqu'a h_grossier de part et d'autre.
+    """
+    debut_fin = min(max(debut_fin, 0.0), longueur)
+    fin_fin = min(max(fin_fin, debut_fin), longueur)
+    n_fin = max(1, int(round((fin_fin - debut_fin) / h_fin)))
+    fenetre = np.linspace(debut_fin, fin_fin, n_fin + 1)
+    avant = debut_fin - _graduer(debut_fin, h_fin, h_grossier, ratio)[::-1]
+    apres = fin_fin + _graduer(longueur - fin_fin, h_fin, h_grossier, ratio)
+    return np.unique(np.concatenate([avant, fenetre, apres]).clip(0.0, longueur))
+
+
+def transferer_champ(source, T, cible):
+    """
+    Transfere un champ nodal T d'une grille produit source vers les noeuds
+    de cible, par interpolation trilineaire (exacte si cible raffine source).
+    """
+    x, y, z = source.axes
+    valeurs = T.reshape(len(z), len(y), len(x))
+    interpolateur = RegularGridInterpolator((z, y, x), valeurs)
+    bornes = np.array([[x[0], y[0], z[0]], [x[-1], y[-1], z[-1]]])
+    return interpolateur(np.clip(cible.noeuds, bornes[0], bornes[1])[:, ::-1])
+
+
+# =============================================================================
+# INTEGRATION VOLUMIQUE
+# =============================================================================
+
+def _fonctions_forme_hexa(xi):
+    """Fonctions de forme (..., 8) et derivees (..., 8, 3) en des points (..., 3)."""
+    facteurs = 1.0 + xi[..., None, :] * NOEUDS_NATURELS_HEXA
+    N = 0.125 * np.prod(facteurs, axis=-1)
+    dN = np.empty(facteurs.shape)
+    for d in range(3):
+        autres = np.prod(np.delete(facteurs, d, axis=-1), axis=-1)
+        dN[..., d] = 0.125 * NOEUDS_NATURELS_HEXA[:, d] * autres
+    return N, dN
+
+
+class IntegrateurVolume:
+    """
+    Integration d'une source volumique sur tous les elements (Gauss 2x2x2).
+
+    Les points de Gauss (attribut points, (n_elem, 8, 3)) et les poids
+    detJ sont calcules une fois; une source donnee en ces points est ensuite
+    convertie en vecteur nodal par une seule accumulation.
+    """
+
+    def __init__(self, maillage):
+        xi = np.stack(np.meshgrid(GAUSS_1D, GAUSS_1D, GAUSS_1D, indexing='ij'), axis=-1).reshape(-1, 3)
+        self.N, dN = _fonctions_forme_hexa(xi)
+        coords = maillage.noeuds[maillage.elements]
+        self.detJ = np.linalg.det(np.einsum('gai,eaj->egij', dN, coords))
+        self.points = np.einsum('ga,eai->egi', self.N, coords)
+        self.elements = maillage.elements
+        self.n_noeuds = maillage.n_noeuds
+
+    def vecteur(self, q_points):
+        """Vecteur nodal f_a = integrale de N_a q, q donne aux points de Gauss (n_elem, 8)."""
+        contributions = np.einsum('eg,ga->ea', q_points * self.detJ, self.N)
+        return np.bincount(self.elements.ravel(), weights=contributions.ravel(),
+                           minlength=self.n_noeuds)
+
+
+def _assembler(connectivite, matrices_elem, n):
+    """Assemble des matrices elementaires (ne, m, m) en une matrice creuse (n, n)."""
+    m = connectivite.shape[1]
+    lignes = np.repeat(connectivite, m, axis=1).ravel()
+    colonnes = np.tile(connectivite, (1, m)).ravel()
+    return sp.csr_matrix((matrices_elem.ravel(), (lignes, colonnes)), shape=(n, n))
+
+
+def matrices_volumiques(maillage, conductivite, densite, capacite):
+    """
+    Matrices globales de conductivite K et de capacite C (masse coherente).
+
+    conductivite: scalaire (isotrope) ou (kxx, kyy, kzz)
+    Integration de Gauss 2x2x2 vectorisee sur tous les elements.
+
+    Retourne: (K, C) matrices creuses CSR
+    """
+    xi = np.stack(np.meshgrid(GAUSS_1D, GAUSS_1D, GAUSS_1D, indexing='ij'), axis=-1).reshape(-1, 3)
+    N, dN = _fonctions_forme_hexa(xi)                      # (g, 8), (g, 8, 3)
+
+    coords = maillage.noeuds[maillage.elements]             # (e, 8, 3)
+    J = np.einsum('gai,eaj->egij', dN, coords)              # (e, g, 3, 3)
+    detJ = np.linalg.det(J)
+    if np.any(detJ <= 0):
+        raise ValueError("Element degenere ou mal oriente (jacobien <= 0)")
+    dNdx = np.einsum('egji,gai->egaj', np.linalg.inv(J), dN)
+
+    D = np.broadcast_to(np.asarray(conductivite, dtype=float), (3,))
+    Ke = np.einsum('eg,egai,i,egbi->eab', detJ, dNdx, D, dNdx, optimize=True)
+    Ce = densite * capacite * np.einsum('eg,ga,gb->eab', detJ, N, N)
+
+    n = maillage.n_noeuds
+    return _assembler(maillage.elements, Ke, n), _assembler(maillage.elements, Ce, n)
+
+
+# =============================================================================
+# INTEGRATION SURFACIQUE (CONV, HFLUX)
+# =============================================================================
+
+class IntegrateurSurface:
+    """
+    Integration sur un ensemble de faces quadrangulaires (Gauss 2x2).
+
+    Les points de Gauss de toutes les faces sont calcules une fois
+    (attribut points, (n_faces, 4, 3)); un flux donne en ces points est
+    ensuite converti en vecteur nodal par une seule accumulation.
+    """
+
+    def __init__(self, noeuds, faces):
+        self.faces = faces
+        self.n_noeuds = len(noeuds)
+
+        xi = np.stack(np.meshgrid(GAUSS_1D, GAUSS_1D, indexing='ij'), axis=-1).reshape(-1, 2)
+        facteurs = 1.0 + xi[:, None, :] * NOEUDS_NATURELS_QUAD   # (g, 4, 2)
+        self.N = 0.25 * np.prod(facteurs, axis=-1)                # (g, 4)
+        dN = 0.25 * np.stack([NOEUDS_NATURELS_QUAD[:, 0] * facteurs[..., 1],
+                              NOEUDS_NATURELS_QUAD[:, 1] * facteurs[..., 0]], axis=-1)
+
+        coords = noeuds[faces]                                    # (f, 4, 3)
+        tangentes = np.einsum('gad,fai->fgdi', dN, coords)        # (f, g, 2, 3)
+        self.dA = np.linalg.norm(np.cross(tangentes[:, :, 0], tangentes[:, :, 1]), axis=-1)
+        self.points = np.einsum('ga,fai->fgi', self.N, coords)    # (f, g, 3)
+
+    def vecteur(self, q_points):
+        """Vecteur nodal f_a = integrale de N_a q, q donne aux points de Gauss (n_faces, 4)."""
+        contributions = np.einsum('fg,ga->fa', q_points * self.dA, self.N)
+        return np.bincount(self.faces.ravel(), weights=contributions.ravel(),
+                           minlength=self.n_noeuds)
+
+    def operateur(self):
+        """Matrice creuse (n_noeuds, n_faces): integrale de N_a sur chaque face (flux unitaire)."""
+        Pe = np.einsum('fg,ga->fa', self.dA, self.N)
+        colonnes = np.repeat(np.arange(len(self.faces)), 4)
+        return sp.csr_matrix((Pe.ravel(), (self.faces.ravel(), colonnes)),
+                             shape=(self.n_noeuds, len(self.faces)))
+
+    def matrice(self, coefficient):
+        """Matrice creuse integrale de h N N^T (convection), h scalaire."""
+        Me = coefficient * np.einsum('fg,ga,gb->fab', self.dA, self.N, self.N)
+        return _assembler(self.faces, Me, self.n_noeuds)
+
+
+def convection(maillage, noms_faces, h, T_ext):
+    """
+    Contribution d'une convection h (T - T_ext) sur des faces de bord.
+
+    Retourne: (H, f) matrice a ajouter a K et second membre constant
+    """
+    faces = np.concatenate([maillage.faces[nom] for nom in noms_faces])
+    integrateur = IntegrateurSurface(maillage.noeuds, faces)
+    return integrateur.matrice(h), integrateur.vecteur(np.full(faces.shape, h * T_ext))
+
+
+def flux_faces_selectionnees(integrateur, selections, valeur):
+    """
+    Seconds membres d'un flux uniforme applique aux faces dont les 4 noeuds
+    sont selectionnes (comportement de SF,ALL,HFLUX sur une selection de
+    noeuds), pour toutes les selections d'un planning a la fois.
+
+    selections: matrice creuse booleenne (n_pas, n_noeuds), une selection par pas
+    Retourne: matrice creuse (n_pas, n_noeuds), ligne k = vecteur nodal du pas k
+    """
+    n_faces = len(integrateur.faces)
+    incidence = sp.csr_matrix((np.ones(4 * n_faces),
+                               (integrateur.faces.ravel(), np.repeat(np.arange(n_faces), 4))),
+                              shape=(integrateur.n_noeuds, n_faces))
+    chargees = (selections.astype(float) @ incidence) >= 4
+    return valeur * (chargees.astype(float) @ integrateur.operateur().T).tocsr()
+
+
+# =============================================================================
+# INTEGRATION TEMPORELLE
+# =============================================================================
+
+class IntegrateurTemporel:
+    """
+    Theta-methode pour C dT/dt + K T = f(t):
+
+        (C/dt + theta K) T_n+1 = (C/dt - (1 - theta) K) T_n
+                                 + theta f_n+1 + (1 - theta) f_n
+
+    La matrice de gauche est factorisee (LU creuse) a la construction, avec
+    une renumerotation de degre minimum sur A + A^T (structure symetrique):
+    facteurs deux fois moins remplis qu'avec l'ordre COLAMD par defaut.
+    """
+
+    def __init__(self, K, C, dt, theta=1.0):
+        if not 0.5 <= theta <= 1.0:
+            raise ValueError("theta doit etre compris entre 0.5 (Crank-Nicolson) et 1 (Euler implicite)")
+        self.dt = dt
+        self.theta = theta
+        self.B = (C / dt - (1.0 - theta) * K).tocsr()
+        self._lu = splu((C / dt + theta * K).tocsc(), permc_spec=PERMUTATION_LU)
+
+    def pas(self, T, f_n, f_np1=None):
+        """Avance d'un pas; sans f_np1, le chargement est constant sur le pas."""
+        if f_np1 is None:
+            f_np1 = f_n
+        return self._lu.solve(self.B @ T + self.theta * f_np1 + (1.0 - self.theta) * f_n)
+
+
+class IntegrateurAdaptatif:
+    """
+    Theta-methode a pas de temps automatique pour un chargement continu f(t).
+
+    L'erreur locale d'un pas est estimee par l'ecart d = T_n+1 - T_pred a une
+    prediction explicite construite sur les vitesses dT/dt des pas acceptes
+    (vitesses coherentes avec le schema, initialisees par C dT/dt = f - K T):
+        - theta = 1/2: predicteur Adams-Bashforth 2, e = d / (3 (1 + dt_n-1 / dt))
+        - theta > 1/2: predicteur Euler explicite, e = (theta - 1/2) / theta d
+    Un pas est refuse et divise par deux si max |e| / (tolerance_abs +
+    tolerance |T_n+1|) depasse 1, le pas suivant est double si ce rapport est
+    inferieur a 2^-(p+1) (p ordre du schema). Les pas restent sur l'echelle
+    dt_init * 2^k bornee par [dt_min, dt_max], si bien que chaque
+    factorisation est gardee en cache et reutilisee.
+
+    Reserve aux chargements reguliers en temps (sources gaussienne, goldak):
+    une source a bord franc (chapeau) est discontinue en chaque point de
+    Gauss qu'elle traverse et maintient le pas a dt_min.
+    """
+
+    def __init__(self, K, C, dt_init, dt_min, dt_max, theta=1.0, tolerance=3e-3, tolerance_abs=1e-2):
+        self.K = K
+        self.C = C
+        self.theta = theta
+        self.dt_init = dt_init
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+        self.tolerance = tolerance
+        self.tolerance_abs = tolerance_abs
+        self._integrateurs = {}
+        self.nb_pas = 0
+        self.nb_refus = 0
+
+    @property
+    def nb_factorisations(self):
+        return len(self._integrateurs)
+
+    def _integrateur(self, niveau):
+        if niveau not in self._integrateurs:
+            self._integrateurs[niveau] = IntegrateurTemporel(
+                self.K, self.C, self.dt_init * 2.0 ** niveau, self.theta)
+        return self._integrateurs[niveau]
+
+    def _erreur_locale(self, T, T_np1, dt, taux, taux_prec, dt_prec):
+        """Estimation |e| de l'erreur locale du pas (voir la doc de la classe)."""
+        if self.theta == 0.5 and taux_prec is not None:
+            r = dt / dt_prec
+            prediction = T + 0.5 * dt * ((2.0 + r) * taux - r * taux_prec)
+            return np.abs(T_np1 - prediction) / (3.0 * (1.0 + dt_prec / dt))
+        # Premier pas de Crank-Nicolson: estimation d'ordre 1, plus prudente
+        facteur = 0.5 if self.theta == 0.5 else (self.theta - 0.5) / self.theta
+        return facteur * np.abs(T_np1 - (T + dt * taux))
+
+    def integrer(self, T0, t_fin, second_membre, t0=0.0):
+        """
+        Integre de t0 a t_fin; second_membre(t) renvoie f(t).
+
+        Generateur des couples (t, T) a chaque pas accepte.
+        """
+        niveau_min = int(np.ceil(np.log2(self.dt_min / self.dt_init) - 1e-9))
+        niveau_max = int(np.floor(np.log2(self.dt_max / self.dt_init) + 1e-9))
+        ordre = 2 if self.theta == 0.5 else 1
+        niveau = 0
+        t, T = t0, T0
+        f_n = second_membre(t)
+        taux = splu(self.C.tocsc(), permc_spec=PERMUTATION_LU).solve(f_n - self.K @ T)
+        taux_prec = dt_prec = None
+
+        while t < t_fin - 1e-12 * max(t_fin, 1.0):
+            # Pas de l'echelle, sans depasser t_fin
+            while niveau > niveau_min and t + self.dt_init * 2.0 ** niveau > t_fin + 1e-12:
+                niveau -= 1
+            dt = self.dt_init * 2.0 ** niveau
+
+            f_np1 = second_membre(t + dt)
+            T_np1 = self._integrateur(niveau).pas(T, f_n, f_np1)
+
+            e = self._erreur_locale(T, T_np1, dt, taux, taux_prec, dt_prec)
+            erreur = (e / (self.tolerance_abs + self.tolerance * np.abs(T_np1))).max()
+            if erreur > 1.0 and niveau > niveau_min:
+                niveau -= 1
+                self.nb_refus += 1
+                continue
+
+            # Vitesse en fin de pas deduite du schema theta
+            taux_prec, dt_prec = taux, dt
+            taux = (T_np1 - T) / (self.theta * dt) - (1.0 - self.theta) / self.theta * taux
+            t, T, f_n = t + dt, T_np1, f_np1
+            self.nb_pas += 1
+            yield t, T
+
+            if erreur < 0.5 ** (ordre + 1) and niveau < niveau_max:
+                niveau += 1
+
+
+# =============================================================================
+# REPERE MOBILE (REGIME QUASI STATIONNAIRE)
+# =============================================================================
+
+def matrice_advection(maillage, conductivite, densite, capacite, vitesse, supg=True):
+    """
+    Matrice d'advection du regime quasi stationnaire dans le repere lie a la
+    source: la matiere defile a la vitesse u (source a +v e_x: u = -v e_x) et
+
+        K T + A T = f,   A_ab = integrale de (N_a + tau u.grad N_a) rho c u.grad N_b
+
+    Stabilisation SUPG par element (supg=True):
+        tau = h / (2 |u|) (coth Pe - 1 / Pe),  Pe = rho c |u| h / (2 k)
+    avec h la longueur de l'element dans la direction de u (au centre) et k la
+    conductivite dans cette direction. Le terme de diffusion du residu SUPG
+    est nul pour des hexaedres trilineaires a faces paralleles aux axes.
+
+    Retourne: A matrice creuse CSR (non symetrique)
+    """
+    u = np.asarray(vitesse, dtype=float)
+    norme_u = np.linalg.norm(u)
+    rho_c = densite * capacite
+
+    xi = np.stack(np.meshgrid(GAUSS_1D, GAUSS_1D, GAUSS_1D, indexing='ij'), axis=-1).reshape(-1, 3)
+    N, dN = _fonctions_forme_hexa(xi)
+    coords = maillage.noeuds[maillage.elements]
+    J = np.einsum('gai,eaj->egij', dN, coords)
+    detJ = np.linalg.det(J)
+    dNdx = np.einsum('egji,gai->egaj', np.linalg.inv(J), dN)
+    u_grad = np.einsum('egai,i->ega', dNdx, u)                      # (e, g, 8)
+
+    test = np.broadcast_to(N, u_grad.shape)
+    if supg and norme_u > 0:
+        # Longueur d'element suivant u au centre: h = 2 |u| / sum_a |u.grad N_a|
+        _, dN0 = _fonctions_forme_hexa(np.zeros(3))
+        J0 = np.einsum('ai,eaj->eij', dN0, coords)
+        u_grad0 = np.einsum('eji,ai,j->ea', np.linalg.inv(J0), dN0, u)
+        h = 2.0 * norme_u / np.abs(u_grad0).sum(axis=1)
+
+        D = np.broadcast_to(np.asarray(conductivite, dtype=float), (3,))
+        k_u = np.dot(D, u * u) / norme_u ** 2
+        Pe = rho_c * norme_u * h / (2.0 * k_u)
+        tau = h / (2.0 * norme_u) * (1.0 / np.tanh(Pe) - 1.0 / Pe)
+        test = test + tau[:, None, None] * u_grad
+
+    Ae = rho_c * np.einsum('eg,ega,egb->eab', detJ, test, u_grad)
+    return _assembler(maillage.elements, Ae, maillage.n_noeuds)
+
+
+def resoudre_dirichlet(M, f, imposes, valeurs):
+    """
+    Resout M T = f avec T impose sur les noeuds imposes (elimination des
+    degres de liberte correspondants).
+
+    Retourne: T (n_noeuds,)
+    """
+    n = M.shape[0]
+    T = np.zeros(n)
+    T[imposes] = valeurs
+    libres = np.setdiff1d(np.arange(n), imposes)
+
+    M = M.tocsr()
+    M_ll = M[libres][:, libres]
+    f_l = f[libres] - M[libres][:, imposes] @ T[imposes]
+    T[libres] = splu(M_ll.tocsc(), permc_spec=PERMUTATION_LU).solve(f_l)
+    return T
@@ -0,0 +1,199 @@
+"""
+Source de chaleur mobile sur la face superieure: planning du spot et
+formes de source continues (chapeau, gaussienne, Goldak).
+
+Le centre du spot suit une trajectoire connue x_c(t) = x_start + velocity * t
+a y = y_center. Pour un noeud (x, y) de la face superieure a une distance
+dy = |y - y_center| <= r de la trajectoire, il est dans le spot tant que
+
+    |x - x_c(t)| <= sqrt(r^2 - dy^2)
+
+soit un intervalle de temps [t_entree, t_sortie] calcule en une seule
+operation vectorisee pour tous les noeuds. Les ensembles de noeuds charges a
+chaque pas en decoulent directement; le meme planning pilote MAPDL et le
+solveur local.
+
+En mode source continue (SourceMobile), le flux est une fonction de
+l'espace et du temps appliquee une seule fois (table MAPDL ou fonction
+evaluee aux points de Gauss par le solveur local), a puissance absorbee
+egale a celle du spot uniforme P = q * pi * r^2:
+    chapeau     q = P / (pi r^2) dans le disque de rayon r (W/m2)
+    gaussienne  q = 2 P / (pi r^2) exp(-2 d^2 / r^2) (W/m2)
+    goldak      double ellipsoide de Goldak, source volumique (W/m3)
+                q = 6 sqrt(3) f P / (a b c pi sqrt(pi)) exp(-3 xi^2/a^2 - 3 y^2/b^2 - 3 z^2/c^2)
+                avant (a_f, f_f) et arriere (a_r, f_r) du spot, f_f + f_r = 2
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+# Formes de source continues disponibles
+FORMES_SOURCE = ('chapeau', 'gaussienne', 'goldak')
+
+# Marge sur le rayon du spot (m): les noeuds a exactement r du centre sont
+# toujours consideres dans le spot, quel que soit l'arrondi flottant
+TOLERANCE_SPOT = 1e-9
+
+
+@dataclass
+class PlanningSpot:
+    """Planning du spot sur un ensemble de noeuds de la face superieure."""
+    temps: np.ndarray           # (n_pas,) instant de debut de chaque pas
+    x_centres: np.ndarray       # (n_pas,) position X du centre du spot
+    entree: np.ndarray          # (n_noeuds,) instant d'entree dans le spot (inf: jamais)
+    sortie: np.ndarray          # (n_noeuds,) instant de sortie du spot (-inf: jamais)
+    actifs: sp.csr_matrix       # (n_pas, n_noeuds) noeuds dans le spot a chaque pas
+    sortie_piece: bool          # True si le spot sort de la piece avant la fin
+
+    @property
+    def n_pas(self):
+        return len(self.temps)
+
+    @property
+    def nb_noeuds_actifs(self):
+        """Nombre de noeuds dans le spot a chaque pas."""
+        return np.diff(self.actifs.indptr)
+
+    def noeuds(self, pas):
+        """Indices (dans le tableau de coordonnees) des noeuds du spot au pas donne."""
+        return self.actifs.indices[self.actifs.indptr[pas]:self.actifs.indptr[pas + 1]]
+
+
+def planifier_spot(coords, x_start, velocity, y_center, spot_radius, dt, num_steps, x_max):
+    """
+    Calcule le planning du spot pour les pas 0..num_steps.
+
+    coords: (n, 3) coordonnees des noeuds de la face superieure
+    x_max: position maximale du centre; la simulation s'arrete au premier pas
+           ou x_c depasse x_max (spot sortant de la piece)
+
+    Retourne: PlanningSpot
+    """
+    temps = np.arange(num_steps + 1) * dt
+    x_centres = x_start + velocity * temps
+    hors_piece = np.flatnonzero(x_centres > x_max)
+    n_pas = hors_piece[0] if len(hors_piece) else len(temps)
+
+    # Fenetre de presence de chaque noeud dans le spot
+    r = spot_radius + TOLERANCE_SPOT
+    dy = coords[:, 1] - y_center
+    touche = np.abs(dy) <= r
+    demi_corde = np.sqrt(np.clip(r * r - dy * dy, 0.0, None))
+
+    if velocity != 0:
+        t1 = (coords[:, 0] - demi_corde - x_start) / velocity
+        t2 = (coords[:, 0] + demi_corde - x_start) / velocity
+        entree = np.where(touche, np.minimum(t1, t2), np.inf)
+        sortie = np.where(touche, np.maximum(t1, t2), -np.inf)
+    else:
+        dedans = touche & (np.abs(coords[:, 0] - x_start) <= demi_corde)
+        entree = np.where(dedans, -np.inf, np.inf)
+        sortie = np.where(dedans, np.inf, -np.inf)
+
+    # Pas k actifs: entree <= k dt <= sortie
+    with np.errstate(invalid='ignore'):
+        k_debut = np.clip(np.ceil(entree / dt), 0, n_pas)
+        k_fin = np.clip(np.floor(sortie / dt), -1, n_pas - 1)
+    nb = np.maximum(k_fin - k_debut + 1, 0).astype(np.int64)
+
+    noeuds = np.repeat(np.arange(len(coords)), nb)
+    decalage = np.arange(nb.sum()) - np.repeat(np.cumsum(nb) - nb, nb)
+    pas = np.repeat(k_debut.astype(np.int64), nb) + decalage
+    actifs = sp.csr_matrix((np.ones(len(pas), dtype=bool), (pas, noeuds)),
+                           shape=(n_pas, len(coords)))
+    actifs.sort_indices()
+
+    return PlanningSpot(temps[:n_pas], x_centres[:n_pas], entree, sortie, actifs,
+                        sortie_piece=n_pas < len(temps))
+
+
+@dataclass
+class SourceMobile:
+    """
+    Source de chaleur continue en translation a vitesse constante le long de X.
+
+    Les parametres Goldak valent None par defaut et sont alors deduits du
+    rayon du spot: a_f = b = r, a_r = 2 r, c = r / 2, f_f = 0.6.
+    """
+    forme: str
+    puissance: float            # puissance absorbee (W)
+    rayon: float                # rayon du spot (m)
+    x_start: float
+    velocity: float
+    y_center: float
+    z_surface: float            # cote de la face chauffee (goldak)
+    a_f: Optional[float] = None
+    a_r: Optional[float] = None
+    b: Optional[float] = None
+    c: Optional[float] = None
+    f_f: float = 0.6
+
+    def __post_init__(self):
+        if self.forme not in FORMES_SOURCE:
+            raise ValueError(f"Forme de source inconnue: {self.forme} ({', '.join(FORMES_SOURCE)})")
+        r = self.rayon
+        self.a_f = r if self.a_f is None else self.a_f
+        self.a_r = 2.0 * r if self.a_r is None else self.a_r
+        self.b = r if self.b is None else self.b
+        self.c = 0.5 * r if self.c is None else self.c
+
+    @property
+    def volumique(self):
+        """True pour une source volumique (HGEN), False pour un flux surfacique (HFLUX)."""
+        return self.forme == 'goldak'
+
+    def centre(self, t):
+        return self.x_start + self.velocity * t
+
+    def flux_surfacique(self, x, y, t):
+        """Flux (W/m2) aux points (x, y) a l'instant t (formes chapeau et gaussienne)."""
+        d2 = (x - self.centre(t)) ** 2 + (y - self.y_center) ** 2
+        r2 = self.rayon ** 2
+        if self.forme == 'chapeau':
+            return np.where(d2 <= (self.rayon + TOLERANCE_SPOT) ** 2,
+                            self.puissance / (np.pi * r2), 0.0)
+        if self.forme == 'gaussienne':
+            return 2.0 * self.puissance / (np.pi * r2) * np.exp(-2.0 * d2 / r2)
+        raise ValueError("La source goldak est volumique (utiliser source_volumique)")
+
+    def source_volumique(self, x, y, z, t):
+        """Source volumique de Goldak (W/m3) aux points (x, y, z) a l'instant t."""
+        xi = x - self.centre(t)
+        avant = xi >= 0
+        a = np.where(avant, self.a_f, self.a_r)
+        f = np.where(avant, self.f_f, 2.0 - self.f_f)
+        profondeur = self.z_surface - z
+        return (6.0 * np.sqrt(3.0) * f * self.puissance / (a * self.b * self.c * np.pi * np.sqrt(np.pi))
+                * np.exp(-3.0 * xi ** 2 / a ** 2 - 3.0 * (y - self.y_center) ** 2 / self.b ** 2
+                         - 3.0 * profondeur ** 2 / self.c ** 2))
+
+
+def ecrire_table_flux_apdl(fichier, source, x, y, temps, nom='QFLX', seuil=1e-6):
+    """
+    Ecrit une macro APDL definissant la table 3D nom(X, Y, TIME) du flux
+    surfacique de la source, pour SF,...,HFLUX,%nom%.
+
+    Les valeurs d'index X et Y sont repetees sur chaque plan TIME; seules
+    les valeurs superieures a seuil * flux max sont ecrites (la table est
+    initialisee a zero par *DIM).
+    """
+    if source.volumique:
+        raise ValueError("Table HFLUX: source surfacique (chapeau ou gaussienne) requise")
+
+    X, Y, T = np.meshgrid(x, y, temps, indexing='ij')
+    q = source.flux_surfacique(X, Y, T)
+    i, j, k = np.nonzero(q > seuil * q.max())
+
+    with open(fichier, 'w') as f:
+        f.write(f"*DIM,{nom},TABLE,{len(x)},{len(y)},{len(temps)},X,Y,TIME\n")
+        for plan, instant in enumerate(temps, 1):
+            f.write(f"{nom}(0,0,{plan})={instant:.9g}\n")
+            for n, valeur in enumerate(x, 1):
+                f.write(f"{nom}({n},0,{plan})={valeur:.9g}\n")
+            for n, valeur in enumerate(y, 1):
+                f.write(f"{nom}(0,{n},{plan})={valeur:.9g}\n")
+        for a, b, c in zip(i, j, k):
+            f.write(f"{nom}({a + 1},{b + 1},{c + 1})={q[a, b, c]:.9g}\n")
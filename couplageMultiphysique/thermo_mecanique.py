@@ -0,0 +1,275 @@
+"""
+Couplage thermo-mecanique sequentiel (faible) apres le calcul du flux mobile.
+
+La serie temporelle des champs de temperature (flux_mobile_face_superieure.py
+--champs FICHIER) sert de chargement thermique a un calcul elastique
+lineaire quasi statique:
+
+    K u = G (T - T_REF)        G: deformation thermique alpha (T - T_REF) I
+
+K ne depend pas du temps: elle est factorisee une seule fois, puis tous les
+instants stockes sont resolus par descentes-remontees (un seul appel avec
+tous les seconds membres). Deux backends:
+    local  hexaedres a 8 noeuds (meme grille que les champs), solveur creux
+    mapdl  SOLID185, temperatures BF par instant, matrice reutilisee (KUSE,1)
+
+Conditions aux limites (piece posee sur son support): UZ = 0 sur la face
+inferieure, UX = UY = 0 au coin (x_min, y_min, z_min), UY = 0 au coin
+(x_max, y_min, z_min); la dilatation libre ne cree pas de contrainte.
+
+Usage:
+    python thermo_mecanique.py champs.h5 [--mapdl] [--sortie mecanique.npz]
+"""
+
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from champs_temperature import lire_champs
+from solveur_thermique_local import (mailler_grille, GAUSS_1D, PERMUTATION_LU,
+                                     _fonctions_forme_hexa)
+
+# =========================
+# MATÉRIAU - ACIER (élasticité linéaire isotrope)
+# =========================
+module_young = 210e9        # Pa
+coefficient_poisson = 0.3
+dilatation = 12e-6          # Coefficient de dilatation thermique (1/K)
+T_REF = 20.0                # Température sans déformation thermique (C)
+
+
+def matrice_elasticite(E, nu):
+    """Matrice d'elasticite isotrope (6, 6), notation de Voigt xx yy zz xy yz xz."""
+    lam = E * nu / ((1 + nu) * (1 - 2 * nu))
+    mu = E / (2 * (1 + nu))
+    D = np.zeros((6, 6))
+    D[:3, :3] = lam
+    D[np.arange(3), np.arange(3)] += 2 * mu
+    D[np.arange(3, 6), np.arange(3, 6)] = mu
+    return D
+
+
+def _matrices_B(maillage, xi):
+    """Matrices deformation-deplacement (e, g, 6, 24) et jacobiens (e, g) en des points xi (g, 3)."""
+    _, dN = _fonctions_forme_hexa(xi)
+    coords = maillage.noeuds[maillage.elements]
+    J = np.einsum('gai,eaj->egij', dN, coords)
+    detJ = np.linalg.det(J)
+    dNdx = np.einsum('egji,gai->egaj', np.linalg.inv(J), dN)
+
+    B = np.zeros(dNdx.shape[:2] + (6, 24))
+    for i in range(3):
+        B[..., i, i::3] = dNdx[..., i]
+    for ligne, (i, j) in zip(range(3, 6), [(0, 1), (1, 2), (0, 2)]):
+        B[..., ligne, i::3] = dNdx[..., j]
+        B[..., ligne, j::3] = dNdx[..., i]
+    return B, detJ
+
+
+def operateurs_elastiques(maillage, E, nu, alpha):
+    """
+    Rigidite K (3n, 3n) et operateur de chargement thermique G (3n, n) tel
+    que le second membre vaut G (T - T_REF), T nodal (Gauss 2x2x2).
+    """
+    xi = np.stack(np.meshgrid(GAUSS_1D, GAUSS_1D, GAUSS_1D, indexing='ij'), axis=-1).reshape(-1, 3)
+    N, _ = _fonctions_forme_hexa(xi)
+    B, detJ = _matrices_B(maillage, xi)
+    D = matrice_elasticite(E, nu)
+    D_m = alpha * D @ np.array([1.0, 1.0, 1.0, 0.0, 0.0, 0.0])
+
+    Ke = np.einsum('eg,egia,ij,egjb->eab', detJ, B, D, B, optimize=True)
+    Ge = np.einsum('eg,egia,i,gb->eab', detJ, B, D_m, N, optimize=True)
+
+    n = maillage.n_noeuds
+    ddl = (3 * maillage.elements[:, :, None] + np.arange(3)).reshape(-1, 24)
+    K = sp.csr_matrix((Ke.ravel(), (np.repeat(ddl, 24, axis=1).ravel(), np.tile(ddl, (1, 24)).ravel())),
+                      shape=(3 * n, 3 * n))
+    G = sp.csr_matrix((Ge.ravel(), (np.repeat(ddl, 8, axis=1).ravel(),
+                                    np.tile(maillage.elements, (1, 24)).ravel())),
+                      shape=(3 * n, n))
+    return K, G
+
+
+def ddl_bloques(noeuds):
+    """Degres de liberte bloques (posee sur le support, mouvements de corps rigide supprimes)."""
+    mini, maxi = noeuds.min(axis=0), noeuds.max(axis=0)
+    bas = np.flatnonzero(np.abs(noeuds[:, 2] - mini[2]) < 1e-9)
+    coin = np.argmin(np.linalg.norm(noeuds - mini, axis=1))
+    coin_x = np.argmin(np.linalg.norm(noeuds - [maxi[0], mini[1], mini[2]], axis=1))
+    return np.unique(np.concatenate([3 * bas + 2, [3 * coin, 3 * coin + 1, 3 * coin_x + 1]]))
+
+
+def von_mises_elements(maillage, U, delta_T, E, nu, alpha):
+    """
+    Contrainte equivalente de von Mises au centre des elements.
+
+    U: (m, 3n) deplacements, delta_T: (m, n) ecarts de temperature
+    Retourne: (m, n_elem)
+    """
+    B0, _ = _matrices_B(maillage, np.zeros((1, 3)))
+    B0 = B0[:, 0]                                                      # (e, 6, 24)
+    D = matrice_elasticite(E, nu)
+    ddl = (3 * maillage.elements[:, :, None] + np.arange(3)).reshape(-1, 24)
+
+    deformation = np.einsum('eia,mea->mei', B0, U[:, ddl])             # (m, e, 6)
+    deformation[..., :3] -= alpha * delta_T[:, maillage.elements].mean(axis=2)[..., None]
+    s = deformation @ D.T
+    return np.sqrt(0.5 * ((s[..., 0] - s[..., 1]) ** 2 + (s[..., 1] - s[..., 2]) ** 2
+                          + (s[..., 2] - s[..., 0]) ** 2)
+                   + 3.0 * (s[..., 3] ** 2 + s[..., 4] ** 2 + s[..., 5] ** 2))
+
+
+def mecanique_locale(champs):
+    """
+    Calcul thermo-elastique local pour tous les instants de la serie.
+
+    Les noeuds des champs doivent former une grille produit (maillage du
+    driver, local ou MAPDL): le maillage hexaedrique en est reconstruit.
+
+    Retourne: dict temps, deplacements (m, n, 3), von_mises (m, n_elem), centres (n_elem, 3)
+    """
+    axes = [np.unique(np.round(champs.noeuds[:, i], 9)) for i in range(3)]
+    maillage = mailler_grille(*axes)
+    if maillage.n_noeuds != len(champs.noeuds):
+        raise ValueError("Les noeuds des champs ne forment pas une grille produit")
+
+    # Champs -> numérotation de la grille (i + nx (j + ny k))
+    i, j, k = (np.searchsorted(axes[d], np.round(champs.noeuds[:, d], 9)) for d in range(3))
+    ordre = np.empty(maillage.n_noeuds, dtype=int)
+    ordre[i + len(axes[0]) * (j + len(axes[1]) * k)] = np.arange(maillage.n_noeuds)
+    delta_T = champs.temperature[:, ordre].astype(float) - T_REF     # (m, n)
+    print(f"Maillage mecanique: {maillage.n_elem} elements, {3 * maillage.n_noeuds} ddl")
+
+    K, G = operateurs_elastiques(maillage, module_young, coefficient_poisson, dilatation)
+    bloques = ddl_bloques(maillage.noeuds)
+    libres = np.setdiff1d(np.arange(K.shape[0]), bloques)
+
+    # Une factorisation, puis tous les instants en une descente-remontée
+    lu = splu(K[libres][:, libres].tocsc(), permc_spec=PERMUTATION_LU)
+    F = G @ delta_T.T                                                   # (3n, m)
+    U = np.zeros((len(champs.temps), K.shape[0]))
+    U[:, libres] = lu.solve(np.ascontiguousarray(F[libres])).T
+    print(f"Factorisation unique, {len(champs.temps)} instants resolus")
+
+    centres = maillage.noeuds[maillage.elements].mean(axis=1)
+    return {'temps': champs.temps,
+            'deplacements': U.reshape(len(champs.temps), -1, 3)[:, np.argsort(ordre)],
+            'von_mises': von_mises_elements(maillage, U, delta_T, module_young,
+                                            coefficient_poisson, dilatation),
+            'centres': centres}
+
+
+def ecrire_temperatures_apdl(fichier, ids, temperatures):
+    """Macro APDL de temperatures nodales BF,noeud,TEMP,valeur."""
+    with open(fichier, 'w') as f:
+        f.writelines(f"BF,{n},TEMP,{T:.6g}\n" for n, T in zip(ids, temperatures))
+
+
+def mecanique_mapdl(champs, mapdl=None):
+    """
+    Calcul thermo-elastique SOLID185 avec MAPDL: un pas de charge par instant
+    stocke, temperatures imposees par BF, matrice factorisee au premier
+    pas et reutilisee ensuite (KUSE,1).
+
+    Retourne: dict temps, deplacement max (m,), von Mises max (m,)
+    """
+    from scipy.spatial import cKDTree
+
+    session_locale = mapdl is None
+    if session_locale:
+        from ansys.mapdl.core import launch_mapdl
+        mapdl = launch_mapdl()
+
+    mini, maxi = champs.noeuds.min(axis=0), champs.noeuds.max(axis=0)
+    esize = np.diff(np.unique(np.round(champs.noeuds[:, 0], 9))).min()
+
+    mapdl.clear()
+    mapdl.prep7()
+    mapdl.title('Couplage thermo-mecanique - flux mobile')
+    mapdl.block(mini[0], maxi[0], mini[1], maxi[1], mini[2], maxi[2])
+    mapdl.et(1, 'SOLID185')
+    mapdl.esize(esize)
+    mapdl.vmesh('ALL')
+
+    mapdl.mp('EX', 1, module_young)
+    mapdl.mp('PRXY', 1, coefficient_poisson)
+    mapdl.mp('ALPX', 1, dilatation)
+    mapdl.tref(T_REF)
+
+    # Conditions aux limites (mêmes que le backend local)
+    mapdl.nsel('S', 'LOC', 'Z', mini[2] - 1e-6, mini[2] + 1e-6)
+    mapdl.d('ALL', 'UZ', 0)
+    mapdl.allsel()
+    coin = mapdl.queries.node(mini[0], mini[1], mini[2])
+    coin_x = mapdl.queries.node(maxi[0], mini[1], mini[2])
+    mapdl.d(coin, 'UX', 0)
+    mapdl.d(coin, 'UY', 0)
+    mapdl.d(coin_x, 'UY', 0)
+
+    # Correspondance noeuds MAPDL -> noeuds des champs
+    ids = mapdl.mesh.nnum
+    indices = cKDTree(champs.noeuds).query(mapdl.mesh.nodes)[1]
+    mapdl.finish()
+
+    mapdl.slashsolu()
+    mapdl.antype('STATIC')
+    mapdl.outres('ALL', 'ALL')
+    for k, t in enumerate(champs.temps):
+        ecrire_temperatures_apdl('temperatures_bf.mac', ids, champs.temperature[k, indices])
+        mapdl.input('temperatures_bf.mac')
+        mapdl.time(t)
+        if k == 1:
+            mapdl.kuse(1)   # rigidité inchangée: matrice factorisée réutilisée
+        mapdl.solve()
+    mapdl.finish()
+
+    mapdl.post1()
+    deplacement_max, von_mises_max = [], []
+    for k in range(len(champs.temps)):
+        mapdl.set(k + 1)
+        deplacement_max.append(np.max(mapdl.post_processing.nodal_displacement('NORM')))
+        von_mises_max.append(np.max(mapdl.post_processing.nodal_eqv_stress()))
+    mapdl.finish()
+
+    if session_locale:
+        mapdl.exit()
+    return {'temps': champs.temps, 'deplacement_max': np.array(deplacement_max),
+            'von_mises_max': np.array(von_mises_max)}
+
+
+def main(argv):
+    if not argv or argv[0].startswith('--'):
+        print(__doc__)
+        return 1
+
+    champs = lire_champs(argv[0])
+    print(f"{argv[0]}: {len(champs.temps)} champs, {len(champs.ids)} noeuds")
+    print(f"Acier: E={module_young/1e9:g} GPa, nu={coefficient_poisson:g}, "
+          f"alpha={dilatation:g} /K, T_ref={T_REF:g} C")
+
+    if '--mapdl' in argv:
+        resultats = mecanique_mapdl(champs)
+        deplacement_max = resultats['deplacement_max']
+        von_mises_max = resultats['von_mises_max']
+    else:
+        resultats = mecanique_locale(champs)
+        deplacement_max = np.linalg.norm(resultats['deplacements'], axis=2).max(axis=1)
+        von_mises_max = resultats['von_mises'].max(axis=1)
+        sortie = argv[argv.index('--sortie') + 1] if '--sortie' in argv else 'mecanique.npz'
+        np.savez_compressed(sortie, temps=resultats['temps'],
+                            deplacements=resultats['deplacements'].astype(np.float32),
+                            von_mises=resultats['von_mises'].astype(np.float32),
+                            centres=resultats['centres'])
+        print(f"Resultats mecaniques: {sortie}")
+
+    print("\nTemps(s) | Tmax(C) | Deplacement max (um) | von Mises max (MPa)")
+    print("-" * 62)
+    for t, T_max, u, s in zip(champs.temps, champs.T_max, deplacement_max, von_mises_max):
+        print(f"{t:7.1f}  | {T_max:7.1f} | {u*1e6:20.2f} | {s/1e6:19.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
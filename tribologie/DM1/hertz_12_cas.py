@@ -4,6 +4,11 @@ from matplotlib import cm
 import matplotlib.gridspec as gridspec
 from mpl_toolkits.mplot3d import Axes3D
 import pandas as pd
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from mecanique_contact import hertz
 
 R_VALUES = [5e-3, 100e-3]
 F_VALUES = [50, 500]
@@ -17,61 +22,56 @@ PLAN_MATERIALS = {
 E_SPHERE = 210e9
 NU_SPHERE = 0.3
 
-def calcul_module_effectif(E1, nu1, E2, nu2):
-    return 1 / ((1 - nu1**2)/E1 + (1 - nu2**2)/E2)
-
-def calcul_rayon_contact_hertz(P, R, E_star):
-    return (3 * P * R / (4 * E_star)) ** (1/3)
-
-def calcul_enfoncement(a, R):
-    return a**2 / R
-
-def calcul_pression_maximale(P, a):
-    return (3 * P) / (2 * np.pi * a**2)
+def calculer_grille(R_values, F_values, materiaux, E1=E_SPHERE, nu1=NU_SPHERE):
+    """
+    Contact sphere-plan sur le produit cartesien rayons x forces x plans,
+    calcule en une passe NumPy par diffusion des axes (R, F, plan).
 
-def profil_pression_hertz(r, p0, a):
-    return p0 * np.sqrt(np.maximum(0, 1 - (r / a)**2))
+    materiaux: dict nom -> {'E': ..., 'nu': ...} (comme PLAN_MATERIALS)
+    Retourne: DataFrame d'une ligne par cas, ordre R puis F puis plan
+    """
+    R = np.asarray(R_values, dtype=float)[:, None, None]
+    F = np.asarray(F_values)[None, :, None]
+    noms = list(materiaux)
+    E2 = np.array([materiaux[nom]['E'] for nom in noms], dtype=float)[None, None, :]
+    nu2 = np.array([materiaux[nom]['nu'] for nom in noms], dtype=float)[None, None, :]
 
-def calcul_raideur_contact(a, E_star):
-    return 2 * a * E_star
+    E_star = hertz.module_effectif(E1, nu1, E2, nu2)
+    a = hertz.rayon_contact(F, R, E_star)
+    delta = hertz.enfoncement(a, R)
+    p0 = hertz.pression_maximale(F, a)
+    K = hertz.raideur(a, E_star)
+    h = hertz.hauteur_bourlet(delta, R)
 
-def calcul_hauteur_bourlet(delta, R):
-    return 0.42 * np.sqrt(delta / R)
+    forme = a.shape
+    return pd.DataFrame({
+        'R_mm': np.broadcast_to(R * 1000, forme).ravel(),
+        'F_N': np.broadcast_to(F, forme).ravel(),
+        'plan': pd.Categorical.from_codes(np.broadcast_to(np.arange(len(noms)), forme).ravel(),
+                                          categories=noms),
+        'E_star_GPa': np.broadcast_to(E_star / 1e9, forme).ravel(),
+        'a_mm': (a * 1000).ravel(),
+        'delta_um': (delta * 1e6).ravel(),
+        'p0_MPa': (p0 / 1e6).ravel(),
+        'K_MN_m': (K / 1e6).ravel(),
+        'h_um': (h * 1e6).ravel()
+    })
 
 def calculer_tous_les_cas():
-    resultats = []
+    grille = calculer_grille(R_VALUES, F_VALUES, PLAN_MATERIALS)
+    
+    # Profils de pression sur 100 points de 0 a 1.5 a, tous les cas a la fois
+    a = grille['a_mm'].to_numpy() / 1000
+    p0 = grille['p0_MPa'].to_numpy() * 1e6
+    r = np.linspace(0, a * 1.5, 100, axis=1)
+    p = hertz.profil_pression(r, p0[:, None], a[:, None])
     
-    for R in R_VALUES:
-        for F in F_VALUES:
-            for plan_name, plan_props in PLAN_MATERIALS.items():
-                E_star = calcul_module_effectif(
-                    E_SPHERE, NU_SPHERE, 
-                    plan_props['E'], plan_props['nu']
-                )
-                
-                a = calcul_rayon_contact_hertz(F, R, E_star)
-                delta = calcul_enfoncement(a, R)
-                p0 = calcul_pression_maximale(F, a)
-                K = calcul_raideur_contact(a, E_star)
-                h = calcul_hauteur_bourlet(delta, R)
-                
-                r = np.linspace(0, a * 1.5, 100)
-                p = profil_pression_hertz(r, p0, a)
-                
-                resultats.append({
-                    'R_mm': R * 1000,
-                    'F_N': F,
-                    'plan': plan_name,
-                    'couleur': plan_props['couleur'],
-                    'E_star_GPa': E_star / 1e9,
-                    'a_mm': a * 1000,
-                    'delta_um': delta * 1e6,
-                    'p0_MPa': p0 / 1e6,
-                    'K_MN_m': K / 1e6,
-                    'h_um': h * 1e6,
-                    'r_mm': r * 1000,
-                    'p_MPa': p / 1e6
-                })
+    resultats = []
+    for k, cas in enumerate(grille.to_dict('records')):
+        cas['couleur'] = PLAN_MATERIALS[cas['plan']]['couleur']
+        cas['r_mm'] = r[k] * 1000
+        cas['p_MPa'] = p[k] / 1e6
+        resultats.append(cas)
     
     return resultats
 
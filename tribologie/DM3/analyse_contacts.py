@@ -5,6 +5,10 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from mecanique_contact import module_effectif, plasticite
 
 output_dir = "images"
 
@@ -28,37 +32,8 @@ Materiau1.loc["acier alle", "v"] = 0.3
 
 rayons = np.array([5e-3, 50e-3])
 
-def E_contact(E1, v1, E2, v2):
-    return 1 / ((1 - v1**2) / E1 + (1 - v2**2) / E2)
-
-def calcul_regime_elastique(delta, R, E_star):
-    F = (4/3) * E_star * np.sqrt(R) * delta**1.5
-    A = np.pi * R * delta
-    P = (4 * E_star) / (3 * np.pi) * np.sqrt(delta / R)
-    return F, A, P
-
-def calcul_regime_elastoplastique(delta, delta1, delta2, R, H, E_star):
-    if np.all(delta > delta1) and np.all(delta <= delta2):
-        terme_log = (np.log(delta2) - np.log(delta)) / (np.log(delta2) - np.log(delta1))
-        P = H * (1 - 0.6 * terme_log)
-    else:
-        P = np.zeros_like(delta)
-    
-    x = (delta - delta1) / (delta2 - delta1)
-    A = np.pi * R * delta * (1 - 2*x**3 + 3*x**2)
-    
-    F = P * A
-    
-    return F, A, P
-
-def calcul_regime_plastique(delta, R, H):
-    A = 2 * np.pi * R * delta
-    P = H * np.ones_like(delta)
-    F = A * P
-    return F, A, P
-
 for i, mat in enumerate(Materiau1.index):
-    E_star = E_contact(
+    E_star = module_effectif(
         Materiau1.loc[mat, "E"], Materiau1.loc[mat, "v"],
         Materiau1.loc["acier alle", "E"], Materiau1.loc["acier alle", "v"]
     )
@@ -68,8 +43,7 @@ for R in rayons:
     for mat in Materiau1.index:
         H = Materiau1.loc[mat, "H"]
         E_star = Materiau1.loc[mat, "E_contact"]
-        delta1 = 0.9 * R * (H / E_star)**2
-        delta2 = 54 * delta1
+        delta1, delta2 = plasticite.enfoncements_transition(R, H, E_star)
         
         Materiau1.loc[mat, f"delta1_R{R:.3f}"] = delta1
         Materiau1.loc[mat, f"delta2_R{R:.3f}"] = delta2
@@ -88,19 +62,17 @@ for idx_mat, mat in enumerate(Materiau1.index):
         delta1 = Materiau1.loc[mat, f"delta1_R{R:.3f}"]
         delta2 = Materiau1.loc[mat, f"delta2_R{R:.3f}"]
         
-        delta_elastique = np.linspace(1e-9, delta1, n_points//3)
-        F_el, A_el, P_el = calcul_regime_elastique(delta_elastique, R, E_star)
+        # Echantillonnage logarithmique: le domaine elastique (delta < delta2/54)
+        # reste decrit, les regimes viennent de la meme evaluation
+        delta_complet = np.geomspace(1e-9, delta2*2, n_points)
+        F_complet, A_complet, P_complet, regime = plasticite.contact_response(delta_complet, R, H, E_star)
         
-        delta_elastoplastique = np.linspace(delta1*1.001, delta2, n_points//3)
-        F_ep, A_ep, P_ep = calcul_regime_elastoplastique(delta_elastoplastique, delta1, delta2, R, H, E_star)
-        
-        delta_plastique = np.linspace(delta2*1.001, delta2*2, n_points//3)
-        F_pl, A_pl, P_pl = calcul_regime_plastique(delta_plastique, R, H)
-        
-        delta_complet = np.concatenate([delta_elastique, delta_elastoplastique, delta_plastique])
-        F_complet = np.concatenate([F_el, F_ep, F_pl])
-        A_complet = np.concatenate([A_el, A_ep, A_pl])
-        P_complet = np.concatenate([P_el, P_ep, P_pl])
+        el = regime == plasticite.ELASTIQUE
+        ep = regime == plasticite.ELASTOPLASTIQUE
+        pl = regime == plasticite.PLASTIQUE
+        delta_elastique, F_el, A_el, P_el = delta_complet[el], F_complet[el], A_complet[el], P_complet[el]
+        delta_elastoplastique, F_ep, A_ep, P_ep = delta_complet[ep], F_complet[ep], A_complet[ep], P_complet[ep]
+        delta_plastique, F_pl, A_pl, P_pl = delta_complet[pl], F_complet[pl], A_complet[pl], P_complet[pl]
         
         fig, axes = plt.subplots(1, 3, figsize=(18, 5))
         
@@ -185,17 +157,15 @@ for idx_mat, mat in enumerate(Materiau1.index):
         delta1 = Materiau1.loc[mat, f"delta1_R{R:.3f}"]
         delta2 = Materiau1.loc[mat, f"delta2_R{R:.3f}"]
         
-        delta_el = np.linspace(1e-9, delta1, 100)
-        delta_ep = np.linspace(delta1*1.001, delta2, 100)
-        delta_pl = np.linspace(delta2*1.001, delta2*2, 100)
-        
-        delta_all = np.concatenate([delta_el, delta_ep, delta_pl])
-        
-        F_el, _, _ = calcul_regime_elastique(delta_el, R, E_star)
-        F_ep, _, _ = calcul_regime_elastoplastique(delta_ep, delta1, delta2, R, H, E_star)
-        F_pl, _, _ = calcul_regime_plastique(delta_pl, R, H)
+        delta_all = np.geomspace(1e-9, delta2*2, 300)
+        F_all, _, _, regime = plasticite.contact_response(delta_all, R, H, E_star)
         
-        F_all = np.concatenate([F_el, F_ep, F_pl])
+        el = regime == plasticite.ELASTIQUE
+        ep = regime == plasticite.ELASTOPLASTIQUE
+        pl = regime == plasticite.PLASTIQUE
+        delta_el, F_el = delta_all[el], F_all[el]
+        delta_ep, F_ep = delta_all[ep], F_all[ep]
+        delta_pl, F_pl = delta_all[pl], F_all[pl]
         
         axes[0, 0].plot(delta_el*1e6, F_el, color=couleurs[idx_mat*2 + idx_R], 
                        linestyle='-', linewidth=2, 
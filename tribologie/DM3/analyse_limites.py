@@ -5,8 +5,12 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import os
+import sys
 from scipy.optimize import fsolve
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from mecanique_contact import module_effectif, plasticite
+
 # Créer le répertoire pour les images
 if not os.path.exists('images'):
     os.makedirs('images')
@@ -52,16 +56,9 @@ print("\n" + "="*80 + "\n")
 # Rayons à étudier (en mètres)
 R = np.array([1e-6, 100e-6, 1e-3])  # 1 µm, 100 µm, 1 mm
 
-# Fonction pour calculer le module effectif de contact
-def E_contact(E1, v1, E2, v2):
-    """Calcul du module effectif de contact"""
-    return 1 / ((1 - v1**2) / E1 + (1 - v2**2) / E2)
-
 # Calcul du module effectif de contact (contact avec acier allié)
-for i in range(len(Materiau)):
-    E_star = E_contact(Materiau["E"].iloc[i], Materiau["v"].iloc[i],
-                      Materiau.loc["acier allié", "E"], Materiau.loc["acier allié", "v"])
-    Materiau.loc[Materiau.index[i], "E_contact"] = E_star
+Materiau["E_contact"] = module_effectif(Materiau["E"], Materiau["v"],
+                                        Materiau.loc["acier allié", "E"], Materiau.loc["acier allié", "v"])
 
 print("Module effectif de contact E* (en GPa):")
 print(Materiau["E_contact"] / 1e9)
@@ -184,11 +181,9 @@ plt.close()
 
 # Calcul de δ₁ pour chaque matériau et chaque rayon
 for r in R:
-    Materiau[f"delta1_R{r:.0e}"] = [
-        0.9 * r * (Materiau["H"].iloc[i] / Materiau["E_contact"].iloc[i])**2
-        for i in range(len(Materiau))
-    ]
-    Materiau[f"delta2_R{r:.0e}"] = 54 * Materiau[f"delta1_R{r:.0e}"]
+    delta1, delta2 = plasticite.enfoncements_transition(r, Materiau["H"], Materiau["E_contact"])
+    Materiau[f"delta1_R{r:.0e}"] = delta1
+    Materiau[f"delta2_R{r:.0e}"] = delta2
 
 print("Déplacements de transition δ₁ et δ₂ (en µm):")
 for r in R:
@@ -5,6 +5,11 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import os
+import sys
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from mecanique_contact import hertz, module_effectif, plasticite
 
 # Créer le répertoire pour les images
 if not os.path.exists('images'):
@@ -38,40 +43,32 @@ rayons = np.array([5e-3, 50e-3])  # 5 mm et 50 mm
 # 2. FONCTIONS DE CALCUL
 # =============================================================================
 
-def E_contact(E1, v1, E2, v2):
-    """Calcul du module effectif de contact"""
-    return 1 / ((1 - v1**2) / E1 + (1 - v2**2) / E2)
-
-def rayon_contact_elastique(delta, R):
-    """Rayon de contact en régime élastique : a = sqrt(R * delta)"""
-    return np.sqrt(R * delta)
-
-def rayon_contact_elastoplastique(delta, delta1, delta2, R):
-    """Rayon de contact en régime élasto-plastique"""
-    # Calcul selon la formule de l'aire
-    x = (delta - delta1) / (delta2 - delta1)
-    A = np.pi * R * delta * (1 - 2*x**3 + 3*x**2)
-    # a = sqrt(A/π)
-    return np.sqrt(A / np.pi)
-
-def rayon_contact_plastique(delta, R):
-    """Rayon de contact en régime plastique : a = sqrt(2Rδ)"""
-    return np.sqrt(2 * R * delta)
-
-def raideur_elastique(delta, R, E_star):
-    """Raideur en régime élastique : k = 2aE*"""
-    a = rayon_contact_elastique(delta, R)
-    return 2 * a * E_star
-
-def raideur_elastoplastique(delta, delta1, delta2, R, E_star):
-    """Raideur en régime élasto-plastique"""
-    a = rayon_contact_elastoplastique(delta, delta1, delta2, R)
-    return 2 * a * E_star
-
-def raideur_plastique(delta, R, E_star):
-    """Raideur en régime plastique"""
-    a = rayon_contact_plastique(delta, R)
-    return 2 * a * E_star
+# Modèles de contact (Hertz, Zhao-Maietta-Chang) : package mecanique_contact
+
+@lru_cache(maxsize=8)
+def carte_raideur(materiaux, grille_delta, grille_R):
+    """
+    Raideur k = 2aE* et régime de contact sur la grille (matériau, R, δ),
+    calculés en une passe par diffusion des axes: l'aire de contact A vient
+    de plasticite.contact_response (Hertz puis Zhao-Maietta-Chang) et
+    a = sqrt(A/π).
+
+    materiaux: tuple de couples (H, E*) en Pa
+    grille_delta, grille_R: (log10 min, log10 max, nombre de points) en m
+    Retourne: delta (n_δ,), R (n_R,), k et regime (n_mat, n_R, n_δ), en
+    lecture seule (mis en cache par jeu de matériaux et de grilles)
+    """
+    delta = np.logspace(*grille_delta)
+    R = np.logspace(*grille_R)
+    H, E_star = (np.array(v, dtype=float)[:, None, None] for v in zip(*materiaux))
+    D, R_g = delta[None, None, :], R[None, :, None]
+
+    _, A, _, regime = plasticite.contact_response(D, R_g, H, E_star)
+    k = hertz.raideur(plasticite.rayon_contact(A), E_star)
+
+    for tableau in (delta, R, k, regime):
+        tableau.flags.writeable = False
+    return delta, R, k, regime
 
 # =============================================================================
 # 3. CALCUL DES PARAMÈTRES
@@ -79,7 +76,7 @@ def raideur_plastique(delta, R, E_star):
 
 # Calcul du module effectif
 for i, mat in enumerate(Materiau1.index):
-    E_star = E_contact(
+    E_star = module_effectif(
         Materiau1.loc[mat, "E"], Materiau1.loc[mat, "v"],
         Materiau1.loc["acier allié", "E"], Materiau1.loc["acier allié", "v"]
     )
@@ -90,8 +87,7 @@ for R in rayons:
     for mat in Materiau1.index:
         H = Materiau1.loc[mat, "H"]
         E_star = Materiau1.loc[mat, "E_contact"]
-        delta1 = 0.9 * R * (H / E_star)**2
-        delta2 = 54 * delta1
+        delta1, delta2 = plasticite.enfoncements_transition(R, H, E_star)
         
         Materiau1.loc[mat, f"delta1_R{R:.3f}"] = delta1
         Materiau1.loc[mat, f"delta2_R{R:.3f}"] = delta2
@@ -120,18 +116,20 @@ for idx_mat, mat in enumerate(Materiau1.index):
         
         # Régime élastique
         delta_el = np.linspace(1e-9, delta1, n_points)
-        k_el = raideur_elastique(delta_el, R, E_star)
-        a_el = rayon_contact_elastique(delta_el, R)
+        a_el = hertz.rayon_contact_enfoncement(delta_el, R)
+        k_el = hertz.raideur(a_el, E_star)
         
         # Régime élasto-plastique
         delta_ep = np.linspace(delta1*1.001, delta2, n_points)
-        k_ep = raideur_elastoplastique(delta_ep, delta1, delta2, R, E_star)
-        a_ep = rayon_contact_elastoplastique(delta_ep, delta1, delta2, R)
+        _, A_ep, _ = plasticite.elastoplastique(delta_ep, delta1, delta2, R, H)
+        a_ep = plasticite.rayon_contact(A_ep)
+        k_ep = hertz.raideur(a_ep, E_star)
         
         # Régime plastique
         delta_pl = np.linspace(delta2*1.001, delta2*2, n_points)
-        k_pl = raideur_plastique(delta_pl, R, E_star)
-        a_pl = rayon_contact_plastique(delta_pl, R)
+        _, A_pl, _ = plasticite.plastique(delta_pl, R, H)
+        a_pl = plasticite.rayon_contact(A_pl)
+        k_pl = hertz.raideur(a_pl, E_star)
         
         # Stockage
         key = f"{mat}_R{R*1000:.0f}mm"
@@ -250,37 +248,24 @@ plt.close()
 # 5.3 Tracé en 3D : Raideur en fonction de δ et R
 from mpl_toolkits.mplot3d import Axes3D
 
+# Grilles logarithmiques (log10 min, log10 max, nombre de points)
+GRILLE_DELTA = (-9, -5, 50)  # 1 nm à 10 µm
+GRILLE_R = (-4, -2, 20)      # 0.1 mm à 10 mm
+
+delta_range, R_range, K_carte, regime_carte = carte_raideur(
+    tuple(zip(Materiau1["H"], Materiau1["E_contact"])), GRILLE_DELTA, GRILLE_R)
+Delta, R_grid = np.meshgrid(delta_range, R_range)
+
 fig = plt.figure(figsize=(14, 10))
 
 # Pour chaque matériau
 for idx_mat, mat in enumerate(Materiau1.index):
     ax = fig.add_subplot(2, 2, idx_mat + 1, projection='3d')
+    K = K_carte[idx_mat]
     
-    # Création d'une grille pour δ et R
-    delta_range = np.logspace(-9, -5, 50)  # 1 nm à 10 µm
-    R_range = np.logspace(-4, -2, 20)      # 0.1 mm à 10 mm
-    
-    Delta, R_grid = np.meshgrid(delta_range, R_range)
-    K = np.zeros_like(Delta)
-    
-    for i in range(len(delta_range)):
-        for j in range(len(R_range)):
-            delta = delta_range[i]
-            R_val = R_range[j]
-            
-            # Calcul de δ1 pour ce rayon
-            H = Materiau1.loc[mat, "H"]
-            E_star = Materiau1.loc[mat, "E_contact"]
-            delta1 = 0.9 * R_val * (H / E_star)**2
-            
-            # Détermination du régime et calcul de la raideur
-            if delta <= delta1:
-                a = np.sqrt(R_val * delta)
-                K[j, i] = 2 * a * E_star
-            else:
-                # Approximation pour régime non-élastique
-                a = np.sqrt(2 * R_val * delta)  # Approximation plastique
-                K[j, i] = 2 * a * E_star
+    parts = np.bincount(regime_carte[idx_mat].ravel(), minlength=3) / regime_carte[idx_mat].size
+    print(f"Raideur 3D - {mat}: élastique {parts[0]:.0%}, "
+          f"élasto-plastique {parts[1]:.0%}, plastique {parts[2]:.0%} de la grille")
     
     # Tracé 3D
     surf = ax.plot_surface(np.log10(Delta*1e6), np.log10(R_grid*1000), np.log10(K/1e6),
@@ -7,6 +7,10 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from mecanique_contact import module_effectif, plasticite
 
 output_dir = "images"
 
@@ -40,13 +44,8 @@ print("\n" + "="*80 + "\n")
 
 R = np.array([1e-6, 100e-6, 1e-3])
 
-def E_contact(E1, v1, E2, v2):
-    return 1 / ((1 - v1**2) / E1 + (1 - v2**2) / E2)
-
-for i in range(len(Materiau)):
-    E_star = E_contact(Materiau["E"].iloc[i], Materiau["v"].iloc[i],
-                      Materiau.loc["acier alle", "E"], Materiau.loc["acier alle", "v"])
-    Materiau.loc[Materiau.index[i], "E_contact"] = E_star
+Materiau["E_contact"] = module_effectif(Materiau["E"], Materiau["v"],
+                                        Materiau.loc["acier alle", "E"], Materiau.loc["acier alle", "v"])
 
 print("Module effectif de contact E* (en GPa):")
 print(Materiau["E_contact"] / 1e9)
@@ -154,11 +153,9 @@ plt.savefig(f'{output_dir}/evolution_forces_rayon.png', dpi=300, bbox_inches='ti
 plt.close()
 
 for r in R:
-    Materiau[f"delta1_R{r:.0e}"] = [
-        0.9 * r * (Materiau["H"].iloc[i] / Materiau["E_contact"].iloc[i])**2
-        for i in range(len(Materiau))
-    ]
-    Materiau[f"delta2_R{r:.0e}"] = 54 * Materiau[f"delta1_R{r:.0e}"]
+    delta1, delta2 = plasticite.enfoncements_transition(r, Materiau["H"], Materiau["E_contact"])
+    Materiau[f"delta1_R{r:.0e}"] = delta1
+    Materiau[f"delta2_R{r:.0e}"] = delta2
 
 print("Deplacements de transition delta1 et delta2 (en um):")
 for r in R:
@@ -8,6 +8,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
 import warnings
+
+from mecanique_contact import hertz
 warnings.filterwarnings('ignore')
 
 plt.rcParams['font.size'] = 11
@@ -23,13 +25,13 @@ nu2 = 0.3
 F_max = 0.5
 delta = 50e-6
 
-a = np.sqrt(R * delta)
-E_star = 3 * F_max * R / (4 * a**3)
-p0 = 3 * F_max / (2 * np.pi * a**2)
-p_moy = F_max / (np.pi * a**2)
-K = 2 * a * E_star
+a = hertz.rayon_contact_enfoncement(delta, R)
+E_star = hertz.module_effectif_mesure(F_max, R, a)
+p0 = hertz.pression_maximale(F_max, a)
+p_moy = hertz.pression_moyenne(F_max, a)
+K = hertz.raideur(a, E_star)
 
-E2_num = (1 - nu2**2) / (1/E_star - (1 - nu1**2)/E1)
+E2_num = hertz.module_plan(E_star, E1, nu1, nu2)
 
 print(f"Paramètres calculés:")
 print(f"Rayon de contact a = {a*1000:.3f} mm")
@@ -41,7 +43,7 @@ print(f"Module E2 = {E2_num/1e9:.1f} GPa")
 
 fig1, ax1 = plt.subplots(figsize=(8, 5))
 r = np.linspace(0, a, 200)
-p = p0 * np.sqrt(1 - (r/a)**2)
+p = hertz.profil_pression(r, p0, a)
 ax1.plot(r*1000, p/1e6, 'b-', linewidth=2)
 ax1.fill_between(r*1000, p/1e6, alpha=0.3, color='blue')
 ax1.axhline(y=p0/1e6, color='r', linestyle='--', alpha=0.7, label=f'$p_0$ = {p0/1e6:.2f} MPa')
@@ -59,7 +61,7 @@ plt.close()
 
 fig2, (ax2a, ax2b) = plt.subplots(1, 2, figsize=(12, 5))
 delta_range = np.linspace(0, 100e-6, 100)
-F = (4/3) * E_star * np.sqrt(R) * delta_range**(3/2)
+F = hertz.force(delta_range, R, E_star)
 ax2a.plot(delta_range*1e6, F, 'b-', linewidth=2)
 ax2a.set_xlabel('Enfoncement $\\delta$ ($\\mu$m)')
 ax2a.set_ylabel('Force $F$ (N)')
@@ -71,7 +73,7 @@ ax2a.legend()
 
 contact_strain = delta / (2 * a)
 strain_range = delta_range / (2 * a)
-p_range = (3 * F / (2 * np.pi * a**2))
+p_range = hertz.pression_maximale(F, a)
 ax2b.plot(strain_range*100, p_range/1e6, 'b-', linewidth=2)
 ax2b.set_xlabel('Déformation de contact $\\delta/(2a)$ (%)')
 ax2b.set_ylabel('Pression de contact $p_0$ (MPa)')
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Modeles de contact sphere-plan communs aux scripts de tribologie.
+
+Toutes les fonctions sont ecrites avec des operations NumPy elementaires:
+elles acceptent des scalaires ou des tableaux de formes compatibles (regles
+de diffusion de NumPy) et s'evaluent en une passe sur des millions de cas.
+
+Unites SI partout: longueurs en m, forces en N, modules, durete et pressions
+en Pa, energie d'adhesion en J/m2.
+
+    hertz         contact elastique de Hertz
+    adhesion      contacts adhesifs JKR et DMT
+    plasticite    contact elasto-plastique de Zhao-Maietta-Chang (ZMC)
+    banc_essai    debit par appel sur de grands tableaux
+                  (python -m mecanique_contact.banc_essai)
+"""
+
+from . import adhesion, hertz, plasticite
+from .hertz import module_effectif
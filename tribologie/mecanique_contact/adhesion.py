@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Contacts adhesifs sphere-plan JKR et DMT (unites SI).
+
+w: energie d'adhesion (J/m2). Les forces sont comptees positives en
+compression, negatives en traction; les fonctions inverses renvoient nan
+sous la force d'arrachement (pas de contact stable).
+"""
+
+import numpy as np
+
+
+def parametre_tabor(R, w, E_star, z0):
+    """
+    Parametre de Tabor mu = (R w^2 / (E*^2 z0^3))^(1/3), z0 distance
+    d'equilibre interatomique: mu >> 1 -> JKR, mu << 1 -> DMT
+    """
+    return (R * w**2 / (E_star**2 * z0**3)) ** (1/3)
+
+
+def force_jkr(a, R, E_star, w):
+    """Force JKR pour le rayon de contact a: F = 4E*a^3/(3R) - sqrt(8 pi w E* a^3)"""
+    return 4 * E_star * a**3 / (3 * R) - np.sqrt(8 * np.pi * w * E_star * a**3)
+
+
+def enfoncement_jkr(a, R, E_star, w):
+    """Enfoncement JKR: delta = a^2/R - sqrt(2 pi w a / E*)"""
+    return a**2 / R - np.sqrt(2 * np.pi * w * a / E_star)
+
+
+def rayon_contact_jkr(F, R, E_star, w):
+    """Rayon de contact JKR: a^3 = 3R/(4E*) (F + 3 pi w R + sqrt(6 pi w R F + (3 pi w R)^2))"""
+    terme = 3 * np.pi * w * R
+    with np.errstate(invalid='ignore'):
+        return (3 * R / (4 * E_star) * (F + terme + np.sqrt(2 * terme * F + terme**2))) ** (1/3)
+
+
+def arrachement_jkr(R, w):
+    """Force d'arrachement JKR (traction): F = -3/2 pi w R"""
+    return -1.5 * np.pi * w * R
+
+
+def force_dmt(a, R, E_star, w):
+    """Force DMT pour le rayon de contact a: F = 4E*a^3/(3R) - 2 pi w R"""
+    return 4 * E_star * a**3 / (3 * R) - 2 * np.pi * w * R
+
+
+def enfoncement_dmt(a, R):
+    """Enfoncement DMT (profil hertzien): delta = a^2/R"""
+    return a**2 / R
+
+
+def rayon_contact_dmt(F, R, E_star, w):
+    """Rayon de contact DMT: a = (3R (F + 2 pi w R) / 4E*)^(1/3)"""
+    with np.errstate(invalid='ignore'):
+        return (3 * R * (F + 2 * np.pi * w * R) / (4 * E_star)) ** (1/3)
+
+
+def arrachement_dmt(R, w):
+    """Force d'arrachement DMT (traction): F = -2 pi w R"""
+    return -2 * np.pi * w * R
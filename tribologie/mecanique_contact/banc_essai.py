@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-banc d'essai des modeles de contact: debit par appel sur de grands
+tableaux (meilleur temps sur plusieurs repetitions).
+
+Usage:
+    python -m mecanique_contact.banc_essai [--taille 1000000] [--repetitions 5]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from . import adhesion, hertz, plasticite
+
+
+def cas_essai(taille, graine=0):
+    """Tableaux aleatoires de parametres physiquement plausibles (SI)"""
+    rng = np.random.default_rng(graine)
+    E_star = rng.uniform(1e9, 200e9, taille)
+    R = 10 ** rng.uniform(-6, -1, taille)
+    H = rng.uniform(0.1e9, 6e9, taille)
+    F = 10 ** rng.uniform(-3, 3, taille)
+    w = rng.uniform(0.01, 1.0, taille)
+    delta1, delta2 = plasticite.enfoncements_transition(R, H, E_star)
+    delta = delta1 * 10 ** rng.uniform(-1, 2.5, taille)
+    return dict(E_star=E_star, R=R, H=H, F=F, w=w, delta=delta, delta1=delta1, delta2=delta2,
+                E=rng.uniform(1e9, 210e9, taille), nu=rng.uniform(0.2, 0.45, taille),
+                a=hertz.rayon_contact(F, R, E_star))
+
+
+def mesurer(fonction, arguments, repetitions):
+    """Meilleur temps d'un appel (s)"""
+    meilleur = np.inf
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction(*arguments)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def banc_essai(taille=1_000_000, repetitions=5):
+    """
+    Temps par appel de chaque modele sur des tableaux de taille elements.
+
+    Retourne: liste de (nom, temps par appel en s)
+    """
+    c = cas_essai(taille)
+    essais = [
+        ('hertz.module_effectif', hertz.module_effectif, (c['E'], c['nu'], 210e9, 0.3)),
+        ('hertz.rayon_contact', hertz.rayon_contact, (c['F'], c['R'], c['E_star'])),
+        ('hertz.force', hertz.force, (c['delta'], c['R'], c['E_star'])),
+        ('hertz.pression_maximale', hertz.pression_maximale, (c['F'], c['a'])),
+        ('hertz.profil_pression', hertz.profil_pression, (0.5 * c['a'], 1e9, c['a'])),
+        ('adhesion.force_jkr', adhesion.force_jkr, (c['a'], c['R'], c['E_star'], c['w'])),
+        ('adhesion.rayon_contact_jkr', adhesion.rayon_contact_jkr, (c['F'], c['R'], c['E_star'], c['w'])),
+        ('adhesion.rayon_contact_dmt', adhesion.rayon_contact_dmt, (c['F'], c['R'], c['E_star'], c['w'])),
+        ('plasticite.regime_contact', plasticite.regime_contact, (c['delta'], c['delta1'], c['delta2'])),
+        ('plasticite.elastique', plasticite.elastique, (c['delta'], c['R'], c['E_star'])),
+        ('plasticite.elastoplastique', plasticite.elastoplastique,
+         (c['delta'], c['delta1'], c['delta2'], c['R'], c['H'])),
+        ('plasticite.plastique', plasticite.plastique, (c['delta'], c['R'], c['H'])),
+        ('plasticite.contact_response', plasticite.contact_response,
+         (c['delta'], c['R'], c['H'], c['E_star'])),
+    ]
+
+    print(f"Banc d'essai: tableaux de {taille} elements, meilleur de {repetitions} appels")
+    print(f"  {'modele':32s} | {'ms/appel':>9s} | {'ns/element':>10s} | {'Melements/s':>11s}")
+    resultats = []
+    for nom, fonction, arguments in essais:
+        duree = mesurer(fonction, arguments, repetitions)
+        resultats.append((nom, duree))
+        print(f"  {nom:32s} | {duree*1e3:9.2f} | {duree/taille*1e9:10.2f} | {taille/duree/1e6:11.1f}")
+    return resultats
+
+
+def main(argv):
+    taille = int(argv[argv.index('--taille') + 1]) if '--taille' in argv else 1_000_000
+    repetitions = int(argv[argv.index('--repetitions') + 1]) if '--repetitions' in argv else 5
+    banc_essai(taille, repetitions)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Contact elastique de Hertz sphere-plan (unites SI)"""
+
+import numpy as np
+
+
+def module_effectif(E1, nu1, E2, nu2):
+    """Module effectif de contact: 1/E* = (1 - nu1^2)/E1 + (1 - nu2^2)/E2"""
+    return 1 / ((1 - nu1**2) / E1 + (1 - nu2**2) / E2)
+
+
+def module_plan(E_star, E1, nu1, nu2):
+    """Module d'Young du plan connaissant E* et la sphere (inverse de module_effectif)"""
+    return (1 - nu2**2) / (1 / E_star - (1 - nu1**2) / E1)
+
+
+def rayon_contact(F, R, E_star):
+    """Rayon de contact sous la force F: a = (3FR / 4E*)^(1/3)"""
+    return (3 * F * R / (4 * E_star)) ** (1/3)
+
+
+def rayon_contact_enfoncement(delta, R):
+    """Rayon de contact pour l'enfoncement delta: a = sqrt(R delta)"""
+    return np.sqrt(R * delta)
+
+
+def module_effectif_mesure(F, R, a):
+    """Module effectif deduit d'un essai (F, a): E* = 3FR / 4a^3"""
+    return 3 * F * R / (4 * a**3)
+
+
+def enfoncement(a, R):
+    """Enfoncement: delta = a^2 / R"""
+    return a**2 / R
+
+
+def force(delta, R, E_star):
+    """Force pour l'enfoncement delta: F = 4/3 E* sqrt(R) delta^(3/2)"""
+    return (4/3) * E_star * np.sqrt(R) * delta**1.5
+
+
+def pression_maximale(F, a):
+    """Pression au centre du contact: p0 = 3F / (2 pi a^2)"""
+    return (3 * F) / (2 * np.pi * a**2)
+
+
+def pression_moyenne(F, a):
+    """Pression moyenne: pm = F / (pi a^2)"""
+    return F / (np.pi * a**2)
+
+
+def profil_pression(r, p0, a):
+    """Profil de pression p(r) = p0 sqrt(1 - r^2/a^2), nul hors du contact"""
+    return p0 * np.sqrt(np.maximum(0, 1 - (r / a)**2))
+
+
+def raideur(a, E_star):
+    """Raideur normale du contact: k = 2 a E*"""
+    return 2 * a * E_star
+
+
+def hauteur_bourlet(delta, R):
+    """Hauteur relative du bourrelet: h = 0.42 sqrt(delta / R)"""
+    return 0.42 * np.sqrt(delta / R)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Contact sphere-plan elasto-plastique de Zhao-Maietta-Chang (unites SI).
+
+Trois regimes selon l'enfoncement delta:
+    delta <= delta1            elastique (Hertz)
+    delta1 < delta <= delta2   elasto-plastique: raccord en pression (log)
+                               et en aire (polynome cubique)
+    delta > delta2             plastique: P = H, A = 2 pi R delta
+avec delta1 = 0.9 R (H/E*)^2 et delta2 = 54 delta1.
+
+Chaque regime renvoie (F, A, P): force (N), aire de contact (m2) et
+pression moyenne (Pa); contact_response choisit le regime de chaque
+enfoncement et renvoie aussi son code.
+"""
+
+import numpy as np
+
+COEFFICIENT_DELTA1 = 0.9    # delta1 = COEFFICIENT_DELTA1 R (H/E*)^2
+RAPPORT_DELTA2 = 54         # delta2 = RAPPORT_DELTA2 delta1
+
+# Codes de regime renvoyes par regime_contact
+ELASTIQUE = 0
+ELASTOPLASTIQUE = 1
+PLASTIQUE = 2
+
+
+def enfoncements_transition(R, H, E_star):
+    """Enfoncements de debut de plasticite delta1 et de plasticite totale delta2"""
+    delta1 = COEFFICIENT_DELTA1 * R * (H / E_star)**2
+    return delta1, RAPPORT_DELTA2 * delta1
+
+
+def regime_contact(delta, delta1, delta2):
+    """Code de regime (ELASTIQUE, ELASTOPLASTIQUE, PLASTIQUE) de chaque enfoncement"""
+    return np.greater(delta, delta1).astype(np.int8) + np.greater(delta, delta2)
+
+
+def elastique(delta, R, E_star):
+    F = (4/3) * E_star * np.sqrt(R) * delta**1.5
+    A = np.pi * R * delta
+    P = (4 * E_star) / (3 * np.pi) * np.sqrt(delta / R)
+    return F, A, P
+
+
+def elastoplastique(delta, delta1, delta2, R, H):
+    terme_log = (np.log(delta2) - np.log(delta)) / (np.log(delta2) - np.log(delta1))
+    P = H * (1 - 0.6 * terme_log)
+    x = (delta - delta1) / (delta2 - delta1)
+    A = np.pi * R * delta * (1 - 2*x**3 + 3*x**2)
+    return P * A, A, P
+
+
+def plastique(delta, R, H):
+    A = 2 * np.pi * R * delta
+    P = H * np.ones_like(A)
+    return A * P, A, P
+
+
+def contact_response(delta, R, H, E_star):
+    """
+    Reponse (F, A, P, regime) du contact pour un tableau d'enfoncements
+    quelconque (courbe de charge, tirage aleatoire, historique mesure): la
+    branche elastique, elasto-plastique ou plastique est choisie element par
+    element selon delta1 et delta2, reponse nulle sans contact (delta <= 0).
+    regime donne le code ELASTIQUE, ELASTOPLASTIQUE ou PLASTIQUE de chaque
+    element. R, H et E_star peuvent etre des tableaux compatibles avec delta.
+    """
+    delta = np.asarray(delta, dtype=float)
+    delta1, delta2 = enfoncements_transition(R, H, E_star)
+    regime = regime_contact(delta, delta1, delta2)
+    # Chaque branche est evaluee partout, hors de son domaine (log de 0, racine
+    # d'un enfoncement negatif) les valeurs sont ecartees par np.select
+    with np.errstate(divide='ignore', invalid='ignore'):
+        branches = [elastique(delta, R, E_star),
+                    elastoplastique(delta, delta1, delta2, R, H),
+                    plastique(delta, R, H)]
+    conditions = [(regime == ELASTIQUE) & (delta > 0),
+                  regime == ELASTOPLASTIQUE,
+                  regime == PLASTIQUE]
+    F, A, P = (np.select(conditions, [branche[k] for branche in branches]) for k in range(3))
+    return F, A, P, regime
+
+
+def rayon_contact(A):
+    """Rayon de contact equivalent a l'aire A: a = sqrt(A / pi)"""
+    return np.sqrt(A / np.pi)
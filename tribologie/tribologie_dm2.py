@@ -11,6 +11,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 
+from mecanique_contact import hertz
+
 # ============================================
 # DONNÉES ET CALCULS PRÉLIMINAIRES
 # ============================================
@@ -26,10 +28,10 @@ E1 = 210e9  # Module d'Young [Pa]
 nu1 = 0.3  # Coefficient de Poisson
 
 # Question 1: Rayon de contact
-a = np.sqrt(R * delta)
+a = hertz.rayon_contact_enfoncement(delta, R)
 
 # Calcul de E*
-E_star = (3 * F_max * R) / (4 * a**3)
+E_star = hertz.module_effectif_mesure(F_max, R, a)
 
 # Question 2: Pressions
 p_moy = 0.42 * E_star * np.sqrt(8/R)
@@ -37,12 +39,10 @@ p_max = (3/2) * p_moy
 
 # Question 3: Module du plan (supposition ν2 = 0.3)
 nu2 = 0.3
-term_E_star = 1/E_star
-term_E1 = (1 - nu1**2) / E1
-E2 = (1 - nu2**2) / (term_E_star - term_E1)
+E2 = hertz.module_plan(E_star, E1, nu1, nu2)
 
 # Question 4: Raideur
-K = 2 * a * E_star
+K = hertz.raideur(a, E_star)
 
 # ============================================
 # QUESTION 5: PROFIL DE PRESSION HERTZIEN
@@ -52,14 +52,9 @@ print("=" * 60)
 print("QUESTION 5: PROFIL DE PRESSION HERTZIEN")
 print("=" * 60)
 
-def hertz_pressure(r, p0, a):
-    """Profil de pression hertzien: p(r) = p0 × √(1 - r²/a²)"""
-    with np.errstate(invalid='ignore'):
-        return p0 * np.sqrt(1 - (r/a)**2)
-
 # Création des données
 r_vals = np.linspace(0, a, 200)
-p_vals = hertz_pressure(r_vals, p_max, a)
+p_vals = hertz.profil_pression(r_vals, p_max, a)
 
 # Tracé
 fig1, ax1 = plt.subplots(figsize=(10, 6))
@@ -95,7 +90,7 @@ print("=" * 60)
 
 # Courbe force-déplacement
 delta_range = np.linspace(0, delta*2, 200)
-F_range = (4/3) * E_star * np.sqrt(R) * delta_range**(3/2)
+F_range = hertz.force(delta_range, R, E_star)
 
 # Contrainte-déformation (simplifiée)
 epsilon_range = 0.42 * np.sqrt(delta_range / R)  # Déformation équivalente